@@ -1 +1,120 @@
-from django.db import models
+from django.contrib import admin
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.html import format_html
+
+from .models import ProfileReport
+
+from .pagination import ApproximateCountPaginator
+from .search import fts_available, fts_filter, prefix_q
+
+BATCH_SIZE = 500
+
+
+def iter_pk_batches(queryset, batch_size: int = BATCH_SIZE):
+    """Primary keys of ``queryset`` in ascending batches (keyset, no OFFSET)."""
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    cursor = None
+    while True:
+        batch = list((pks if cursor is None else pks.filter(pk__gt=cursor))[:batch_size])
+        if not batch:
+            return
+        yield batch
+        cursor = batch[-1]
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """
+    Admin for tables too large for COUNT(*) and LIKE '%term%' scans.
+
+    Search uses ``fts_table`` (an FTS5 mirror, see apps.abstracts.search)
+    when it exists, else ``prefix_search_fields`` as indexed prefix
+    ranges, else the regular ``search_fields``. Listing
+    "soft_delete_selected" in ``actions`` replaces Django's
+    delete_selected, which loads every related object before deleting.
+    """
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    fts_table: str | None = None
+    prefix_search_fields: tuple[str, ...] = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if term and self.fts_table and fts_available(self.fts_table):
+            return fts_filter(queryset, self.fts_table, term), False
+        if term and self.prefix_search_fields:
+            condition = Q()
+            for field in self.prefix_search_fields:
+                condition |= prefix_q(field, term)
+            return queryset.filter(condition), False
+        return super().get_search_results(request, queryset, search_term)
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if "soft_delete_selected" in actions:
+            actions.pop("delete_selected", None)
+        return actions
+
+    def bulk_update(self, queryset, **values) -> int:
+        """Applies ``values`` in pk batches of BATCH_SIZE; returns updated rows."""
+        now = timezone.now()
+        updated = 0
+        for pks in iter_pk_batches(queryset):
+            with transaction.atomic():
+                updated += (
+                    self.model._default_manager
+                    .filter(pk__in=pks)
+                    .update(updated_at=now, **values)
+                )
+                self.batch_updated(pks, values)
+        return updated
+
+    def batch_updated(self, pks: list[int], values: dict) -> None:
+        """Called inside each bulk_update() batch, e.g. to refresh derived data."""
+
+    @admin.action(description="Soft delete selected %(verbose_name_plural)s", permissions=["delete"])
+    def soft_delete_selected(self, request, queryset):
+        count = self.bulk_update(
+            queryset.filter(deleted_at__isnull=True),
+            deleted_at=timezone.now(),
+        )
+        self.message_user(request, f"Deleted {count} {self.opts.verbose_name_plural}.")
+
+
+@admin.register(ProfileReport)
+class ProfileReportAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'created_at', 'method', 'path', 'view_name', 'status_code',
+        'duration_ms', 'query_count', 'query_ms', 'sampled', 'user',
+    )
+    list_select_related = ('user',)
+    list_filter = ('sampled', 'view_name')
+    fields = (
+        'created_at', 'user', 'sampled', 'method', 'path', 'view_name', 'status_code',
+        'duration_ms', 'query_count', 'query_ms', 'functions_report', 'allocations_report',
+        'queries_report',
+    )
+    readonly_fields = fields
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Top functions (cumulative)")
+    def functions_report(self, obj):
+        return format_html("<pre>{}</pre>", obj.functions)
+
+    @admin.display(description="Top allocations")
+    def allocations_report(self, obj):
+        return format_html("<pre>{}</pre>", obj.allocations or "—")
+
+    @admin.display(description="Queries")
+    def queries_report(self, obj):
+        lines = "\n\n".join(f"{query['ms']:.3f} ms  {query['sql']}" for query in obj.queries)
+        return format_html("<pre>{}</pre>", lines or "—")
@@ -0,0 +1,85 @@
+"""
+Per-process background worker.
+
+Work a response need not wait for, such as reindexing after a save, goes
+through submit_on_commit(): once the transaction commits, the call is
+queued and a daemon thread runs the queue in order, on its own database
+connection. A failing call is logged, not raised. Calls still queued at
+interpreter exit get DRAIN_TIMEOUT seconds to finish, so only work a
+management command can redo belongs here. BACKGROUND["INLINE"] runs
+the calls synchronously instead, e.g. in tests.
+"""
+import atexit
+import logging
+import queue
+import threading
+from typing import Callable
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "INLINE": False,
+    "DRAIN_TIMEOUT": 10.0,
+}
+
+
+def background_setting(name: str):
+    return getattr(settings, "BACKGROUND", {}).get(name, DEFAULTS[name])
+
+
+class Worker:
+    """A FIFO of calls and the daemon thread running it, started on first use."""
+
+    def __init__(self) -> None:
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _call(func: Callable, args: tuple) -> None:
+        try:
+            func(*args)
+        except Exception:
+            logger.exception("Background call %s failed", getattr(func, "__qualname__", func))
+
+    def submit(self, func: Callable, *args) -> None:
+        if background_setting("INLINE"):
+            self._call(func, args)
+            return
+        self._queue.put((func, args))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="background", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            self._call(*item)
+            if self._queue.empty():
+                # Idle: release the thread's connection as a request would.
+                close_old_connections()
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Runs what is queued and stops the thread; False if it did not finish in time."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return True
+        self._queue.put(None)
+        thread.join(background_setting("DRAIN_TIMEOUT") if timeout is None else timeout)
+        return not thread.is_alive()
+
+
+worker = Worker()
+atexit.register(worker.drain)
+
+
+def submit_on_commit(func: Callable, *args) -> None:
+    """Queues ``func(*args)`` for the worker once the current transaction commits."""
+    transaction.on_commit(lambda: worker.submit(func, *args))
@@ -0,0 +1,161 @@
+"""
+Trigger-maintained row counts.
+
+A model opts in with ``ROW_COUNT_FILTERS``: the combinations of equality
+filters whose counts are kept, e.g. ``("deleted_at__isnull",
+"is_published")``. ``name__isnull`` dimensions count by NULL-ness, the
+others by column value. Triggers (SQLite) update one RowCount row per
+combination on every insert, delete and relevant update, so the counts
+stay exact under bulk writes too. ``counted_rows()`` serves a queryset
+whose WHERE clause is exactly such a combination of equality filters.
+"""
+from django.db import connections, migrations
+from django.db.models.expressions import Col
+from django.db.models.lookups import Exact, IsNull
+from django.db.models.sql.where import AND, WhereNode
+
+from .models import RowCount
+
+ROWCOUNT_TABLE = RowCount._meta.db_table
+
+
+def _dims(filters) -> list[tuple[str, ...]]:
+    return [tuple(sorted(dims)) for dims in filters]
+
+
+def _key_sql(table: str, dims: tuple[str, ...], row: str) -> str:
+    parts = [f"'{table}'"]
+    for dim in dims:
+        if dim.endswith("__isnull"):
+            value = f"({row}.{dim[:-len('__isnull')]} IS NULL)"
+        else:
+            value = f"IFNULL({row}.{dim}, 'null')"
+        parts.append(f"'|{dim}=' || {value}")
+    return " || ".join(parts)
+
+
+def _bump_sql(key_sql: str, delta: int) -> str:
+    return (
+        f"INSERT INTO {ROWCOUNT_TABLE}(name, value) VALUES ({key_sql}, {delta}) "
+        f"ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;"
+    )
+
+
+def counter_trigger_sql(table: str, filters) -> list[str]:
+    dims_list = _dims(filters)
+    columns = sorted({
+        dim.removesuffix("__isnull") for dims in dims_list for dim in dims
+    })
+    on_insert = " ".join(_bump_sql(_key_sql(table, dims, "new"), 1) for dims in dims_list)
+    on_delete = " ".join(_bump_sql(_key_sql(table, dims, "old"), -1) for dims in dims_list)
+    statements = [
+        f"CREATE TRIGGER {table}_rowcount_ai AFTER INSERT ON {table} BEGIN {on_insert} END",
+        f"CREATE TRIGGER {table}_rowcount_ad AFTER DELETE ON {table} BEGIN {on_delete} END",
+    ]
+    if columns:
+        statements.append(
+            f"CREATE TRIGGER {table}_rowcount_au AFTER UPDATE OF {', '.join(columns)} "
+            f"ON {table} BEGIN {on_delete} {on_insert} END"
+        )
+    return statements
+
+
+def rebuild_counts(table: str, filters, using: str = "default") -> None:
+    """Recomputes the counts of ``table`` from scratch."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {ROWCOUNT_TABLE} WHERE name = %s OR name LIKE %s",
+            [table, f"{table}|%"],
+        )
+        for dims in _dims(filters):
+            cursor.execute(
+                f"INSERT INTO {ROWCOUNT_TABLE}(name, value) "
+                f"SELECT {_key_sql(table, dims, 'new')}, COUNT(*) FROM {table} AS new GROUP BY 1"
+            )
+
+
+def counter_migration_operations(table: str, filters) -> list:
+    """Migration operations installing the counters of ``table`` (SQLite only)."""
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for sql in counter_trigger_sql(table, filters):
+                schema_editor.execute(sql)
+            rebuild_counts(table, filters, schema_editor.connection.alias)
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_rowcount_{suffix}")
+            schema_editor.execute(
+                f"DELETE FROM {ROWCOUNT_TABLE} WHERE name = %s OR name LIKE %s",
+                [table, f"{table}|%"],
+            )
+
+    return [migrations.RunPython(forwards, backwards)]
+
+
+def _equality_filters(where: WhereNode, alias: str, filters: dict) -> bool:
+    if where.negated or (where.connector != AND and len(where.children) > 1):
+        return False
+    for child in where.children:
+        if isinstance(child, WhereNode):
+            if not _equality_filters(child, alias, filters):
+                return False
+            continue
+        if not isinstance(child, (Exact, IsNull)):
+            return False
+        if not isinstance(child.lhs, Col) or child.lhs.alias != alias:
+            return False
+        if hasattr(child.rhs, "resolve_expression"):
+            return False
+        column = child.lhs.target.column
+        if isinstance(child, IsNull):
+            dim, value = f"{column}__isnull", bool(child.rhs)
+        else:
+            dim, value = column, child.rhs
+        if filters.setdefault(dim, value) != value:
+            return False
+    return True
+
+
+def filter_key(queryset) -> str | None:
+    """The RowCount name matching ``queryset``'s filters, if it is counted."""
+    model = queryset.model
+    counted = getattr(model, "ROW_COUNT_FILTERS", None)
+    query = queryset.query
+    if not counted or query.distinct or query.combinator or query.is_sliced:
+        return None
+    if connections[queryset.db].vendor != "sqlite":
+        return None
+
+    filters: dict = {}
+    if not _equality_filters(query.where, query.base_table, filters):
+        return None
+    dims = tuple(sorted(filters))
+    if dims not in _dims(counted):
+        return None
+
+    table = model._meta.db_table
+    parts = [table]
+    for dim in dims:
+        value = filters[dim]
+        if isinstance(value, bool):
+            value = int(value)
+        parts.append(f"{dim}={'null' if value is None else value}")
+    return "|".join(parts)
+
+
+def counted_rows(queryset) -> int | None:
+    """Exact count of ``queryset`` from the counters, or None if not counted."""
+    key = filter_key(queryset)
+    if key is None:
+        return None
+    value = (
+        RowCount.objects.using(queryset.db)
+        .filter(name=key)
+        .values_list("value", flat=True)
+        .first()
+    )
+    return value or 0
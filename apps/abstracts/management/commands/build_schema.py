@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.abstracts import schema
+
+
+class Command(BaseCommand):
+    help = "Prebuild the OpenAPI schema served at /api/schema/"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if the prebuilt schema differs from the live one",
+        )
+        parser.add_argument(
+            "--keep-old",
+            action="store_true",
+            help="Keep artifacts of other code versions",
+        )
+
+    def handle(self, *args, **options):
+        version = schema.code_version()
+
+        if options["check"]:
+            stale = schema.diff(version)
+            if stale:
+                raise CommandError(
+                    f"Prebuilt schema {version} is missing or outdated ({', '.join(stale)}); "
+                    "run `manage.py build_schema`"
+                )
+            self.stdout.write(self.style.SUCCESS(f"✅ Schema {version} is up to date"))
+            return
+
+        paths = schema.build(version)
+        removed = 0 if options["keep_old"] else schema.prune(version)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Built schema {version}: {len(paths)} files in {schema.artifact_dir()}"
+            f" (removed {removed} old)"
+        ))
@@ -0,0 +1,58 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.abstracts import startup
+
+
+class Command(BaseCommand):
+    help = "Report cold-start time and import-time cost per module"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="Cold starts to time")
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument(
+            "--by",
+            choices=("module", "package"),
+            default="package",
+            help="Group import cost by top-level package or list single modules",
+        )
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            help="Fail if the median cold start exceeds this many milliseconds",
+        )
+
+    def handle(self, *args, **options):
+        settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "settings.base")
+        try:
+            timings = startup.profile_imports(settings_module)
+            summary = startup.summarize(startup.measure(options["runs"], settings_module))
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        if options["by"] == "package":
+            rows = startup.by_package(timings)
+            self.stdout.write(f"{'self ms':>9}  package")
+        else:
+            rows = [
+                (timing.module, timing.cumulative_us)
+                for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)
+            ]
+            self.stdout.write(f"{'cum ms':>9}  module")
+        for name, us in rows[:options["top"]]:
+            self.stdout.write(f"{us / 1000:9.1f}  {name}")
+
+        total = sum(timing.self_us for timing in timings) / 1000
+        self.stdout.write(
+            f"\n{len(timings)} modules, {total:.0f} ms importing; cold start "
+            f"median {summary['median_ms']:.0f} ms "
+            f"(min {summary['min_ms']:.0f}, max {summary['max_ms']:.0f}, {summary['runs']} runs)"
+        )
+
+        target = options["target_ms"]
+        if target is not None and summary["median_ms"] > target:
+            raise CommandError(
+                f"Cold start {summary['median_ms']:.0f} ms exceeds the {target:.0f} ms target"
+            )
+        self.stdout.write(self.style.SUCCESS("✅ Startup profiled"))
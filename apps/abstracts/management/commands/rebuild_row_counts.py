@@ -0,0 +1,22 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.abstracts.counting import rebuild_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the trigger-maintained row counts from the tables"
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            self.stdout.write("⚠️ Row counters are only maintained on SQLite. Skipping.")
+            return
+
+        for model in apps.get_models():
+            filters = getattr(model, "ROW_COUNT_FILTERS", None)
+            if not filters:
+                continue
+            with transaction.atomic():
+                rebuild_counts(model._meta.db_table, filters)
+            self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt counts for {model._meta.label}"))
@@ -0,0 +1,115 @@
+import threading
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import JsonResponse
+
+from . import profiling
+from .throttling import throttling_setting
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    Sheds load once more than MAX_IN_FLIGHT requests are being handled by
+    this process: further requests get 503 with Retry-After immediately
+    instead of queueing behind the slow ones. Runs natively under both
+    WSGI and ASGI; a streaming response counts only until it is returned.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _enter(self) -> bool:
+        with self._lock:
+            if self.in_flight >= throttling_setting("MAX_IN_FLIGHT"):
+                return False
+            self.in_flight += 1
+            return True
+
+    def _leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _overloaded(self):
+        response = JsonResponse(
+            {"detail": "Server is overloaded, try again later."},
+            status=503,
+        )
+        response["Retry-After"] = str(throttling_setting("RETRY_AFTER"))
+        return response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self._enter():
+            return self._overloaded()
+        try:
+            return self.get_response(request)
+        finally:
+            self._leave()
+
+    async def __acall__(self, request):
+        if not self._enter():
+            return self._overloaded()
+        try:
+            return await self.get_response(request)
+        finally:
+            self._leave()
+
+
+class ProfilerMiddleware:
+    """
+    Profiles requests as apps.abstracts.profiling describes. Goes right
+    after AuthenticationMiddleware. Under ASGI a profiled request is run
+    through the sync thread, where its database queries execute; all
+    other requests pass straight through.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _plan(self, request):
+        """``(view name, user, memory, sampled)`` or None to not profile."""
+        mode = profiling.requested_mode(request)
+        if mode is not None:
+            user = profiling.staff_user(request)
+            if user is not None:
+                return profiling.view_name(request), user, mode == "memory", False
+        if profiling.profiler_setting("SAMPLE_RATES"):
+            name = profiling.view_name(request)
+            if profiling.is_sampled(name):
+                return name, None, False, True
+        return None
+
+    def _profile(self, request, plan, get_response):
+        name, user, memory, sampled = plan
+        return profiling.profile(
+            request, get_response, name=name, user=user, memory=memory, sampled=sampled
+        )
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        plan = self._plan(request)
+        if plan is None:
+            return self.get_response(request)
+        return self._profile(request, plan, self.get_response)
+
+    async def __acall__(self, request):
+        plan = await sync_to_async(self._plan)(request)
+        if plan is None:
+            return await self.get_response(request)
+        return await sync_to_async(self._profile)(
+            request, plan, async_to_sync(self.get_response)
+        )
@@ -1,4 +1,5 @@
 from typing import Any
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
@@ -13,4 +14,44 @@ class AbstractBaseModel(models.Model):
 
     def delete(self, *args: tuple[Any, ...], **kwargs: dict[str, Any]) -> None:
         self.deleted_at = timezone.now()
-        self.save(update_fields=["deleted_at"])
\ No newline at end of file
+        # updated_at too, so soft deletes show up in the changes feed.
+        self.save(update_fields=["deleted_at", "updated_at"])
+
+
+class RowCount(models.Model):
+    """
+    Row counts maintained by database triggers (apps.abstracts.counting),
+    one row per table and filter combination.
+    """
+    name = models.CharField(max_length=255, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class ProfileReport(models.Model):
+    """A profiled request (apps.abstracts.profiling)."""
+    created_at = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    sampled = models.BooleanField(default=False)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2048)
+    view_name = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    query_ms = models.FloatField()
+    functions = models.TextField()
+    allocations = models.TextField(blank=True)
+    queries = models.JSONField(default=list)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sampled', '-id'], name='profilereport_sampled_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
@@ -0,0 +1,317 @@
+"""
+Pagination without unbounded COUNT(*).
+
+A page count comes from, in order: the trigger-maintained counters
+(apps.abstracts.counting) when the filters match a counted combination,
+a COUNT over at most COUNT_LIMIT + 1 rows, or an estimate (see
+estimate_rows()).
+Only the first two are exact. Non-counter results are cached per filter
+signature (the count SQL and its parameters) for CACHE_TTL seconds.
+
+HTML list views page with cursor_page() instead: keyset pagination with
+previous/next links and no count at all.
+"""
+import base64
+import binascii
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from .counting import counted_rows
+
+DEFAULTS = {
+    # Counts up to this many rows are exact; beyond it they are estimated.
+    "COUNT_LIMIT": 10_000,
+    # Where the planner cannot estimate a filtered query, it is counted up to this.
+    "ESTIMATE_LIMIT": 1_000_000,
+    "CACHE_TTL": 10.0,
+    "CACHE_SIZE": 1000,
+    "CURSOR_PAGE_SIZE": 20,
+}
+
+_cache: OrderedDict[tuple, tuple[float, int, bool]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def pagination_setting(name: str):
+    return getattr(settings, "PAGINATION", {}).get(name, DEFAULTS[name])
+
+
+def estimate_table_rows(model, using: str = "default") -> int | None:
+    """
+    Row count of ``model``'s table from planner statistics (or, on SQLite
+    without ANALYZE, the highest id), without scanning it.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+            row = cursor.fetchone()
+            if row and row[0] >= 0:
+                return row[0]
+        elif connection.vendor == "sqlite":
+            if "sqlite_stat1" in connection.introspection.table_names(cursor):
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+                rows = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+                if rows:
+                    return max(rows)
+            pk = model._meta.pk.column
+            cursor.execute(f'SELECT MAX("{pk}") FROM "{table}"')
+            return cursor.fetchone()[0] or 0
+    return None
+
+
+def _whole_table(queryset) -> bool:
+    query = queryset.query
+    return not (query.where or query.distinct or query.is_sliced or query.combinator)
+
+
+def estimate_rows(queryset) -> int | None:
+    """
+    Planner estimate for ``queryset`` itself (PostgreSQL). Elsewhere the
+    table estimate for a whole table, else a COUNT over at most
+    ESTIMATE_LIMIT rows: a filter may keep any share of the table.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    if _whole_table(queryset):
+        return estimate_table_rows(queryset.model, queryset.db)
+    return queryset.order_by()[:pagination_setting("ESTIMATE_LIMIT")].count()
+
+
+def clear_count_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def count_rows(queryset) -> tuple[int, bool]:
+    """``(count, is_exact)`` for ``queryset`` without an unbounded COUNT(*)."""
+    exact = counted_rows(queryset)
+    if exact is not None:
+        return exact, True
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = (queryset.db, sql, tuple(map(str, params)))
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1], cached[2]
+
+    limit = pagination_setting("COUNT_LIMIT")
+    bounded = queryset.order_by()[:limit + 1].count()
+    if bounded <= limit:
+        result = (bounded, True)
+    else:
+        result = (max(bounded, estimate_rows(queryset) or 0), False)
+
+    with _cache_lock:
+        _cache[key] = (now + pagination_setting("CACHE_TTL"), *result)
+        _cache.move_to_end(key)
+        while len(_cache) > pagination_setting("CACHE_SIZE"):
+            _cache.popitem(last=False)
+    return result
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator over querysets using ``count_rows()``, or over any sequence
+    with a ``count_rows()`` method of its own; ``count_is_exact`` tells
+    whether ``count`` is exact. With an estimated count, late pages may
+    come out short or empty.
+    """
+    count_is_exact = True
+
+    @cached_property
+    def count(self) -> int:
+        if hasattr(self.object_list, "query"):
+            count, self.count_is_exact = count_rows(self.object_list)
+        elif hasattr(self.object_list, "count_rows"):
+            count, self.count_is_exact = self.object_list.count_rows()
+        else:
+            return super().count
+        return count
+
+
+class ApproximatePageNumberPagination(PageNumberPagination):
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.page.paginator.count,
+            "count_exact": self.page.paginator.count_is_exact,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response["properties"]["count_exact"] = {"type": "boolean", "example": True}
+        return response
+
+
+class CursorPage:
+    """
+    One page of a keyset-paginated queryset, see cursor_page(). Iterates
+    over its rows; ``next_url``/``previous_url`` are None at either end.
+    """
+
+    def __init__(self, request, object_list, next_cursor, previous_cursor):
+        self.request = request
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def _url(self, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query["cursor"] = cursor
+        return f"{self.request.path}?{query.urlencode()}"
+
+    @property
+    def next_url(self):
+        return self._url(self.next_cursor)
+
+    @property
+    def previous_url(self):
+        return self._url(self.previous_cursor)
+
+    def payload(self, results) -> dict:
+        """JSON body for ``results`` (the serialized rows of this page)."""
+        absolute = self.request.build_absolute_uri
+        return {
+            "next": absolute(self.next_url) if self.has_next else None,
+            "previous": absolute(self.previous_url) if self.has_previous else None,
+            "results": results,
+        }
+
+
+def _ordering(queryset, ordering):
+    """``[(lookup, descending, model field)]``; "pk" stands for the primary key column."""
+    fields = []
+    for name in ordering:
+        descending = name.startswith("-")
+        lookup = name.lstrip("-")
+        if lookup == "pk":
+            lookup = queryset.model._meta.pk.attname
+        model, field = queryset.model, None
+        for part in lookup.split("__"):
+            field = model._meta.get_field(part)
+            model = field.related_model
+        fields.append((lookup, descending, field))
+    return fields
+
+
+def _cursor_value(value):
+    # Full isoformat: DjangoJSONEncoder would cut datetimes to milliseconds.
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _encode_cursor(forward: bool, values: list) -> str:
+    raw = json.dumps([forward, *values], default=_cursor_value).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, fields) -> tuple[bool, list] | None:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        forward, *values = json.loads(raw)
+        if not isinstance(forward, bool) or len(values) != len(fields):
+            return None
+        return forward, [field.to_python(value) for (_, _, field), value in zip(fields, values)]
+    except (ValueError, TypeError, binascii.Error, DjangoValidationError):
+        return None
+
+
+def _row_values(row, fields) -> list:
+    values = []
+    for lookup, _, _ in fields:
+        value = row
+        for part in lookup.split("__"):
+            value = getattr(value, part)
+        values.append(value)
+    return values
+
+
+def _beyond(fields, values, forward: bool) -> Q:
+    """Rows strictly after ``values`` in the page direction."""
+    condition, equal = Q(), {}
+    for (lookup, descending, _), value in zip(fields, values):
+        operator = "lt" if descending == forward else "gt"
+        condition |= Q(**equal, **{f"{lookup}__{operator}": value})
+        equal[lookup] = value
+    return condition
+
+
+def cursor_page(request, queryset, ordering, page_size: int | None = None) -> CursorPage:
+    """
+    The page of ``queryset`` the request's ``cursor`` parameter points at
+    (the first page without one, or with one that does not parse).
+
+    ``ordering`` must end in a unique field, e.g. ``("-published_at",
+    "-pk")``, and its fields must not be NULL. Each page is one indexed
+    range read of ``page_size + 1`` rows, however deep it is.
+    """
+    page_size = page_size or pagination_setting("CURSOR_PAGE_SIZE")
+    fields = _ordering(queryset, ordering)
+    order_by = [f"-{lookup}" if descending else lookup for lookup, descending, _ in fields]
+    reverse = [lookup if descending else f"-{lookup}" for lookup, descending, _ in fields]
+
+    cursor = request.GET.get("cursor")
+    position = _decode_cursor(cursor, fields) if cursor else None
+    if position is None:
+        rows = list(queryset.order_by(*order_by)[:page_size + 1])
+        more, forward = len(rows) > page_size, True
+    else:
+        forward, values = position
+        rows = list(
+            queryset
+            .filter(_beyond(fields, values, forward))
+            .order_by(*(order_by if forward else reverse))[:page_size + 1]
+        )
+        more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if more or not forward:
+            next_cursor = _encode_cursor(True, _row_values(rows[-1], fields))
+        if position is not None and (forward or more):
+            previous_cursor = _encode_cursor(False, _row_values(rows[0], fields))
+    return CursorPage(request, rows, next_cursor, previous_cursor)
@@ -0,0 +1,203 @@
+"""
+On-demand and sampled request profiling.
+
+A staff user adds ``?_profile=1`` or the header ``X-Profile: 1`` to a
+request to run it under cProfile. With ``memory`` instead of ``1``,
+tracemalloc runs as well. The SQL the request issued is captured with
+timings, and the report is stored as a ProfileReport. The response
+links to it in the admin through the X-Profile-Report header.
+
+SAMPLE_RATES maps URL names (``namespace:name``) to N, to profile one
+in N of their requests whoever sends them. Only the newest KEEP_SAMPLED
+sampled reports are kept. A streaming response is profiled only until
+it is returned.
+"""
+import cProfile
+import io
+import itertools
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve, reverse
+
+DEFAULTS = {
+    "PARAM": "_profile",
+    "HEADER": "X-Profile",
+    "SAMPLE_RATES": {},
+    "KEEP_SAMPLED": 200,
+    "TOP_FUNCTIONS": 40,
+    "TOP_ALLOCATIONS": 20,
+    "MAX_QUERIES": 500,
+}
+
+MODES = ("1", "cpu", "memory")
+
+# tracemalloc is process-wide: one memory profile at a time. So is
+# cProfile from Python 3.12 on (sys.monitoring), where a second enable()
+# raises ValueError: one CPU profile at a time as well.
+_memory_lock = threading.Lock()
+_cpu_lock = threading.Lock()
+_counters: defaultdict[str, itertools.count] = defaultdict(itertools.count)
+
+
+def profiler_setting(name: str):
+    return getattr(settings, "PROFILER", {}).get(name, DEFAULTS[name])
+
+
+def requested_mode(request) -> str | None:
+    """The mode asked for by the request, if it is a valid one."""
+    mode = request.GET.get(profiler_setting("PARAM")) or request.headers.get(profiler_setting("HEADER"))
+    return mode if mode in MODES else None
+
+
+def staff_user(request):
+    """The staff user behind a session or a JWT, else None."""
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        from rest_framework.exceptions import APIException
+
+        from apps.accounts.authentication import CachedJWTAuthentication
+
+        try:
+            authenticated = CachedJWTAuthentication().authenticate(request)
+        except APIException:
+            return None
+        user = authenticated[0] if authenticated else None
+    return user if user is not None and user.is_staff else None
+
+
+def view_name(request) -> str:
+    try:
+        return resolve(request.path_info).view_name
+    except Resolver404:
+        return ""
+
+
+def is_sampled(name: str) -> bool:
+    rate = profiler_setting("SAMPLE_RATES").get(name)
+    return bool(rate) and next(_counters[name]) % rate == 0
+
+
+class QueryLog:
+    """execute_wrapper collecting ``{"sql", "ms"}`` of every query."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.queries = []
+        self.count = 0
+        self.total_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.total_ms += ms
+            if len(self.queries) < self.limit:
+                self.queries.append({"sql": sql, "ms": round(ms, 3)})
+
+
+def _functions(profile: cProfile.Profile) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(profiler_setting("TOP_FUNCTIONS"))
+    return stream.getvalue()
+
+
+def _allocations(snapshot: tracemalloc.Snapshot) -> str:
+    top = snapshot.statistics("lineno")[:profiler_setting("TOP_ALLOCATIONS")]
+    return "\n".join(str(stat) for stat in top)
+
+
+def profile(request, get_response, *, name: str, user=None, memory=False, sampled=False):
+    """
+    Runs ``get_response(request)`` under the profilers and stores the report.
+    While another request is being profiled, it just runs unprofiled.
+    """
+    if not _cpu_lock.acquire(blocking=False):
+        return get_response(request)
+    try:
+        return _profile(request, get_response, name=name, user=user, memory=memory, sampled=sampled)
+    finally:
+        _cpu_lock.release()
+
+
+def _profile(request, get_response, *, name, user, memory, sampled):
+    from .models import ProfileReport
+
+    memory = memory and not tracemalloc.is_tracing() and _memory_lock.acquire(blocking=False)
+    queries = QueryLog(profiler_setting("MAX_QUERIES"))
+    profiler = cProfile.Profile()
+    snapshot = None
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            if memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            try:
+                profiler.enable()
+            except ValueError:
+                # A profiler or debugger outside this module holds the hook.
+                profiler = None
+            try:
+                response = get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                duration_ms = (time.perf_counter() - started) * 1000
+                if memory:
+                    snapshot = tracemalloc.take_snapshot()
+                    tracemalloc.stop()
+    finally:
+        if memory:
+            _memory_lock.release()
+    if profiler is None:
+        return response
+
+    report = ProfileReport.objects.create(
+        user=user,
+        sampled=sampled,
+        method=request.method,
+        path=request.get_full_path()[:2048],
+        view_name=name,
+        status_code=response.status_code,
+        duration_ms=duration_ms,
+        query_count=queries.count,
+        query_ms=queries.total_ms,
+        functions=_functions(profiler),
+        allocations=_allocations(snapshot) if snapshot else "",
+        queries=queries.queries,
+    )
+    if sampled:
+        prune()
+    else:
+        response["X-Profile-Report"] = reverse(
+            "admin:abstracts_profilereport_change", args=[report.pk]
+        )
+    return response
+
+
+def prune() -> int:
+    """Drops sampled reports beyond the newest KEEP_SAMPLED."""
+    from .models import ProfileReport
+
+    keep = profiler_setting("KEEP_SAMPLED")
+    sampled = ProfileReport.objects.filter(sampled=True)
+    boundary = list(sampled.order_by("-id").values_list("id", flat=True)[keep:keep + 1])
+    if not boundary:
+        return 0
+    return sampled.filter(id__lte=boundary[0]).delete()[0]
+
+
+def reset() -> None:
+    _counters.clear()
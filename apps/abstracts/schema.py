@@ -0,0 +1,150 @@
+"""
+Prebuilt OpenAPI schema.
+
+Generating the schema introspects every ViewSet and serializer, so it is
+done once per code version (``manage.py build_schema`` at deploy, or on
+the first request otherwise) and written to ARTIFACTS_ROOT as YAML and
+JSON plus their gzipped copies. Requests are served from memory.
+"""
+import gzip
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from importlib.metadata import version as package_version
+from pathlib import Path
+
+from django.conf import settings
+
+FORMATS = ("yaml", "json")
+SOURCE_DIRS = ("apps", "settings")
+
+_lock = threading.Lock()
+_loaded: dict[str, "SchemaArtifact"] = {}
+_code_version: str | None = None
+
+
+@dataclass(frozen=True)
+class SchemaArtifact:
+    fmt: str
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+
+def code_version() -> str:
+    """
+    SCHEMA_VERSION from the environment (e.g. the deployed commit), or a
+    digest of the project sources and the schema-relevant packages.
+    """
+    global _code_version
+    if _code_version is None:
+        _code_version = os.getenv("SCHEMA_VERSION") or _source_digest()
+    return _code_version
+
+
+def _source_digest() -> str:
+    digest = hashlib.sha256()
+    for package in ("django", "djangorestframework", "drf-spectacular"):
+        digest.update(f"{package}=={package_version(package)}\n".encode())
+    base = Path(settings.BASE_DIR)
+    for name in SOURCE_DIRS:
+        for path in sorted((base / name).rglob("*.py")):
+            if "migrations" in path.parts:
+                continue
+            digest.update(str(path.relative_to(base)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def artifact_dir() -> Path:
+    return Path(settings.ARTIFACTS_ROOT) / "schema"
+
+
+def artifact_path(fmt: str, version: str | None = None) -> Path:
+    return artifact_dir() / f"openapi-{version or code_version()}.{fmt}"
+
+
+def render_schema() -> dict[str, bytes]:
+    """Generates the live schema in every format."""
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    return {
+        "yaml": OpenApiYamlRenderer().render(schema, renderer_context={}),
+        "json": OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Per process: workers building at the same time must not share one.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def build(version: str | None = None) -> list[Path]:
+    """Writes the artifacts for ``version``; returns the written paths."""
+    directory = artifact_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for fmt, body in render_schema().items():
+        path = artifact_path(fmt, version)
+        _write_atomic(path, body)
+        # mtime=0 keeps the gzip output identical for identical input.
+        _write_atomic(path.with_name(path.name + ".gz"), gzip.compress(body, mtime=0))
+        written += [path, path.with_name(path.name + ".gz")]
+    _loaded.clear()
+    return written
+
+
+def prune(keep: str | None = None) -> int:
+    """Removes artifacts of other code versions."""
+    keep = keep or code_version()
+    removed = 0
+    for path in artifact_dir().glob("openapi-*"):
+        if not path.name.startswith(f"openapi-{keep}."):
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def diff(version: str | None = None) -> list[str]:
+    """Formats whose prebuilt artifact is missing or differs from the live schema."""
+    stale = []
+    for fmt, body in render_schema().items():
+        path = artifact_path(fmt, version)
+        if not path.exists() or path.read_bytes() != body:
+            stale.append(fmt)
+    return stale
+
+
+def get_artifact(fmt: str) -> SchemaArtifact:
+    """The artifact for the running code version, built on first use if missing."""
+    artifact = _loaded.get(fmt)
+    if artifact is not None:
+        return artifact
+    with _lock:
+        artifact = _loaded.get(fmt)
+        if artifact is None:
+            path = artifact_path(fmt)
+            if not path.exists():
+                build()
+            body = path.read_bytes()
+            artifact = SchemaArtifact(
+                fmt=fmt,
+                body=body,
+                gzipped=path.with_name(path.name + ".gz").read_bytes(),
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            )
+            _loaded[fmt] = artifact
+    return artifact
+
+
+def reset() -> None:
+    """Forgets loaded artifacts and the computed code version."""
+    global _code_version
+    with _lock:
+        _loaded.clear()
+        _code_version = None
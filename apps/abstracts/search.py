@@ -0,0 +1,77 @@
+"""
+Indexed text search.
+
+On SQLite, large text columns are mirrored into FTS5 tables (created by
+migrations through ``fts_migration_operations``) and kept in sync by
+triggers. Other backends fall back to Django's default ``icontains``
+search until they get an equivalent index.
+"""
+from django.db import connection, migrations
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+_available: dict[str, bool] = {}
+
+
+def fts_table_sql(table: str, source: str, columns: tuple[str, ...]) -> list[str]:
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{col}" for col in columns)
+    old_cols = ", ".join(f"old.{col}" for col in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {table} USING fts5({cols}, content='{source}', content_rowid='id')",
+        f"CREATE TRIGGER {table}_ai AFTER INSERT ON {source} BEGIN "
+        f"INSERT INTO {table}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"CREATE TRIGGER {table}_ad AFTER DELETE ON {source} BEGIN "
+        f"INSERT INTO {table}({table}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END",
+        f"CREATE TRIGGER {table}_au AFTER UPDATE OF {cols} ON {source} BEGIN "
+        f"INSERT INTO {table}({table}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {table}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+    ]
+
+
+def fts_migration_operations(table: str, source: str, columns: tuple[str, ...]) -> list:
+    """Migration operations creating an FTS5 mirror of ``source`` (SQLite only)."""
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for sql in fts_table_sql(table, source, columns):
+                schema_editor.execute(sql)
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_{suffix}")
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    return [migrations.RunPython(forwards, backwards)]
+
+
+def fts_available(table: str) -> bool:
+    if connection.vendor != "sqlite":
+        return False
+    key = f"{connection.settings_dict['NAME']}:{table}"
+    if key not in _available:
+        with connection.cursor() as cursor:
+            _available[key] = table in connection.introspection.table_names(cursor)
+    return _available[key]
+
+
+def fts_query(term: str) -> str:
+    """Turns user input into an FTS5 query: every word, as a prefix."""
+    words = [word.replace('"', '""') for word in term.split()]
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def fts_filter(queryset, table: str, term: str):
+    return queryset.filter(
+        pk__in=RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [fts_query(term)])
+    )
+
+
+def prefix_q(field: str, term: str) -> Q:
+    """
+    Case-sensitive prefix match written as a range, so it can use the
+    index on ``field`` (LIKE 'x%' cannot on most backends).
+    """
+    return Q(**{f"{field}__gte": term, f"{field}__lt": term + "\uffff"})
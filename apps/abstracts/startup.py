@@ -0,0 +1,93 @@
+"""
+Cold-start measurement.
+
+Each run is a fresh interpreter that sets Django up and loads the URLconf,
+which is what a worker does before it can serve its first request.
+Profiling runs add ``-X importtime`` and parse the per-module timings the
+interpreter reports on stderr.
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+BOOT_CODE = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".")[0]
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    timings = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return timings
+
+
+def by_package(timings: list[ImportTiming]) -> list[tuple[str, int]]:
+    """Total self time per top-level package, most expensive first."""
+    totals: dict[str, int] = defaultdict(int)
+    for timing in timings:
+        totals[timing.package] += timing.self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def _boot(settings_module: str, extra_args: list[str]) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    proc = subprocess.run(
+        [sys.executable, *extra_args, "-c", BOOT_CODE],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f"Boot failed:\n{proc.stderr[-2000:]}")
+    return proc
+
+
+def profile_imports(settings_module: str = "settings.base") -> list[ImportTiming]:
+    return parse_importtime(_boot(settings_module, ["-X", "importtime"]).stderr)
+
+
+def measure(runs: int = 5, settings_module: str = "settings.base") -> list[float]:
+    """Wall-clock cold start times in milliseconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _boot(settings_module, [])
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def summarize(times: list[float]) -> dict[str, float]:
+    return {
+        "runs": len(times),
+        "min_ms": min(times),
+        "median_ms": statistics.median(times),
+        "max_ms": max(times),
+    }
@@ -0,0 +1,132 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+DEFAULTS = {
+    # scope -> refill rate in tokens per second and bucket size
+    "BUCKETS": {
+        "comment_write": {"rate": 0.2, "burst": 10},
+        "anon_news_list": {"rate": 5.0, "burst": 60},
+    },
+    "MAX_KEYS": 100_000,
+    # Name of a Django cache shared by all workers; None keeps buckets local.
+    "SHARED_CACHE": None,
+    "MAX_IN_FLIGHT": 64,
+    "RETRY_AFTER": 1,
+}
+
+
+def throttling_setting(name: str):
+    return getattr(settings, "THROTTLING", {}).get(name, DEFAULTS[name])
+
+
+class TokenBucketStore:
+    """
+    Token buckets keyed by an arbitrary string.
+
+    Local mode keeps ``key -> [tokens, updated_at]`` in a dict under one
+    lock, which costs a few microseconds per decision. When the dict grows
+    past MAX_KEYS, full (idle) buckets are dropped first since forgetting
+    them changes nothing. Shared mode keeps the same pair in a Django cache
+    so workers see each other's consumption; its read-modify-write is not
+    atomic and may admit a few extra requests under contention.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: dict[str, list[float]] = {}
+
+    def _refill(self, state: list[float] | None, now: float, rate: float, burst: float) -> list[float]:
+        if state is None:
+            return [burst, now]
+        tokens, updated_at = state
+        return [min(burst, tokens + (now - updated_at) * rate), now]
+
+    def consume(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Takes ``cost`` tokens; returns 0 if allowed, else seconds to wait."""
+        now = time.monotonic()
+        shared = throttling_setting("SHARED_CACHE")
+        if shared:
+            return self._consume_shared(caches[shared], key, now, rate, burst, cost)
+
+        with self._lock:
+            state = self._refill(self._buckets.get(key), now, rate, burst)
+            allowed = state[0] >= cost
+            if allowed:
+                state[0] -= cost
+            self._buckets[key] = state
+            if len(self._buckets) > throttling_setting("MAX_KEYS"):
+                self._evict(now, rate, burst)
+        return 0.0 if allowed else (cost - state[0]) / rate
+
+    def _consume_shared(self, cache, key, now, rate, burst, cost) -> float:
+        # time.monotonic() is per process; shared buckets need wall time.
+        now = time.time()
+        cache_key = f"throttle:{key}"
+        state = self._refill(cache.get(cache_key), now, rate, burst)
+        allowed = state[0] >= cost
+        if allowed:
+            state[0] -= cost
+        cache.set(cache_key, state, timeout=math.ceil(burst / rate) + 1)
+        return 0.0 if allowed else (cost - state[0]) / rate
+
+    def _evict(self, now: float, rate: float, burst: float) -> None:
+        idle = [
+            key for key, (tokens, updated_at) in self._buckets.items()
+            if tokens + (now - updated_at) * rate >= burst
+        ]
+        for key in idle or list(self._buckets)[: len(self._buckets) // 2]:
+            del self._buckets[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+bucket_store = TokenBucketStore()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle backed by ``bucket_store``.
+
+    Buckets are keyed per scope and per client: the user id for
+    authenticated requests, the client IP otherwise. X-Forwarded-For only
+    counts when REST_FRAMEWORK["NUM_PROXIES"] says proxies set it.
+    """
+    scope: str = ""
+
+    def get_client_key(self, request) -> str:
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view) -> bool:
+        config = throttling_setting("BUCKETS")[self.scope]
+        self._wait = bucket_store.consume(
+            f"{self.scope}:{self.get_client_key(request)}",
+            config["rate"],
+            config["burst"],
+        )
+        return self._wait == 0.0
+
+    def wait(self):
+        return self._wait
+
+
+class CommentWriteThrottle(TokenBucketThrottle):
+    scope = "comment_write"
+
+
+class AnonNewsListThrottle(TokenBucketThrottle):
+    scope = "anon_news_list"
+
+    def allow_request(self, request, view) -> bool:
+        if request.user.is_authenticated:
+            return True
+        return super().allow_request(request, view)
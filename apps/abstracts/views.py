@@ -1,3 +1,45 @@
-from django.shortcuts import render
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+from . import schema
+
+CONTENT_TYPES = {
+    "yaml": "application/vnd.oai.openapi; charset=utf-8",
+    "json": "application/vnd.oai.openapi+json; charset=utf-8",
+}
+
+
+_swagger_view = None
+
+
+def swagger_ui(request, *args, **kwargs):
+    """Swagger UI; drf_spectacular's views are only imported on first use."""
+    global _swagger_view
+    if _swagger_view is None:
+        from drf_spectacular.views import SpectacularSwaggerView
+
+        _swagger_view = SpectacularSwaggerView.as_view(url_name="schema")
+    return _swagger_view(request, *args, **kwargs)
+
+
+@require_GET
+def openapi_schema(request):
+    """Serves the prebuilt OpenAPI schema (YAML, or JSON with ?format=json)."""
+    fmt = request.GET.get("format", "yaml")
+    if fmt not in schema.FORMATS:
+        raise Http404("Unknown schema format")
+    artifact = schema.get_artifact(fmt)
+
+    if artifact.etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+    elif "gzip" in request.headers.get("Accept-Encoding", ""):
+        response = HttpResponse(artifact.gzipped, content_type=CONTENT_TYPES[fmt])
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(artifact.body, content_type=CONTENT_TYPES[fmt])
+
+    response["ETag"] = artifact.etag
+    response["Cache-Control"] = "public, max-age=300"
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -1,16 +1,22 @@
 from django.contrib import admin
+
+from apps.abstracts.admin import ScalableModelAdmin
 from .models import User, Author
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(ScalableModelAdmin):
     list_display = ('id', 'username', 'email', 'is_staff', 'is_superuser', 'is_active', 'created_at')
     list_filter = ('is_staff', 'is_superuser', 'is_active')
     search_fields = ('username', 'email')
+    prefix_search_fields = ('email', 'username')
     readonly_fields = ('created_at', 'updated_at')
 
 
 @admin.register(Author)
-class AuthorAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'description', 'deleted_at', 'created_at', 'updated_at')
-    search_fields = ('user__username',)
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+class AuthorAdmin(ScalableModelAdmin):
+    list_display = ('id', 'user', 'slug', 'description', 'deleted_at', 'created_at', 'updated_at')
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
+    search_fields = ('user__email',)
+    prefix_search_fields = ('user__email',)
+    readonly_fields = ('created_at', 'updated_at')
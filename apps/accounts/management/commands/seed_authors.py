@@ -1,14 +1,15 @@
 from django.core.management.base import BaseCommand
-from faker import Faker
 from apps.accounts.models import User, Author
 
-fake = Faker()
-
 
 class Command(BaseCommand):
     help = "Create author profiles for users"
 
     def handle(self, *args, **options):
+        from faker import Faker
+
+        fake = Faker()
+
         users_without_author = User.objects.filter(author_profile__isnull=True)
 
         if not users_without_author.exists():
@@ -1,15 +1,17 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
-from faker import Faker
 
 User = get_user_model()
-fake = Faker()
 
 
 class Command(BaseCommand):
     help = "Seed users"
 
     def handle(self, *args, **options):
+        from faker import Faker
+
+        fake = Faker()
+
         if User.objects.exists():
             self.stdout.write("⚠️ Users already exist. Skipping.")
             return
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+from apps.accounts.models import unique_slug
+
+
+def populate_slugs(apps, schema_editor):
+    Author = apps.get_model("accounts", "Author")
+    used = set()
+    authors = Author.objects.select_related("user").order_by("id")
+    batch = []
+    for author in authors.iterator(chunk_size=2000):
+        author.slug = unique_slug(author.user.username, lambda base: used)
+        used.add(author.slug)
+        batch.append(author)
+        if len(batch) >= 2000:
+            Author.objects.bulk_update(batch, ["slug"])
+            batch = []
+    Author.objects.bulk_update(batch, ["slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='slug',
+            field=models.SlugField(max_length=150, null=True),
+        ),
+        migrations.RunPython(populate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='author',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=150, unique=True),
+        ),
+    ]
@@ -0,0 +1,57 @@
+import re
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+PLACEHOLDER = re.compile(r"^author(-\d+)?$")
+
+
+def unique_slug(username, taken):
+    # Frozen copy of apps.accounts.models.unique_slug.
+    base = slugify(username, allow_unicode=True)[:140] or "author"
+    used = taken(base)
+    slug, n = base, 1
+    while slug in used:
+        n += 1
+        slug = f"{base}-{n}"
+    return slug
+
+
+def unicode_slugs(apps, schema_editor):
+    # Non-Latin usernames used to slugify to nothing and fell back to
+    # author, author-2, ...; give those authors slugs from their names.
+    Author = apps.get_model("accounts", "Author")
+    authors = (
+        Author.objects
+        .filter(slug__startswith="author")
+        .select_related("user")
+        .order_by("id")
+    )
+    for author in authors.iterator(chunk_size=2000):
+        if not PLACEHOLDER.match(author.slug):
+            continue
+        if not slugify(author.user.username, allow_unicode=True):
+            continue
+        slug = unique_slug(
+            author.user.username,
+            lambda base: set(
+                Author.objects.filter(slug__startswith=base).values_list("slug", flat=True)
+            ),
+        )
+        Author.objects.filter(pk=author.pk).update(slug=slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_author_slug'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='author',
+            name='slug',
+            field=models.SlugField(allow_unicode=True, blank=True, max_length=150, unique=True),
+        ),
+        migrations.RunPython(unicode_slugs, migrations.RunPython.noop),
+    ]
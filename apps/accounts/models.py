@@ -1,6 +1,7 @@
 from typing import Any
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.utils.text import slugify
 from apps.abstracts.models import AbstractBaseModel
 
 
@@ -47,17 +48,65 @@ class User(AbstractUser, AbstractBaseModel):
     def __str__(self) -> str:
         return self.email
     
+def unique_slug(username: str, taken) -> str:
+    """
+    ``username`` as a slug, suffixed with -2, -3, ... past the slugs in
+    ``taken`` (a callable given the base slug, returning the set in use).
+    Letters are kept as they are, so Cyrillic usernames give Cyrillic slugs.
+    """
+    base = slugify(username, allow_unicode=True)[:140] or "author"
+    used = taken(base)
+    slug, n = base, 1
+    while slug in used:
+        n += 1
+        slug = f"{base}-{n}"
+    return slug
+
+
 class Author(AbstractBaseModel):
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
         related_name="author_profile",
     )
+    # Set from the username when left blank and kept when it changes, so profile URLs stay put.
+    slug = models.SlugField(max_length=150, unique=True, blank=True, allow_unicode=True)
     description = models.TextField(blank=True, null=True)
 
     class Meta:
         verbose_name = "Author"
         verbose_name_plural = "Authors"
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="author_updated_idx"),
+        ]
 
     def __str__(self) -> str:
-        return self.user.email
\ No newline at end of file
+        return self.user.email
+
+    SLUG_ATTEMPTS = 5
+
+    def _free_slug(self) -> str:
+        return unique_slug(
+            self.user.username,
+            lambda base: set(
+                Author.objects.filter(slug__startswith=base).values_list("slug", flat=True)
+            ),
+        )
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if self.slug:
+            super().save(*args, **kwargs)
+            return
+        # Check-then-insert: a concurrent sign-up may take the same slug
+        # first, so pick the next free one and try again.
+        for attempt in range(self.SLUG_ATTEMPTS):
+            self.slug = self._free_slug()
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                lost_slug = Author.objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                self.slug = ""
+                if not lost_slug or attempt == self.SLUG_ATTEMPTS - 1:
+                    raise
@@ -0,0 +1,165 @@
+"""
+Cached identity resolution.
+
+Authenticated requests need the same few facts about the caller: the user
+row, whether it is active/staff and the id of its author profile. They are
+loaded with one joined query and kept in a per-process LRU with a TTL;
+saving or deleting a User or Author evicts the entry (other workers pick
+the change up when the TTL expires).
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import Author
+
+User = get_user_model()
+
+DEFAULTS = {
+    "MAX_SIZE": 10_000,
+    "TTL": 60.0,
+}
+
+
+def principal_setting(name: str):
+    return getattr(settings, "PRINCIPAL_CACHE", {}).get(name, DEFAULTS[name])
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int | None
+    is_active: bool = False
+    is_staff: bool = False
+    is_superuser: bool = False
+    author_id: int | None = None
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self.user_id is not None
+
+    @property
+    def is_author(self) -> bool:
+        return self.author_id is not None
+
+
+ANONYMOUS = Principal(user_id=None)
+
+_USER_FIELDS = [field.attname for field in User._meta.concrete_fields]
+_AUTHOR_FIELDS = [field.attname for field in Author._meta.concrete_fields]
+
+
+class PrincipalCache:
+    """
+    LRU of ``user_id -> (expires_at, user values, author values, Principal)``.
+
+    Raw field values are cached rather than model instances so every
+    request gets its own ``User`` and views can mutate it freely.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, tuple] = OrderedDict()
+
+    def _load(self, user_id: int) -> tuple | None:
+        user = (
+            User.objects
+            .select_related("author_profile")
+            .filter(pk=user_id)
+            .first()
+        )
+        if user is None:
+            return None
+        author = getattr(user, "author_profile", None)
+        principal = Principal(
+            user_id=user.pk,
+            is_active=user.is_active,
+            is_staff=user.is_staff,
+            is_superuser=user.is_superuser,
+            author_id=author.pk if author else None,
+        )
+        return (
+            time.monotonic() + principal_setting("TTL"),
+            tuple(getattr(user, name) for name in _USER_FIELDS),
+            tuple(getattr(author, name) for name in _AUTHOR_FIELDS) if author else None,
+            principal,
+        )
+
+    def _entry(self, user_id: int) -> tuple | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                return entry
+
+        entry = self._load(user_id)
+        if entry is None:
+            return None
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > principal_setting("MAX_SIZE"):
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_user(self, user_id: int):
+        """A fresh ``User`` with ``author_profile`` preloaded, or None."""
+        entry = self._entry(int(user_id))
+        if entry is None:
+            return None
+        _, user_values, author_values, principal = entry
+        user = User.from_db(DEFAULT_DB_ALIAS, _USER_FIELDS, user_values)
+        author = (
+            Author.from_db(DEFAULT_DB_ALIAS, _AUTHOR_FIELDS, author_values)
+            if author_values else None
+        )
+        # Caches the reverse one-to-one either way, so hasattr(user,
+        # "author_profile") never queries.
+        User.author_profile.related.set_cached_value(user, author)
+        if author is not None:
+            Author.user.field.set_cached_value(author, user)
+        user._principal = principal
+        return user
+
+    def get_principal(self, user_id: int) -> Principal:
+        entry = self._entry(int(user_id))
+        return entry[3] if entry else ANONYMOUS
+
+    def evict(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+def get_principal(request) -> Principal:
+    """
+    The request-scoped identity of the caller.
+
+    Works with DRF and plain Django requests and is memoized on the
+    underlying HttpRequest for as long as the authenticated user is the same.
+    """
+    user = getattr(request, "user", None)
+    user_id = user.pk if user is not None and user.is_authenticated else None
+
+    django_request = getattr(request, "_request", request)
+    principal = getattr(django_request, "_principal", None)
+    if principal is not None and principal.user_id == user_id:
+        return principal
+
+    if user_id is None:
+        principal = ANONYMOUS
+    else:
+        principal = getattr(user, "_principal", None) or principal_cache.get_principal(user_id)
+    django_request._principal = principal
+    return principal
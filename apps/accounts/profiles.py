@@ -0,0 +1,92 @@
+"""
+Cached author profile bundles.
+
+An author's public profile (the author, their counts and the latest
+LATEST published news cards) is assembled once and kept as a single
+entry in the Django cache named by CACHE. Counts come from the daily
+rollups of apps.news.stats. The entry is dropped after the commit that
+publishes, edits, unpublishes or deletes one of the author's news, or
+that changes the author or their user; comments only show up once TTL
+expires. With a shared cache backend the invalidation reaches every
+worker, with the default local-memory one each process only its own.
+"""
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import Author
+
+DEFAULTS = {
+    "LATEST": 10,
+    "CACHE": "default",
+    "TTL": 300,
+}
+
+
+def profile_setting(name: str):
+    return getattr(settings, "AUTHOR_PROFILES", {}).get(name, DEFAULTS[name])
+
+
+def _cache():
+    return caches[profile_setting("CACHE")]
+
+
+def cache_key(slug: str) -> str:
+    return f"author-profile:{slug}"
+
+
+def build(author: Author) -> dict:
+    from apps.news import stats
+    from apps.news.cards import card_payloads
+    from apps.news.models import NewsCard
+
+    user = author.user
+    latest = (
+        NewsCard.objects
+        .filter(author_id=author.id, is_published=True, deleted_at__isnull=True)
+        .order_by("-created_at")
+    )[:profile_setting("LATEST")]
+    return {
+        "author": {
+            "id": author.id,
+            "slug": author.slug,
+            "username": user.username,
+            "display_name": user.get_full_name() or user.username,
+            "description": author.description or "",
+            "since": author.created_at.isoformat(),
+        },
+        "counts": stats.query(date.min, date.max, group_by=None, author_id=author.id)["totals"],
+        "latest": card_payloads(latest),
+    }
+
+
+def get_bundle(slug: str) -> dict | None:
+    """The profile of the live author with this slug, or None."""
+    cache = _cache()
+    bundle = cache.get(cache_key(slug))
+    if bundle is None:
+        author = (
+            Author.objects
+            .filter(slug=slug, deleted_at__isnull=True, user__is_active=True)
+            .select_related("user")
+            .first()
+        )
+        if author is None:
+            return None
+        bundle = build(author)
+        cache.set(cache_key(slug), bundle, profile_setting("TTL"))
+    return bundle
+
+
+def invalidate(author_ids) -> None:
+    slugs = Author.objects.filter(id__in=list(author_ids)).values_list("slug", flat=True)
+    _cache().delete_many([cache_key(slug) for slug in slugs])
+
+
+def invalidate_on_commit(author_ids) -> None:
+    # Only after commit: a bundle built before it would hold the old rows.
+    author_ids = set(author_ids)
+    if author_ids:
+        transaction.on_commit(lambda: invalidate(author_ids))
@@ -45,6 +45,34 @@ class UserDetailSerializer(UserBaseSerializer):
             "is_staff",
             "is_superuser",
         )
+        extra_kwargs = {
+            "password": {"write_only": True},
+        }
+
+    def get_is_author(self, obj: Any) -> bool:
+        return hasattr(obj, "author_profile")
+
+
+class PublicUserSerializer(ModelSerializer):
+    """
+    What anyone may see of a user wherever users are nested in other
+    payloads. Select ``author_profile`` along with the user so is_author
+    does not cost a query per row.
+    """
+    display_name = SerializerMethodField()
+    is_author = SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = (
+            "id",
+            "username",
+            "display_name",
+            "is_author",
+        )
+
+    def get_display_name(self, obj: Any) -> str:
+        return obj.get_full_name() or obj.username
 
     def get_is_author(self, obj: Any) -> bool:
         return hasattr(obj, "author_profile")
@@ -85,6 +113,7 @@ class AuthorListSerializer(AuthorBaseSerializer):
         model = Author
         fields = (
             "id",
+            "slug",
             "user_email",
             "description",
             "news_count",
@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import profiles
+from .models import Author
+from .principals import principal_cache
+
+User = get_user_model()
+
+
+def _evict(user_id):
+    principal_cache.evict(user_id)
+    # Again after commit: another thread may have cached the old row meanwhile.
+    transaction.on_commit(lambda: principal_cache.evict(user_id))
+
+
+@receiver([post_save, post_delete], sender=User)
+def evict_user_principal(sender, instance, **kwargs):
+    _evict(instance.pk)
+
+
+# User fields shown in author records; changing them counts as an author change.
+AUTHOR_USER_FIELDS = {"username", "first_name", "last_name", "email"}
+
+
+@receiver(post_save, sender=User)
+def touch_author(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and not set(update_fields) & AUTHOR_USER_FIELDS:
+        return
+    Author.objects.filter(user_id=instance.pk).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Author)
+def evict_author_principal(sender, instance, **kwargs):
+    _evict(instance.user_id)
+
+
+@receiver(post_save, sender=Author)
+def invalidate_saved_profile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    profiles.invalidate_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_profile(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and not set(update_fields) & (AUTHOR_USER_FIELDS | {"is_active"}):
+        return
+    profiles.invalidate_on_commit(
+        Author.objects.filter(user_id=instance.pk).values_list("id", flat=True)
+    )
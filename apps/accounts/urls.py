@@ -10,6 +10,7 @@ router.register(r'api/authors', views.AuthorViewSet, basename='author')
 
 urlpatterns = [
     path('authors/', views.author_list, name='author_list'),
+    path('authors/<str:slug>/', views.author_profile, name='author_profile'),
     path('author/<str:username>/', views.author_detail, name='author_detail'),
     
     path('', include(router.urls)),
@@ -1,6 +1,6 @@
 from django.shortcuts import get_object_or_404, render
 from django.contrib.auth import get_user_model
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 
 from rest_framework.viewsets import ViewSet
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
@@ -8,7 +8,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 
+from . import profiles
 from .models import Author
+from .principals import get_principal
 from .serializers import (
     UserListSerializer,
     UserDetailSerializer,
@@ -17,8 +19,9 @@ from .serializers import (
     AuthorDetailSerializer,
 )
 
-from apps.news.models import News
-from apps.news.serializers import NewsListSerializer
+from apps.abstracts.pagination import cursor_page
+from apps.news.cards import card_payloads
+from apps.news.models import NewsCard
 
 User = get_user_model()
 
@@ -134,21 +137,20 @@ class AuthorViewSet(ViewSet):
         author = get_object_or_404(self._base_qs(), pk=pk)
 
         qs = (
-            News.objects
+            NewsCard.objects
             .filter(
-                author=author,
+                author_id=author.id,
                 is_published=True,
                 deleted_at__isnull=True,
             )
-            .select_related("category")
             .order_by("-created_at")
         )
 
-        return Response(NewsListSerializer(qs, many=True).data)
+        return Response(card_payloads(qs))
 
     @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
     def become_author(self, request):
-        if hasattr(request.user, "author_profile"):
+        if get_principal(request).is_author:
             return Response(
                 {"detail": "Already an author."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -169,19 +171,31 @@ def author_list(request):
         Author.objects
         .filter(user__is_active=True, deleted_at__isnull=True)
         .select_related("user")
-        .order_by("user__email")
     )
+    page = cursor_page(request, authors, ("user__email", "pk"))
 
     if request.headers.get("Accept") == "application/json":
-        return JsonResponse(
-            AuthorListSerializer(authors, many=True).data,
-            safe=False,
-        )
+        return JsonResponse(page.payload(AuthorListSerializer(page, many=True).data))
 
     return render(
         request,
         "author_list.html",
-        {"authors": authors, "title": "Список Авторов"},
+        {"authors": page, "title": "Список Авторов"},
+    )
+
+
+def author_profile(request, slug):
+    bundle = profiles.get_bundle(slug)
+    if bundle is None:
+        raise Http404("No author with this slug.")
+
+    if request.headers.get("Accept") == "application/json":
+        return JsonResponse(bundle)
+
+    return render(
+        request,
+        "author_profile.html",
+        {**bundle, "title": f"Автор: {bundle['author']['display_name']}"},
     )
 
 
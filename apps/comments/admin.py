@@ -1,9 +1,24 @@
 from django.contrib import admin
+
+from apps.abstracts.admin import ScalableModelAdmin
 from .models import Comment
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'news', 'parent', 'deleted_at', 'created_at')
-    search_fields = ('user__username', 'news__title', 'text')
+class CommentAdmin(ScalableModelAdmin):
+    list_display = ('id', 'user', 'news', 'parent_id', 'deleted_at', 'created_at')
+    list_select_related = ('user', 'news')
+    autocomplete_fields = ('user', 'news')
+    raw_id_fields = ('parent',)
+    search_fields = ('text',)
+    fts_table = 'comments_comment_fts'
     list_filter = ('created_at',)
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+    readonly_fields = ('created_at', 'updated_at')
+    actions = ('soft_delete_selected',)
+
+    def batch_updated(self, pks, values):
+        if values.get("deleted_at"):
+            # Same as deleting through the API: replies go with their parent.
+            self.bulk_update(
+                Comment.objects.filter(parent_id__in=pks, deleted_at__isnull=True),
+                deleted_at=values["deleted_at"],
+            )
@@ -0,0 +1,305 @@
+"""
+Live comments over Server-Sent Events.
+
+New comments are encoded once, as an SSE frame whose id is the comment
+id, and handed to an in-process broker. The broker fans each frame out
+to the subscribers of its news. A subscriber is only a bounded
+asyncio.Queue read by its streaming response, so idle connections cost
+no thread. Frames are delivered with one call_soon_threadsafe per event
+loop, whichever thread saved the comment.
+
+Streams are served only with ENABLED set and only to ASGI requests:
+under WSGI, Django drains an async streaming body into memory before
+sending it, so an endless one would pin a thread and send nothing.
+
+With BRIDGE_DIR set, workers on one host also relay frames to each other
+over Unix datagram sockets in that directory, one per process. A client
+that reconnects sends the last id it saw (Last-Event-ID); the comments
+after it are replayed from the database. A subscriber whose queue
+overflows is disconnected and catches up the same way.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+
+from .models import Comment
+from .serializers import CommentListSerializer
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": False,
+    "MAX_SUBSCRIBERS": 10_000,
+    "QUEUE_SIZE": 100,
+    "HEARTBEAT": 15.0,
+    "REPLAY_LIMIT": 500,
+    "RETRY_MS": 3000,
+    "BRIDGE_DIR": None,
+}
+
+MAX_DATAGRAM = 200_000
+
+
+def live_setting(name: str):
+    return getattr(settings, "LIVE_COMMENTS", {}).get(name, DEFAULTS[name])
+
+
+def served_to(request) -> bool:
+    """
+    Whether ``request`` may get a stream: only when enabled and under ASGI,
+    where the response does not hold a thread for as long as it is open.
+    """
+    return live_setting("ENABLED") and isinstance(request, ASGIRequest)
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    frame: bytes
+
+
+class BrokerFull(Exception):
+    pass
+
+
+def encode(comment: Comment) -> Event:
+    data = json.dumps(
+        CommentListSerializer(comment).data, ensure_ascii=False, default=str
+    )
+    return Event(comment.id, f"id: {comment.id}\nevent: comment\ndata: {data}\n\n".encode())
+
+
+def backlog(news_id: int, after_id: int) -> list[Event]:
+    """Events for the live comments of ``news_id`` with ids above ``after_id``."""
+    comments = (
+        Comment.objects
+        .filter(news_id=news_id, id__gt=after_id, deleted_at__isnull=True)
+        .select_related("user__author_profile")
+        .order_by("id")[:live_setting("REPLAY_LIMIT")]
+    )
+    events = []
+    for comment in comments:
+        # Only their own replies could exist yet; the client learns of
+        # those from the stream too.
+        comment.has_replies = False
+        events.append(encode(comment))
+    return events
+
+
+class Subscription:
+    def __init__(self, news_id: int, loop: asyncio.AbstractEventLoop, size: int):
+        self.news_id = news_id
+        self.loop = loop
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(size)
+        self.overflowed = False
+
+    def put(self, event: Event) -> None:
+        # Runs on self.loop.
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Event | None:
+        """The next event; None once overflowed. Raises TimeoutError when idle."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class LocalBridge:
+    """
+    Relays events between the worker processes of one host: each binds a
+    Unix datagram socket in ``directory`` and sends to all the others.
+    """
+
+    def __init__(self, directory: Path, deliver, name: str | None = None):
+        self.directory = Path(directory)
+        self.deliver = deliver
+        self.path = self.directory / f"{name or os.getpid()}.sock"
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+        self._receiver = None
+
+    def start(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        self._receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._receiver.bind(str(self.path))
+        threading.Thread(target=self._receive, name="live-comments-bridge", daemon=True).start()
+
+    def _receive(self) -> None:
+        while True:
+            try:
+                message = json.loads(self._receiver.recv(MAX_DATAGRAM))
+                event = Event(message["id"], message["frame"].encode())
+                self.deliver(message["news_id"], event)
+            except OSError:
+                return
+            except (ValueError, KeyError):
+                logger.warning("Dropped a malformed live comments datagram")
+
+    def send(self, news_id: int, event: Event) -> None:
+        message = json.dumps(
+            {"news_id": news_id, "id": event.id, "frame": event.frame.decode()}
+        ).encode()
+        for path in self.directory.glob("*.sock"):
+            if path == self.path:
+                continue
+            try:
+                self._sender.sendto(message, str(path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker behind it is gone.
+                path.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.warning("Live comments bridge to %s failed: %s", path, exc)
+
+    def close(self) -> None:
+        if self._receiver is not None:
+            self._receiver.close()
+            self.path.unlink(missing_ok=True)
+        self._sender.close()
+
+
+class Broker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels: dict[int, set[Subscription]] = defaultdict(set)
+        self._count = 0
+        self._bridge: LocalBridge | None = None
+        self._bridge_started = False
+
+    @property
+    def subscribers(self) -> int:
+        return self._count
+
+    def wants(self, news_id: int) -> bool:
+        """Whether an event for ``news_id`` could reach anyone."""
+        return news_id in self._channels or bool(live_setting("BRIDGE_DIR"))
+
+    def _get_bridge(self) -> LocalBridge | None:
+        directory = live_setting("BRIDGE_DIR")
+        if not directory:
+            return None
+        with self._lock:
+            if self._bridge is None:
+                self._bridge = LocalBridge(directory, self.deliver)
+            return self._bridge
+
+    def subscribe(self, news_id: int) -> Subscription:
+        """Registers a subscriber on the running event loop."""
+        bridge = self._get_bridge()
+        subscription = Subscription(
+            news_id, asyncio.get_running_loop(), live_setting("QUEUE_SIZE")
+        )
+        with self._lock:
+            if self._count >= live_setting("MAX_SUBSCRIBERS"):
+                raise BrokerFull
+            self._channels[news_id].add(subscription)
+            self._count += 1
+            start_bridge = bridge is not None and not self._bridge_started
+            self._bridge_started = self._bridge_started or start_bridge
+        if start_bridge:
+            bridge.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            channel = self._channels.get(subscription.news_id)
+            if channel is None or subscription not in channel:
+                return
+            channel.discard(subscription)
+            if not channel:
+                del self._channels[subscription.news_id]
+            self._count -= 1
+
+    def deliver(self, news_id: int, event: Event) -> None:
+        """Hands ``event`` to this process' subscribers of ``news_id``."""
+        by_loop = defaultdict(list)
+        with self._lock:
+            for subscription in self._channels.get(news_id, ()):
+                by_loop[subscription.loop].append(subscription)
+        for loop, subscriptions in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_put_all, subscriptions, event)
+            except RuntimeError:
+                # The loop was closed under a subscriber that never left.
+                for subscription in subscriptions:
+                    self.unsubscribe(subscription)
+
+    def publish(self, news_id: int, event: Event) -> None:
+        self.deliver(news_id, event)
+        bridge = self._get_bridge()
+        if bridge is not None:
+            bridge.send(news_id, event)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._channels.clear()
+            self._count = 0
+            bridge, self._bridge = self._bridge, None
+            self._bridge_started = False
+        if bridge is not None:
+            bridge.close()
+
+
+def _put_all(subscriptions, event: Event) -> None:
+    for subscription in subscriptions:
+        subscription.put(event)
+
+
+broker = Broker()
+
+
+def publish_comment(comment: Comment) -> None:
+    if not broker.wants(comment.news_id):
+        return
+    comment.has_replies = False
+    broker.publish(comment.news_id, encode(comment))
+
+
+async def stream(news_id: int, last_event_id: int | None):
+    """
+    Body of an SSE response: replay after ``last_event_id``, then live
+    events and heartbeat comments until the client goes away.
+    """
+    try:
+        subscription = broker.subscribe(news_id)
+    except BrokerFull:
+        return
+    try:
+        yield f"retry: {live_setting('RETRY_MS')}\n\n".encode()
+        last = last_event_id or 0
+        if last_event_id is not None:
+            # Subscribed first, so nothing saved meanwhile is missed; the
+            # overlap is skipped by id below.
+            for event in await sync_to_async(backlog)(news_id, last_event_id):
+                last = event.id
+                yield event.frame
+        while True:
+            try:
+                event = await subscription.get(live_setting("HEARTBEAT"))
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            if event.id <= last:
+                continue
+            last = event.id
+            yield event.frame
+    finally:
+        broker.unsubscribe(subscription)
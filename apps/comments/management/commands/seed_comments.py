@@ -1,18 +1,19 @@
 from django.core.management.base import BaseCommand
-from faker import Faker
 import random
 
 from apps.comments.models import Comment
 from apps.accounts.models import User
 from apps.news.models import News
 
-fake = Faker()
-
 
 class Command(BaseCommand):
     help = "Seed comments"
 
     def handle(self, *args, **options):
+        from faker import Faker
+
+        fake = Faker()
+
         users = list(User.objects.all())
         news_list = list(News.objects.all())
 
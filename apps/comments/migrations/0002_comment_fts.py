@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:38
+
+from django.db import migrations
+
+from apps.abstracts.search import fts_migration_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+    ]
+
+    operations = fts_migration_operations(
+        'comments_comment_fts',
+        'comments_comment',
+        ('text',),
+    )
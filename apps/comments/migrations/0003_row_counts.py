@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:40
+
+from django.db import migrations
+
+from apps.abstracts.counting import counter_migration_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('abstracts', '0001_row_count'),
+        ('comments', '0002_comment_fts'),
+    ]
+
+    operations = counter_migration_operations(
+        'comments_comment',
+        [
+            (),
+            ("deleted_at__isnull",),
+        ],
+    )
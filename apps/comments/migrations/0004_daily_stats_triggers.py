@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:43
+
+from django.db import migrations
+
+from apps.news.stats import backfill, comment_trigger_sql, trigger_migration_operations
+
+
+def backfill_rollups(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        backfill()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_daily_stats'),
+        ('comments', '0003_row_counts'),
+    ]
+
+    operations = trigger_migration_operations('comments_comment', comment_trigger_sql) + [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
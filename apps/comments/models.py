@@ -9,5 +9,15 @@ class Comment(AbstractBaseModel):
     text = models.TextField()
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies')
 
+    ROW_COUNT_FILTERS = [
+        (),
+        ("deleted_at__isnull",),
+    ]
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='comment_updated_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} — {self.news.title[:30]}"
\ No newline at end of file
@@ -7,7 +7,7 @@ from rest_framework.serializers import (
 )
 
 from .models import Comment
-from apps.accounts.serializers import UserDetailSerializer
+from apps.accounts.serializers import PublicUserSerializer
 
 class CommentQueryParamsSerializer(Serializer):
     news_id = IntegerField(required=False)
@@ -21,7 +21,7 @@ class CommentBaseSerializer(ModelSerializer):
 
 
 class CommentListSerializer(CommentBaseSerializer):
-    user = UserDetailSerializer(read_only=True)
+    user = PublicUserSerializer(read_only=True)
     has_replies = SerializerMethodField()
 
     class Meta:
@@ -36,11 +36,15 @@ class CommentListSerializer(CommentBaseSerializer):
         )
 
     def get_has_replies(self, obj: Comment) -> bool:
-        return obj.replies.exists()
+        # Querysets built for lists annotate it (see comments.views.has_replies).
+        annotated = getattr(obj, "has_replies", None)
+        if annotated is not None:
+            return annotated
+        return obj.replies.filter(deleted_at__isnull=True).exists()
 
 
 class CommentDetailSerializer(CommentBaseSerializer):
-    user = UserDetailSerializer(read_only=True)
+    user = PublicUserSerializer(read_only=True)
 
     class Meta:
         model = Comment
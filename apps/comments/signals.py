@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import live
+from .models import Comment
+
+
+@receiver(post_save, sender=Comment)
+def publish_live_comment(sender, instance, raw=False, created=False, **kwargs):
+    if raw or not created:
+        return
+    transaction.on_commit(lambda: live.publish_comment(instance))
@@ -1,6 +1,7 @@
 from django.contrib.auth.decorators import login_required
+from django.db.models import Exists, OuterRef
 from django.shortcuts import get_object_or_404, render
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 
 from rest_framework.viewsets import ViewSet
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -8,6 +9,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 
+from . import live
 from .models import Comment
 from .permissions import IsCommentOwnerOrReadOnly
 from .serializers import (
@@ -17,9 +19,17 @@ from .serializers import (
     CommentQueryParamsSerializer,
 )
 
+from apps.abstracts.pagination import cursor_page
+from apps.abstracts.throttling import CommentWriteThrottle
 from apps.news.models import News
 
 
+def has_replies() -> Exists:
+    return Exists(
+        Comment.objects.filter(parent=OuterRef("pk"), deleted_at__isnull=True)
+    )
+
+
 class CommentViewSet(ViewSet):
     permission_classes = [IsCommentOwnerOrReadOnly]
 
@@ -28,6 +38,11 @@ class CommentViewSet(ViewSet):
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    def get_throttles(self):
+        if self.action in ["create", "reply"]:
+            return [CommentWriteThrottle()]
+        return []
+
     def get_serializer_class(self):
         if self.action == "list":
             return CommentListSerializer
@@ -41,8 +56,8 @@ class CommentViewSet(ViewSet):
         return (
             Comment.objects
             .filter(deleted_at__isnull=True)
-            .select_related("user", "news", "parent")
-            .prefetch_related("replies__user")
+            .select_related("user__author_profile")
+            .annotate(has_replies=has_replies())
         )
 
     def list(self, request):
@@ -100,7 +115,10 @@ class CommentViewSet(ViewSet):
             )
 
         comment.delete()
-        comment.replies.update(deleted_at=comment.deleted_at)
+        comment.replies.update(
+            deleted_at=comment.deleted_at,
+            updated_at=comment.deleted_at,
+        )
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -172,14 +190,14 @@ def my_comments_list(request):
         Comment.objects
         .filter(user=request.user, deleted_at__isnull=True)
         .select_related("news", "user")
-        .order_by("-created_at")
+        .defer("news__content")
     )
 
     return render(
         request,
         "my_comments_list.html",
         {
-            "comments": comments,
+            "comments": cursor_page(request, comments, ("-created_at", "-pk")),
             "title": "Мои комментарии",
         },
     )
@@ -199,17 +217,21 @@ def comment_list(request, news_id):
             parent__isnull=True,
             deleted_at__isnull=True,
         )
-        .select_related("user", "news")
-        .prefetch_related("replies__user")
+        .select_related("user__author_profile", "news")
         .order_by("created_at")
     )
 
     if request.headers.get("Accept") == "application/json":
         return JsonResponse(
-            CommentListSerializer(comments, many=True).data,
+            CommentListSerializer(
+                comments.annotate(has_replies=has_replies()),
+                many=True,
+            ).data,
             safe=False,
         )
 
+    comments = comments.prefetch_related("replies__user")
+
     return render(
         request,
         "comment_list.html",
@@ -248,4 +270,40 @@ def comment_detail(request, comment_id):
             "replies": replies,
             "title": f"Комментарий пользователя: {comment.user.username}",
         },
-    )
\ No newline at end of file
+    )
+
+
+async def comment_stream(request, news_id):
+    """
+    Server-Sent Events stream of new comments and replies of a news.
+    Needs an ASGI server and LIVE_COMMENTS["ENABLED"], otherwise answers
+    204, which also stops EventSource from reconnecting. Resumes after the
+    Last-Event-ID header (or the ``last_event_id`` query parameter).
+    Drafts and deleted news answer 404.
+    """
+    live_news = News.objects.filter(pk=news_id, is_published=True, deleted_at__isnull=True)
+    if not await live_news.aexists():
+        raise Http404
+
+    if not live.served_to(request):
+        return HttpResponse(status=204)
+
+    if live.broker.subscribers >= live.live_setting("MAX_SUBSCRIBERS"):
+        response = JsonResponse(
+            {"detail": "Too many live subscribers, try again later."},
+            status=503,
+        )
+        response["Retry-After"] = str(live.live_setting("RETRY_MS") // 1000)
+        return response
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    response = StreamingHttpResponse(
+        live.stream(
+            news_id,
+            int(last_event_id) if last_event_id and last_event_id.isdigit() else None,
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -1,5 +1,9 @@
 from django.contrib import admin
+from django.utils import timezone
+
+from apps.abstracts.admin import ScalableModelAdmin
 from .models import News, Category
+from .signals import news_updated
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -8,8 +12,29 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(News)
-class NewsAdmin(admin.ModelAdmin):
+class NewsAdmin(ScalableModelAdmin):
     list_display = ('id', 'title', 'category', 'author', 'is_published', 'deleted_at', 'published_at')
-    list_filter = ('is_published', 'category', 'author')
+    list_select_related = ('category', 'author__user')
+    list_filter = ('is_published', 'category')
+    autocomplete_fields = ('category', 'author')
     search_fields = ('title', 'content')
-    readonly_fields = ('created_at', 'updated_at', 'published_at')
\ No newline at end of file
+    fts_table = 'news_news_fts'
+    readonly_fields = ('created_at', 'updated_at', 'published_at')
+    actions = ('publish_selected', 'unpublish_selected', 'soft_delete_selected')
+
+    def batch_updated(self, pks, values):
+        news_updated.send(sender=News, news_ids=pks, fields=set(values), instances=None)
+
+    @admin.action(description="Publish selected news", permissions=["change"])
+    def publish_selected(self, request, queryset):
+        count = self.bulk_update(
+            queryset.filter(is_published=False),
+            is_published=True,
+            published_at=timezone.now(),
+        )
+        self.message_user(request, f"Published {count} news.")
+
+    @admin.action(description="Unpublish selected news", permissions=["change"])
+    def unpublish_selected(self, request, queryset):
+        count = self.bulk_update(queryset.filter(is_published=True), is_published=False)
+        self.message_user(request, f"Unpublished {count} news.")
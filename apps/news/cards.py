@@ -0,0 +1,108 @@
+from typing import Iterable
+
+from django.utils import timezone
+
+from .models import News, NewsCard
+from .serializers import NewsCardSerializer
+
+CHUNK_SIZE = 500
+
+CARD_FIELDS = (
+    "category_id",
+    "author_id",
+    "is_published",
+    "created_at",
+    "published_at",
+    "deleted_at",
+    "payload",
+)
+
+
+def write_cards(news: Iterable[News]) -> int:
+    """
+    Upserts cards for already loaded news; they must come with author,
+    author__user and category selected.
+    """
+    cards = [
+        NewsCard(
+            news_id=item.id,
+            category_id=item.category_id,
+            author_id=item.author_id,
+            is_published=item.is_published,
+            created_at=item.created_at,
+            published_at=item.published_at,
+            deleted_at=item.deleted_at,
+            payload=NewsCardSerializer(item).data,
+        )
+        for item in news
+    ]
+    NewsCard.objects.bulk_create(
+        cards,
+        update_conflicts=True,
+        unique_fields=["news"],
+        update_fields=CARD_FIELDS,
+    )
+    return len(cards)
+
+
+def build_cards(news_ids: Iterable[int]) -> int:
+    """(Re)generates the cards of the given news; returns how many were written."""
+    news_ids = list(news_ids)
+    written = 0
+    for start in range(0, len(news_ids), CHUNK_SIZE):
+        chunk = news_ids[start:start + CHUNK_SIZE]
+        written += write_cards(
+            News.objects.filter(id__in=chunk).select_related(
+                "author", "author__user", "category"
+            )
+        )
+    return written
+
+
+def build_cards_in_range(first_id: int, last_id: int) -> int:
+    written = 0
+    cursor = first_id - 1
+    while True:
+        ids = list(
+            News.objects
+            .filter(id__gt=cursor, id__lte=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:CHUNK_SIZE]
+        )
+        if not ids:
+            return written
+        written += build_cards(ids)
+        cursor = ids[-1]
+
+
+def _refresh_stale(news_ids: list[int]) -> int:
+    # A new updated_at first: the changes feed (apps.news.changes) resends
+    # the news, and the rebuilt payloads carry it.
+    for start in range(0, len(news_ids), CHUNK_SIZE):
+        News.objects.filter(id__in=news_ids[start:start + CHUNK_SIZE]).update(updated_at=timezone.now())
+    return build_cards(news_ids)
+
+
+def refresh_stale_category(category_id: int, name: str) -> int:
+    stale = (
+        NewsCard.objects
+        .filter(category_id=category_id)
+        .exclude(payload__category_name=name)
+        .values_list("news_id", flat=True)
+    )
+    return _refresh_stale(list(stale))
+
+
+def refresh_stale_author(author_id: int, email: str) -> int:
+    stale = (
+        NewsCard.objects
+        .filter(author_id=author_id)
+        .exclude(payload__author__email=email)
+        .values_list("news_id", flat=True)
+    )
+    return _refresh_stale(list(stale))
+
+
+def card_payloads(qs) -> list[dict]:
+    """Assembles a list response from a NewsCard queryset in one read."""
+    return list(qs.values_list("payload", flat=True))
@@ -0,0 +1,182 @@
+"""
+Delta feed of Category, Author, News and Comment changes.
+
+Every row carries updated_at, which saves, soft deletes and the bulk
+updates of visible fields all bump. The feed orders the four tables by
+(updated_at, type, id) and pages through them with a keyset cursor.
+The opaque token encodes the last position served. Each page is one
+(updated_at, id) index range scan per table, merged. Rows the public
+cannot see, because they are soft-deleted, unpublished or comments of
+such news, come back as deletions. A client applies a page as upserts
+and removals.
+
+Rows younger than SETTLE_SECONDS are held back: a transaction that
+commits late may carry an updated_at older than rows already served.
+"""
+import base64
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.accounts.models import Author
+from apps.accounts.serializers import PublicUserSerializer
+from apps.comments.models import Comment
+from apps.comments.serializers import CommentListSerializer
+from .models import Category, News
+
+DEFAULTS = {
+    "PAGE_SIZE": 500,
+    "MAX_PAGE_SIZE": 1000,
+    "SETTLE_SECONDS": 1.0,
+}
+
+
+def changes_setting(name: str):
+    return getattr(settings, "CHANGES", {}).get(name, DEFAULTS[name])
+
+
+@dataclass(frozen=True)
+class Source:
+    queryset: Callable[[], Any]
+    visible: Callable[[Any], bool]
+    serialize: Callable[[Any], dict]
+
+
+def _comments():
+    return (
+        Comment.objects
+        .select_related("user__author_profile", "news")
+        .annotate(has_replies=Exists(
+            Comment.objects.filter(parent=OuterRef("pk"), deleted_at__isnull=True)
+        ))
+    )
+
+
+def _news_visible(news: News) -> bool:
+    return news.is_published and news.deleted_at is None
+
+
+def _news_payload(news: News) -> dict:
+    # The card is a denormalized copy that may not have been built yet.
+    try:
+        return news.card.payload
+    except News.card.RelatedObjectDoesNotExist:
+        # .serializers imports the token helpers from here.
+        from .serializers import NewsCardSerializer
+
+        return NewsCardSerializer(news).data
+
+
+# In this order types break updated_at ties, so parents come first.
+SOURCES: dict[str, Source] = {
+    "category": Source(
+        queryset=lambda: Category.objects.all(),
+        visible=lambda obj: obj.deleted_at is None,
+        serialize=lambda obj: {"id": obj.id, "name": obj.name},
+    ),
+    "author": Source(
+        queryset=lambda: Author.objects.select_related("user"),
+        visible=lambda obj: obj.deleted_at is None,
+        serialize=lambda obj: {
+            "id": obj.id,
+            "user": PublicUserSerializer(obj.user).data,
+            "description": obj.description,
+        },
+    ),
+    "news": Source(
+        queryset=lambda: News.objects.select_related(
+            "card", "author__user", "category"
+        ),
+        visible=_news_visible,
+        serialize=_news_payload,
+    ),
+    "comment": Source(
+        queryset=_comments,
+        visible=lambda obj: obj.deleted_at is None and _news_visible(obj.news),
+        serialize=lambda obj: {**CommentListSerializer(obj).data, "news_id": obj.news_id},
+    ),
+}
+
+TYPES = tuple(SOURCES)
+
+Position = tuple[datetime, int, int]
+
+
+def encode_token(position: Position) -> str:
+    updated_at, rank, pk = position
+    raw = f"{updated_at.isoformat()}|{rank}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token: str) -> Position:
+    """Raises ValueError for anything encode_token() did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        updated_at, rank, pk = raw.split("|")
+        position = (parse_datetime(updated_at), int(rank), int(pk))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid token")
+    if position[0] is None or not 0 <= position[1] < len(TYPES):
+        raise ValueError("Invalid token")
+    return position
+
+
+def _after(qs, position: Position | None, rank: int):
+    if position is None:
+        return qs
+    updated_at, last_rank, pk = position
+    if rank < last_rank:
+        return qs.filter(updated_at__gt=updated_at)
+    qs = qs.filter(updated_at__gte=updated_at)
+    if rank == last_rank:
+        qs = qs.exclude(updated_at=updated_at, id__lte=pk)
+    return qs
+
+
+def _entry(kind: str, obj) -> dict:
+    source = SOURCES[kind]
+    visible = source.visible(obj)
+    return {
+        "type": kind,
+        "op": "upsert" if visible else "delete",
+        "id": obj.id,
+        "updated_at": obj.updated_at,
+        "data": source.serialize(obj) if visible else None,
+    }
+
+
+def page(position: Position | None = None, limit: int | None = None) -> dict:
+    """
+    Up to ``limit`` changes after ``position``: ``{changes, next,
+    has_more}``. ``next`` is the token to pass back, also when the page
+    came out empty.
+    """
+    limit = limit or changes_setting("PAGE_SIZE")
+    until = timezone.now() - timedelta(seconds=changes_setting("SETTLE_SECONDS"))
+
+    streams = []
+    for rank, (kind, source) in enumerate(SOURCES.items()):
+        rows = (
+            _after(source.queryset(), position, rank)
+            .filter(updated_at__lte=until)
+            .order_by("updated_at", "id")[:limit + 1]
+        )
+        streams.append([((obj.updated_at, rank, obj.id), kind, obj) for obj in rows])
+
+    merged = list(islice(heapq.merge(*streams, key=itemgetter(0)), limit + 1))
+    served = merged[:limit]
+    if served:
+        position = served[-1][0]
+    return {
+        "changes": [_entry(kind, obj) for _, kind, obj in served],
+        "next": encode_token(position) if position else None,
+        "has_more": len(merged) > limit,
+    }
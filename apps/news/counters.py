@@ -0,0 +1,169 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import News, NewsViewBucket
+from .signals import views_flushed
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "FLUSH_INTERVAL": 5.0,
+    "MAX_PENDING": 1000,
+    "RECENT_WINDOW_HOURS": 24,
+    "LOCK_RETRIES": 3,
+}
+
+# Seconds to wait before the n-th retry of a flush that hit a locked table.
+LOCK_BACKOFF = 0.05
+
+
+def counter_setting(name: str):
+    return getattr(settings, "VIEW_COUNTER", {}).get(name, DEFAULTS[name])
+
+
+def _bucket(now: datetime) -> datetime:
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+class ViewCounter:
+    """
+    Per-process buffer of news views.
+
+    ``record()`` only touches a dict under a lock. Buffered views are written
+    in one transaction at most every FLUSH_INTERVAL seconds (or when
+    MAX_PENDING distinct keys pile up) as a handful of grouped
+    ``UPDATE ... SET views_count = views_count + n WHERE id IN (...)``
+    statements, and once more at interpreter exit. A flush that finds the
+    tables locked is retried up to LOCK_RETRIES times before the views go
+    back into the buffer. A timer flushes views
+    that no later request would, so a crashed worker loses at most one
+    interval of views also when it went quiet.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[int, datetime], int] = defaultdict(int)
+        self._last_flush = time.monotonic()
+        self._timer: threading.Timer | None = None
+
+    def record(self, news_id: int) -> None:
+        key = (news_id, _bucket(timezone.now()))
+        interval = counter_setting("FLUSH_INTERVAL")
+        with self._lock:
+            self._pending[key] += 1
+            due = (
+                len(self._pending) >= counter_setting("MAX_PENDING")
+                or time.monotonic() - self._last_flush >= interval
+            )
+            if not due and self._timer is None:
+                self._timer = threading.Timer(interval, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def _flush_on_timer(self) -> None:
+        try:
+            self.flush()
+        finally:
+            # The timer thread's own connection.
+            connection.close()
+
+    def pending_for(self, news_id: int) -> int:
+        with self._lock:
+            return sum(n for (pk, _), n in self._pending.items() if pk == news_id)
+
+    def _restore(self, pending: dict[tuple[int, datetime], int]) -> None:
+        with self._lock:
+            for key, n in pending.items():
+                self._pending[key] += n
+
+    @staticmethod
+    def _write(pending: dict[tuple[int, datetime], int], totals: dict[int, int]) -> None:
+        with transaction.atomic():
+            by_increment: dict[int, list[int]] = defaultdict(list)
+            for news_id, n in totals.items():
+                by_increment[n].append(news_id)
+            for n, ids in by_increment.items():
+                News.objects.filter(id__in=ids).update(views_count=F("views_count") + n)
+
+            existing = set(News.objects.filter(id__in=totals).values_list("id", flat=True))
+            NewsViewBucket.objects.bulk_create(
+                [
+                    NewsViewBucket(news_id=news_id, bucket_start=bucket)
+                    for news_id, bucket in pending
+                    if news_id in existing
+                ],
+                ignore_conflicts=True,
+            )
+            by_bucket: dict[tuple[datetime, int], list[int]] = defaultdict(list)
+            for (news_id, bucket), n in pending.items():
+                by_bucket[(bucket, n)].append(news_id)
+            for (bucket, n), ids in by_bucket.items():
+                NewsViewBucket.objects.filter(
+                    bucket_start=bucket,
+                    news_id__in=ids,
+                ).update(views=F("views") + n)
+
+    def flush(self) -> dict[int, int]:
+        with self._lock:
+            pending = self._pending
+            self._pending = defaultdict(int)
+            self._last_flush = time.monotonic()
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        if not pending:
+            return {}
+
+        totals: dict[int, int] = defaultdict(int)
+        for (news_id, _), n in pending.items():
+            totals[news_id] += n
+
+        retries = counter_setting("LOCK_RETRIES")
+        for attempt in range(retries + 1):
+            try:
+                self._write(pending, totals)
+                break
+            except Exception as exc:
+                # SQLite reports a concurrent writer as a locked database or table.
+                locked = isinstance(exc, OperationalError) and "locked" in str(exc)
+                if locked and attempt < retries:
+                    time.sleep(LOCK_BACKOFF * (attempt + 1))
+                    continue
+                logger.exception("Failed to flush %d buffered news views", len(pending))
+                self._restore(pending)
+                return {}
+
+        views_flushed.send(sender=self.__class__, counts=dict(totals))
+        return dict(totals)
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush)
+
+
+def view_stats(news: News) -> dict:
+    hours = counter_setting("RECENT_WINDOW_HOURS")
+    since = _bucket(timezone.now()) - timedelta(hours=hours - 1)
+    pending = view_counter.pending_for(news.id)
+    recent = (
+        NewsViewBucket.objects
+        .filter(news_id=news.id, bucket_start__gte=since)
+        .aggregate(total=Sum("views"))["total"]
+    ) or 0
+    return {
+        "id": news.id,
+        "views_count": news.views_count + pending,
+        "recent_views": recent + pending,
+        "window_hours": hours,
+    }
@@ -0,0 +1,155 @@
+"""
+Near-duplicate detection with SimHash.
+
+The content of a news is reduced to a 64-bit SimHash over word
+shingles: texts that differ in a few words get fingerprints that differ
+in a few bits. The fingerprint is split into BANDS bands of 16 bits,
+each an indexed column of NewsFingerprint. Two fingerprints within
+MAX_DISTANCE < BANDS bits of each other agree on at least one whole
+band, so the candidates of a news are the rows matching one of its four
+band values (a few index probes, whatever the archive size). Candidates
+are then checked on the full Hamming distance.
+"""
+import re
+from hashlib import blake2b
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import News, NewsCard, NewsFingerprint
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+DEFAULTS = {
+    # Must stay below BANDS for every match to share a band.
+    "MAX_DISTANCE": 3,
+    "SHINGLE_SIZE": 3,
+    "LIMIT": 5,
+}
+
+CHUNK_SIZE = 1000
+
+WORD_RE = re.compile(r"\w+")
+
+
+def duplicates_setting(name: str):
+    return getattr(settings, "DUPLICATES", {}).get(name, DEFAULTS[name])
+
+
+def shingles(text: str) -> set[str]:
+    words = WORD_RE.findall(text.lower())
+    size = duplicates_setting("SHINGLE_SIZE")
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def simhash(text: str) -> int | None:
+    """Unsigned 64-bit SimHash of ``text``; None when it has no words."""
+    features = shingles(text or "")
+    if not features:
+        return None
+    votes = [0] * BITS
+    for feature in features:
+        digest = int.from_bytes(blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(BITS):
+            votes[bit] += 1 if digest >> bit & 1 else -1
+    return sum(1 << bit for bit, vote in enumerate(votes) if vote > 0)
+
+
+def bands(value: int) -> list[int]:
+    return [(value >> (i * BAND_BITS)) & BAND_MASK for i in range(BANDS)]
+
+
+def distance(a: int, b: int) -> int:
+    return ((a ^ b) & ((1 << BITS) - 1)).bit_count()
+
+
+def _signed(value: int) -> int:
+    return value - (1 << BITS) if value >= 1 << (BITS - 1) else value
+
+
+def _fingerprint(news_id: int, value: int) -> NewsFingerprint:
+    return NewsFingerprint(
+        news_id=news_id,
+        simhash=_signed(value),
+        **{f"band_{i}": band for i, band in enumerate(bands(value))},
+    )
+
+
+def fingerprint_news(news: Iterable[News]) -> int:
+    """Stores the fingerprints of already loaded news; returns how many were written."""
+    rows, empty = [], []
+    for item in news:
+        value = simhash(item.content)
+        if value is None:
+            empty.append(item.pk)
+        else:
+            rows.append(_fingerprint(item.pk, value))
+    NewsFingerprint.objects.filter(news_id__in=empty).delete()
+    NewsFingerprint.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["news"],
+        update_fields=["simhash"] + [f"band_{i}" for i in range(BANDS)],
+    )
+    return len(rows)
+
+
+def fingerprint_range(first_id: int, last_id: int, progress=None) -> int:
+    written = 0
+    cursor = first_id - 1
+    while True:
+        chunk = list(
+            News.objects
+            .filter(id__gt=cursor, id__lte=last_id)
+            .order_by("id")
+            .only("id", "content")[:CHUNK_SIZE]
+        )
+        if not chunk:
+            return written
+        written += fingerprint_news(chunk)
+        cursor = chunk[-1].id
+        if progress:
+            progress(cursor, last_id)
+
+
+def near_duplicates(news_id: int, value: int | None = None) -> list[dict]:
+    """
+    Published news whose content is within MAX_DISTANCE bits of
+    ``news_id``'s (or of fingerprint ``value``), closest first.
+    """
+    if value is None:
+        stored = NewsFingerprint.objects.filter(news_id=news_id).values_list("simhash", flat=True).first()
+        if stored is None:
+            return []
+        value = stored
+    lookup = Q()
+    for i, band in enumerate(bands(value)):
+        lookup |= Q(**{f"band_{i}": band})
+
+    max_distance = duplicates_setting("MAX_DISTANCE")
+    matches = {}
+    for other, other_value in (
+        NewsFingerprint.objects.filter(lookup).exclude(news_id=news_id).values_list("news_id", "simhash")
+    ):
+        d = distance(value, other_value)
+        if d <= max_distance:
+            matches[other] = d
+    if not matches:
+        return []
+
+    cards = (
+        NewsCard.objects
+        .filter(news_id__in=matches, is_published=True, deleted_at__isnull=True)
+        .values_list("news_id", "payload__title")
+    )
+    found = sorted(cards, key=lambda card: (matches[card[0]], card[0]))
+    return [
+        {"id": pk, "title": title, "distance": matches[pk]}
+        for pk, title in found[:duplicates_setting("LIMIT")]
+    ]
@@ -0,0 +1,340 @@
+import csv
+import io
+import json
+import shutil
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.accounts.models import Author
+from apps.comments.models import Comment
+from .models import News
+
+FORMATS = ("ndjson", "csv")
+
+DEFAULT_BATCH_SIZE = 2000
+
+# Column name -> ORM lookup passed to values_list(). Joined columns are
+# resolved by the same query that reads the batch, so an export costs one
+# query per batch regardless of how many relations a row touches.
+DATASETS: dict[str, dict[str, Any]] = {
+    "news": {
+        "model": News,
+        "columns": OrderedDict((
+            ("id", "id"),
+            ("title", "title"),
+            ("content", "content"),
+            ("image", "image"),
+            ("category_id", "category_id"),
+            ("category_name", "category__name"),
+            ("author_id", "author_id"),
+            ("author_email", "author__user__email"),
+            ("is_published", "is_published"),
+            ("published_at", "published_at"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+            ("deleted_at", "deleted_at"),
+        )),
+    },
+    "comments": {
+        "model": Comment,
+        "columns": OrderedDict((
+            ("id", "id"),
+            ("news_id", "news_id"),
+            ("user_id", "user_id"),
+            ("parent_id", "parent_id"),
+            ("text", "text"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+            ("deleted_at", "deleted_at"),
+        )),
+    },
+    "authors": {
+        "model": Author,
+        "columns": OrderedDict((
+            ("id", "id"),
+            ("user_id", "user_id"),
+            ("email", "user__email"),
+            ("username", "user__username"),
+            ("description", "description"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+            ("deleted_at", "deleted_at"),
+        )),
+    },
+}
+
+
+def dataset_columns(dataset: str) -> list[str]:
+    columns = list(DATASETS[dataset]["columns"])
+    if dataset == "comments":
+        columns.insert(columns.index("parent_id") + 1, "thread_path")
+    return columns
+
+
+class ThreadPathResolver:
+    """
+    Resolves "root/.../parent/id" paths for comments.
+
+    Rows are exported in id order and replies are always newer than their
+    parent, so recently seen paths are the ones that get asked for again.
+    Only a bounded LRU of paths is kept; misses walk up the parent chain
+    with one query per tree level for the whole batch.
+    """
+
+    def __init__(self, max_size: int = 100_000) -> None:
+        self.max_size = max_size
+        self._paths: OrderedDict[int, str] = OrderedDict()
+
+    def _remember(self, comment_id: int, path: str) -> None:
+        self._paths[comment_id] = path
+        self._paths.move_to_end(comment_id)
+        if len(self._paths) > self.max_size:
+            self._paths.popitem(last=False)
+
+    def _load(self, ids: set[int]) -> None:
+        parents: dict[int, int | None] = {}
+        pending = set(ids)
+        while pending:
+            rows = Comment.objects.filter(id__in=pending).values_list("id", "parent_id")
+            pending = set()
+            for comment_id, parent_id in rows:
+                parents[comment_id] = parent_id
+                if parent_id and parent_id not in parents and parent_id not in self._paths:
+                    pending.add(parent_id)
+
+        def resolve(comment_id: int) -> str:
+            chain = []
+            current = comment_id
+            while current not in self._paths and current in parents:
+                chain.append(current)
+                current = parents[current]
+                if current is None:
+                    break
+            prefix = self._paths.get(current, "") if current is not None else ""
+            for node in reversed(chain):
+                prefix = f"{prefix}/{node}" if prefix else str(node)
+                self._remember(node, prefix)
+            return prefix
+
+        for comment_id in ids:
+            resolve(comment_id)
+
+    def paths_for(self, rows: list[tuple[int, int | None]]) -> list[str]:
+        missing = {
+            parent_id for _, parent_id in rows
+            if parent_id and parent_id not in self._paths
+        }
+        if missing:
+            self._load(missing)
+
+        paths = []
+        for comment_id, parent_id in rows:
+            if parent_id:
+                parent_path = self._paths.get(parent_id, str(parent_id))
+                path = f"{parent_path}/{comment_id}"
+            else:
+                path = str(comment_id)
+            self._remember(comment_id, path)
+            paths.append(path)
+        return paths
+
+
+def _base_queryset(
+    dataset: str,
+    since: datetime | None,
+    until: datetime | None,
+):
+    qs = DATASETS[dataset]["model"].objects.all()
+    if since is not None:
+        qs = qs.filter(updated_at__gt=since)
+    if until is not None:
+        qs = qs.filter(updated_at__lte=until)
+    return qs
+
+
+def iter_rows(
+    dataset: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    id_range: tuple[int, int] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yields batches of export rows in id order.
+
+    Uses keyset pagination (``id > last_id ORDER BY id LIMIT n``) instead of
+    OFFSET, so every batch is an index range scan on the primary key and
+    memory stays bounded by ``batch_size`` however large the table is.
+    """
+    columns = DATASETS[dataset]["columns"]
+    lookups = list(columns.values())
+    names = list(columns.keys())
+    resolver = ThreadPathResolver() if dataset == "comments" else None
+
+    qs = _base_queryset(dataset, since, until)
+    last_id = 0
+    if id_range is not None:
+        last_id = id_range[0] - 1
+        qs = qs.filter(id__lte=id_range[1])
+
+    while True:
+        batch = list(
+            qs.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list(*lookups)[:batch_size]
+        )
+        if not batch:
+            return
+
+        rows = [dict(zip(names, values)) for values in batch]
+        if resolver is not None:
+            paths = resolver.paths_for([(row["id"], row["parent_id"]) for row in rows])
+            for row, path in zip(rows, paths):
+                row["thread_path"] = path
+
+        yield rows
+        last_id = batch[-1][0]
+        if len(batch) < batch_size:
+            return
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None:
+        return ""
+    return value
+
+
+def iter_export(
+    dataset: str,
+    fmt: str = "ndjson",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    id_range: tuple[int, int] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    header: bool = True,
+) -> Iterator[str]:
+    """Yields the serialized export, one chunk per batch."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    columns = dataset_columns(dataset)
+
+    if fmt == "csv" and header:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(columns)
+        yield buffer.getvalue()
+
+    for rows in iter_rows(dataset, since, until, id_range, batch_size):
+        if fmt == "ndjson":
+            yield "".join(
+                json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+                for row in rows
+            )
+        else:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(
+                [_csv_value(row[column]) for column in columns]
+                for row in rows
+            )
+            yield buffer.getvalue()
+
+
+def id_ranges(
+    dataset: str,
+    parts: int,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[tuple[int, int]]:
+    bounds = _base_queryset(dataset, since, until).aggregate(
+        low=Min("id"),
+        high=Max("id"),
+    )
+    low, high = bounds["low"], bounds["high"]
+    if low is None:
+        return []
+
+    step = max(1, (high - low + parts) // parts)
+    return [
+        (start, min(start + step - 1, high))
+        for start in range(low, high + 1, step)
+    ]
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def _export_range(args: tuple) -> str:
+    dataset, fmt, since, until, id_range, batch_size, path = args
+    try:
+        with open(path, "w", encoding="utf-8", newline="") as fh:
+            for chunk in iter_export(
+                dataset, fmt, since, until, id_range, batch_size, header=False,
+            ):
+                fh.write(chunk)
+    finally:
+        connections.close_all()
+    return path
+
+
+def export_to_file(
+    dataset: str,
+    fmt: str,
+    output: str | Path,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 1,
+) -> int:
+    """
+    Writes an export to ``output`` and returns the number of part files used.
+
+    With ``workers > 1`` the id space is split into ranges exported by a
+    process pool into ``<output>.partNNNN`` files, which are concatenated in
+    id order afterwards.
+    """
+    output = Path(output)
+
+    if workers <= 1:
+        with open(output, "w", encoding="utf-8", newline="") as fh:
+            for chunk in iter_export(dataset, fmt, since, until, batch_size=batch_size):
+                fh.write(chunk)
+        return 1
+
+    ranges = id_ranges(dataset, workers * 4, since, until)
+    jobs = [
+        (dataset, fmt, since, until, id_range, batch_size, f"{output}.part{index:04d}")
+        for index, id_range in enumerate(ranges)
+    ]
+
+    # Connections must not be shared with forked children.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        parts = list(pool.map(_export_range, jobs))
+
+    with open(output, "w", encoding="utf-8", newline="") as fh:
+        if fmt == "csv":
+            csv.writer(fh).writerow(dataset_columns(dataset))
+        for part in parts:
+            with open(part, encoding="utf-8", newline="") as src:
+                shutil.copyfileobj(src, fh)
+            Path(part).unlink()
+    return len(parts)
+
+
+def watermark() -> datetime:
+    """Upper bound for an export; pass it back as ``since`` next time."""
+    return timezone.now()
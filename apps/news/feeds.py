@@ -0,0 +1,350 @@
+"""
+Sitemaps and RSS/Atom feeds, kept as files under ARTIFACTS_ROOT.
+
+Artifacts are keyed by what they cover:
+
+* ``sitemap``: the sitemap index;
+* ``sitemap-YYYY-MM``: the published news of one month (by published_at);
+* ``news``, ``category-<id>`` and ``author-<id>``: the latest ITEMS
+  published news overall, of a category or of an author, each as
+  ``.rss`` and ``.atom``.
+
+An artifact is built on the first request that needs it and then served
+from disk. When published news change, only the keys they appeared or
+now appear under are invalidated, after commit, by touching a
+``<key>.stale`` marker. An artifact is current while it is newer than its
+marker. It carries the time its build started as mtime, so a build that
+raced with an invalidation is redone. Markers work across processes;
+``manage.py build_feeds`` rebuilds everything.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import TruncMonth
+from django.urls import reverse
+from django.utils import feedgenerator, timezone
+from django.utils.text import Truncator
+
+from apps.accounts.models import Author
+from .models import Category, News, NewsCard
+
+DEFAULTS = {
+    "SITE_URL": "http://localhost:8000",
+    "TITLE": "Новости",
+    "ITEMS": 50,
+    "DESCRIPTION_WORDS": 60,
+    "MAX_AGE": 300,
+}
+
+FORMATS = {
+    "rss": (feedgenerator.Rss201rev2Feed, "application/rss+xml; charset=utf-8"),
+    "atom": (feedgenerator.Atom1Feed, "application/atom+xml; charset=utf-8"),
+}
+SITEMAP_CONTENT_TYPE = "application/xml; charset=utf-8"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+FEED_KEY = re.compile(r"^(news|category-\d+|author-\d+)$")
+MONTH = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+# News fields shown in or selecting for sitemaps and feeds.
+FEED_FIELDS = {
+    "title", "content", "category", "category_id", "author", "author_id",
+    "is_published", "deleted_at",
+}
+
+_lock = threading.Lock()
+
+
+def feeds_setting(name: str):
+    return getattr(settings, "FEEDS", {}).get(name, DEFAULTS[name])
+
+
+@dataclass(frozen=True)
+class Artifact:
+    body: bytes
+    etag: str
+    last_modified: float
+
+
+def artifact_dir() -> Path:
+    return Path(settings.ARTIFACTS_ROOT) / "feeds"
+
+
+def _absolute(path: str) -> str:
+    return feeds_setting("SITE_URL").rstrip("/") + path
+
+
+def month_of(published_at: datetime) -> str:
+    return timezone.localtime(published_at).strftime("%Y-%m")
+
+
+def _month_range(month: str) -> tuple[datetime, datetime]:
+    year, number = map(int, month.split("-"))
+    start = timezone.make_aware(datetime(year, number, 1))
+    end = timezone.make_aware((start.replace(tzinfo=None) + timedelta(days=32)).replace(day=1))
+    return start, end
+
+
+def _live_news():
+    return News.objects.filter(is_published=True, deleted_at__isnull=True)
+
+
+def keys_of(category_id, author_id, published_at) -> set[str]:
+    """Keys whose artifacts list a published news with these values."""
+    keys = {"sitemap", f"sitemap-{month_of(published_at)}", "news"}
+    if category_id is not None:
+        keys.add(f"category-{category_id}")
+    if author_id is not None:
+        keys.add(f"author-{author_id}")
+    return keys
+
+
+def listed_keys(news_ids: Iterable[int]) -> set[str]:
+    """
+    Keys the news are listed under according to their cards, i.e. as of
+    the last card build. Read before the cards are rebuilt.
+    """
+    keys = set()
+    cards = (
+        NewsCard.objects
+        .filter(news_id__in=list(news_ids), is_published=True, deleted_at__isnull=True)
+        .values_list("category_id", "author_id", "published_at")
+    )
+    for values in cards:
+        keys |= keys_of(*values)
+    return keys
+
+
+def current_keys(news: Iterable[News]) -> set[str]:
+    keys = set()
+    for item in news:
+        if item.is_published and item.deleted_at is None:
+            keys |= keys_of(item.category_id, item.author_id, item.published_at)
+    return keys
+
+
+def range_keys(first_id: int, last_id: int) -> set[str]:
+    keys = set()
+    rows = (
+        _live_news()
+        .filter(id__gte=first_id, id__lte=last_id)
+        .values_list("category_id", "author_id", "published_at")
+        .distinct()
+    )
+    for values in rows.iterator():
+        keys |= keys_of(*values)
+    return keys
+
+
+def _marker(key: str) -> Path:
+    return artifact_dir() / f"{key}.stale"
+
+
+def _paths(key: str) -> list[Path]:
+    if key.startswith("sitemap"):
+        return [artifact_dir() / f"{key}.xml"]
+    return [artifact_dir() / f"{key}.{fmt}" for fmt in FORMATS]
+
+
+def invalidate(keys: Iterable[str]) -> None:
+    """Marks the artifacts of ``keys`` stale, in every process."""
+    directory = artifact_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    for key in keys:
+        _marker(key).touch()
+
+
+def invalidate_on_commit(keys: set[str]) -> None:
+    if keys:
+        transaction.on_commit(lambda: invalidate(keys))
+
+
+def _is_current(path: Path, key: str) -> bool:
+    try:
+        built = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    try:
+        return built > _marker(key).stat().st_mtime_ns
+    except FileNotFoundError:
+        return True
+
+
+def _write_atomic(path: Path, data: bytes, started: int) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.utime(tmp, ns=(started, started))
+    os.replace(tmp, path)
+
+
+def _sitemap_index() -> bytes:
+    months = (
+        _live_news()
+        .annotate(month=TruncMonth("published_at"))
+        .values("month")
+        .annotate(lastmod=Max("updated_at"))
+        .order_by("month")
+    )
+    entries = "".join(
+        "<sitemap><loc>{}</loc><lastmod>{}</lastmod></sitemap>".format(
+            escape(_absolute(reverse("sitemap_month", args=[month_of(row["month"])]))),
+            row["lastmod"].isoformat(),
+        )
+        for row in months
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<sitemapindex xmlns="{SITEMAP_NS}">{entries}</sitemapindex>\n'
+    ).encode()
+
+
+def _sitemap_month(month: str) -> bytes | None:
+    start, end = _month_range(month)
+    rows = list(
+        _live_news()
+        .filter(published_at__gte=start, published_at__lt=end)
+        .order_by("published_at", "id")
+        .values_list("id", "updated_at")
+    )
+    if not rows:
+        return None
+    entries = "".join(
+        "<url><loc>{}</loc><lastmod>{}</lastmod></url>".format(
+            escape(_absolute(reverse("news:news_detail", args=[pk]))),
+            updated_at.isoformat(),
+        )
+        for pk, updated_at in rows
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<urlset xmlns="{SITEMAP_NS}">{entries}</urlset>\n'
+    ).encode()
+
+
+def _feed_scope(key: str):
+    """(title, link, news filter) of a feed key, or None if it lists nothing."""
+    title = feeds_setting("TITLE")
+    if key == "news":
+        return title, reverse("news:news_list"), {}
+    kind, pk = key.split("-")
+    if kind == "category":
+        category = Category.objects.filter(pk=pk, deleted_at__isnull=True).first()
+        if category is None:
+            return None
+        return (
+            f"{title}: {category.name}",
+            reverse("news:news_by_category", args=[category.pk]),
+            {"category_id": category.pk},
+        )
+    author = Author.objects.filter(pk=pk, deleted_at__isnull=True).select_related("user").first()
+    if author is None:
+        return None
+    return f"{title}: {author.user.username}", reverse("news:news_list"), {"author_id": author.pk}
+
+
+def _feeds(key: str) -> dict[str, bytes] | None:
+    scope = _feed_scope(key)
+    if scope is None:
+        return None
+    title, link, filters = scope
+    items = list(
+        _live_news()
+        .filter(**filters)
+        .order_by("-published_at", "-id")
+        .only("id", "title", "content", "published_at", "updated_at")[:feeds_setting("ITEMS")]
+    )
+    words = feeds_setting("DESCRIPTION_WORDS")
+    rendered = {}
+    for fmt, (feed_class, _) in FORMATS.items():
+        feed = feed_class(
+            title=title,
+            link=_absolute(link),
+            description=title,
+            language=settings.LANGUAGE_CODE,
+            feed_url=_absolute(reverse("feed", args=[key, fmt])),
+        )
+        for item in items:
+            url = _absolute(reverse("news:news_detail", args=[item.id]))
+            feed.add_item(
+                title=item.title,
+                link=url,
+                unique_id=url,
+                description=Truncator(item.content).words(words),
+                pubdate=item.published_at,
+                updateddate=item.updated_at,
+            )
+        rendered[fmt] = feed.writeString("utf-8").encode()
+    return rendered
+
+
+def build(key: str) -> bool:
+    """(Re)writes the artifacts of ``key``; False if it lists nothing."""
+    started = time.time_ns()
+    if key == "sitemap":
+        bodies = {"xml": _sitemap_index()}
+    elif key.startswith("sitemap-"):
+        body = _sitemap_month(key.removeprefix("sitemap-"))
+        bodies = None if body is None else {"xml": body}
+    else:
+        bodies = _feeds(key)
+    if bodies is None:
+        for path in _paths(key):
+            path.unlink(missing_ok=True)
+        return False
+    directory = artifact_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    for ext, body in bodies.items():
+        _write_atomic(directory / f"{key}.{ext}", body, started)
+    return True
+
+
+def get_artifact(key: str, ext: str) -> Artifact | None:
+    """The current artifact, built first if missing or stale; None if empty."""
+    path = artifact_dir() / f"{key}.{ext}"
+    if not _is_current(path, key):
+        with _lock:
+            if not _is_current(path, key) and not build(key):
+                return None
+    try:
+        body = path.read_bytes()
+        built = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    return Artifact(
+        body=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        last_modified=built,
+    )
+
+
+def all_keys() -> list[str]:
+    """Every key with content, for a full rebuild."""
+    live = _live_news()
+    keys = ["sitemap", "news"]
+    keys += [
+        f"sitemap-{month_of(month)}"
+        for month in live.annotate(month=TruncMonth("published_at"))
+        .values_list("month", flat=True).order_by("month").distinct()
+    ]
+    keys += [
+        f"category-{pk}"
+        for pk in live.filter(category__isnull=False)
+        .values_list("category_id", flat=True).order_by("category_id").distinct()
+    ]
+    keys += [
+        f"author-{pk}"
+        for pk in live.filter(author__isnull=False)
+        .values_list("author_id", flat=True).order_by("author_id").distinct()
+    ]
+    return keys
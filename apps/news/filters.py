@@ -0,0 +1,114 @@
+"""
+Filtering and ordering of news cards for list endpoints.
+
+Every predicate is on a raw NewsCard column, so it can be answered from
+an index: date bounds become half-open ranges on created_at rather than
+``__date`` lookups, which wrap the column in a function. A feed over
+several categories is read as one (category_id, created_at) index scan
+per category, merged in order, instead of an IN list that has to be
+sorted as a whole. Rows with the same timestamp are ordered by id, in
+the direction of the ordering, so pages neither repeat nor skip them.
+"""
+import heapq
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from operator import itemgetter
+
+from django.utils import timezone
+
+from apps.abstracts.pagination import count_rows
+
+DEFAULT_ORDERING = "-created_at"
+
+ORDERINGS = (
+    "-created_at",
+    "created_at",
+    "-published_at",
+    "published_at",
+)
+
+
+def ordered_by(ordering: str) -> tuple[str, str]:
+    """``ordering`` with the id tiebreak the card indexes end with."""
+    return ordering, "-pk" if ordering.startswith("-") else "pk"
+
+
+def day_start(day: date) -> datetime:
+    """Start of ``day`` in the current time zone, as an aware datetime."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _in_or_exact(qs, field: str, values):
+    # A single value stays an equality so counters and indexes still match.
+    values = list(dict.fromkeys(values))
+    if len(values) == 1:
+        return qs.filter(**{field: values[0]})
+    return qs.filter(**{f"{field}__in": values})
+
+
+class MergedCards:
+    """
+    Payloads of several disjoint, identically ordered card querysets,
+    merged lazily by (ordering field, id). Slicing reads at most ``stop`` rows per queryset, so it
+    is enough of a sequence for Paginator.
+    """
+
+    def __init__(self, querysets, ordering: str):
+        self.querysets = querysets
+        self.field = ordering.lstrip("-")
+        self.reverse = ordering.startswith("-")
+
+    def count_rows(self) -> tuple[int, bool]:
+        counts = [count_rows(qs) for qs in self.querysets]
+        return sum(n for n, _ in counts), all(exact for _, exact in counts)
+
+    def count(self) -> int:
+        return self.count_rows()[0]
+
+    def _merged(self, limit: int | None = None):
+        sources = []
+        for qs in self.querysets:
+            rows = qs.values_list(self.field, "pk", "payload")
+            sources.append(rows[:limit] if limit is not None else rows.iterator())
+        merged = heapq.merge(*sources, key=itemgetter(0, 1), reverse=self.reverse)
+        return (payload for _, _, payload in merged)
+
+    def __iter__(self):
+        return self._merged()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step is not None or (key.start or 0) < 0 or (key.stop or 0) < 0:
+                raise ValueError("Only forward slices are supported.")
+            return list(islice(self._merged(key.stop), key.start, key.stop))
+        return self[key:key + 1][0]
+
+
+def filter_cards(qs, params: dict):
+    """
+    Applies validated NewsQueryParamsSerializer ``params`` to a NewsCard
+    queryset. Returns the ordered payloads: a queryset, or MergedCards
+    when more than one category is requested.
+    """
+    if params.get("author_id"):
+        qs = _in_or_exact(qs, "author_id", params["author_id"])
+
+    if params.get("is_published") is not None:
+        qs = qs.filter(is_published=params["is_published"])
+
+    if params.get("date_from"):
+        qs = qs.filter(created_at__gte=day_start(params["date_from"]))
+
+    if params.get("date_to"):
+        qs = qs.filter(created_at__lt=day_start(params["date_to"] + timedelta(days=1)))
+
+    ordering = params.get("ordering") or DEFAULT_ORDERING
+    category_ids = list(dict.fromkeys(params.get("category_id") or ()))
+    if len(category_ids) > 1:
+        return MergedCards(
+            [qs.filter(category_id=pk).order_by(*ordered_by(ordering)) for pk in category_ids],
+            ordering,
+        )
+    if category_ids:
+        qs = qs.filter(category_id=category_ids[0])
+    return qs.order_by(*ordered_by(ordering)).values_list("payload", flat=True)
@@ -0,0 +1,410 @@
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.accounts.models import Author
+from apps.comments.models import Comment
+from .models import Category, ImportCheckpoint, News
+from .signals import content_imported
+
+User = get_user_model()
+
+RECORD_TYPES = ("category", "author", "news", "comment")
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+class ImportRecordError(ValueError):
+    pass
+
+
+def _parse_dt(value: Any) -> datetime | None:
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ImportRecordError(f"Invalid datetime: {value!r}")
+    if timezone.is_naive(parsed):
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+@contextmanager
+def legacy_timestamps(*models):
+    """
+    Lets bulk_create() keep the timestamps from the source instead of
+    overwriting them through auto_now/auto_now_add. updated_at is still set
+    to the import time by the callers: it is the change watermark of
+    /api/changes/, and a legacy value would sit behind every client's.
+    """
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+def _restore_indexes(cursor, indexes: list[list[str]]) -> None:
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing = {row[0] for row in cursor.fetchall()}
+    for name, sql in indexes:
+        if name not in existing:
+            cursor.execute(sql)
+    if indexes:
+        cursor.execute("ANALYZE")
+
+
+@contextmanager
+def sqlite_bulk_mode(defer_indexes: bool, tables: tuple[str, ...], pending: Path):
+    """
+    Relaxes SQLite durability for the duration of the import and, when asked,
+    drops secondary indexes on ``tables`` and rebuilds them once at the end
+    (one sort per index instead of a B-tree update per row). PRAGMAs cannot
+    change inside a transaction, so an enclosing atomic block disables this.
+
+    The dropped indexes are listed in ``pending`` until they are rebuilt, so
+    a run that was killed gets them back on its next start.
+    """
+    if connection.vendor != "sqlite":
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        if pending.exists():
+            _restore_indexes(cursor, json.loads(pending.read_text()))
+            pending.unlink()
+
+    if connection.in_atomic_block:
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        synchronous = cursor.fetchone()[0]
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA cache_size = -200000")
+
+        dropped = []
+        if defer_indexes:
+            placeholders = ", ".join(["%s"] * len(tables))
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master "
+                f"WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})",
+                list(tables),
+            )
+            dropped = [list(row) for row in cursor.fetchall()]
+            if dropped:
+                pending.write_text(json.dumps(dropped))
+            for name, _ in dropped:
+                cursor.execute(f'DROP INDEX "{name}"')
+
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            _restore_indexes(cursor, dropped)
+            cursor.execute(f"PRAGMA synchronous = {int(synchronous)}")
+        if dropped:
+            pending.unlink()
+
+
+class ContentImporter:
+    """
+    Stream-imports NDJSON records from a legacy CMS.
+
+    Each line is an object with ``type`` (one of RECORD_TYPES) and a legacy
+    ``id``. References to other records use legacy ids (``category_id``,
+    ``author_id``, ``news_id``, ``parent_id``) and are resolved through
+    in-memory legacy -> new id maps. Users are matched by email.
+
+    A checkpoint is an ImportCheckpoint row with the input offset and
+    counters, saved by flush() in the transaction of the rows it covers,
+    so a crash never leaves one without the other. It is keyed by a path
+    next to which the id maps go to an append-only ``<checkpoint>.maps``
+    side file, of which the checkpoint records how many bytes belong to it.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self.maps: dict[str, dict[int, int]] = {kind: {} for kind in RECORD_TYPES}
+        self.buffers: dict[str, list[dict[str, Any]]] = {kind: [] for kind in RECORD_TYPES}
+        self.users: dict[str, int] = {}
+        self.counts: dict[str, int] = {kind: 0 for kind in RECORD_TYPES}
+        self.skipped = 0
+        self.id_ranges: dict[str, list[int]] = {}
+        self.unsaved_maps: list[tuple[str, int, int]] = []
+        self.maps_size = 0
+
+    # ----------------------------------------------
+    # Checkpoints
+    #
+    @staticmethod
+    def maps_path(path: Path) -> Path:
+        return path.with_suffix(path.suffix + ".maps")
+
+    def load_checkpoint(self, path: Path) -> int | None:
+        """Restores the state saved under ``path``; returns its offset, or None if there is none."""
+        checkpoint = ImportCheckpoint.objects.filter(name=str(path)).first()
+        if checkpoint is None:
+            return None
+        state = checkpoint.state
+        self.counts = state["counts"]
+        self.skipped = state["skipped"]
+        self.id_ranges = state.get("id_ranges", {})
+        self.maps_size = state["maps_size"]
+        with open(self.maps_path(path), "rb") as fh:
+            # Entries past maps_size were written after the checkpoint and
+            # are dropped with the rest of that batch by the next save.
+            for line in fh.read(self.maps_size).splitlines():
+                kind, legacy_id, new_id = line.decode().split("\t")
+                self.maps[kind][int(legacy_id)] = int(new_id)
+        return state["offset"]
+
+    def save_checkpoint(self, path: Path, offset: int) -> None:
+        maps_path = self.maps_path(path)
+        with open(maps_path, "r+b" if maps_path.exists() else "wb") as fh:
+            fh.seek(self.maps_size)
+            fh.truncate()
+            fh.write("".join(
+                f"{kind}\t{legacy_id}\t{new_id}\n"
+                for kind, legacy_id, new_id in self.unsaved_maps
+            ).encode())
+            fh.flush()
+            os.fsync(fh.fileno())
+            self.maps_size = fh.tell()
+        self.unsaved_maps.clear()
+
+        ImportCheckpoint.objects.update_or_create(
+            name=str(path),
+            defaults={"state": {
+                "offset": offset,
+                "counts": self.counts,
+                "skipped": self.skipped,
+                "id_ranges": self.id_ranges,
+                "maps_size": self.maps_size,
+            }},
+        )
+
+    # ----------------------------------------------
+    # Buffering
+    #
+    def pending(self) -> int:
+        return sum(len(buffer) for buffer in self.buffers.values())
+
+    def feed(self, record: dict[str, Any]) -> None:
+        kind = record.get("type")
+        if kind not in RECORD_TYPES or "id" not in record:
+            self.skipped += 1
+            return
+        self.buffers[kind].append(record)
+
+    def flush(self, checkpoint: Path | None = None, offset: int = 0) -> None:
+        """
+        Writes the buffered records; with ``checkpoint``, saves ``offset``
+        as done under it in the same transaction.
+        """
+        # Dependency order: comments need news and parents, news need
+        # categories and authors.
+        with transaction.atomic():
+            self._flush_categories()
+            self._flush_authors()
+            self._flush_news()
+            self._flush_comments()
+            if checkpoint is not None:
+                self.save_checkpoint(checkpoint, offset)
+
+    def _map(self, kind: str, legacy_id: int, new_id: int) -> None:
+        self.maps[kind][legacy_id] = new_id
+        self.unsaved_maps.append((kind, legacy_id, new_id))
+
+    def _track(self, kind: str, ids: list[int]) -> None:
+        if not ids:
+            return
+        low, high = min(ids), max(ids)
+        if kind in self.id_ranges:
+            current = self.id_ranges[kind]
+            self.id_ranges[kind] = [min(current[0], low), max(current[1], high)]
+        else:
+            self.id_ranges[kind] = [low, high]
+
+    def _resolve_users(self, emails: set[str]) -> None:
+        missing = {email for email in emails if email not in self.users}
+        if not missing:
+            return
+        for user_id, email in User.objects.filter(email__in=missing).values_list("id", "email"):
+            self.users[email] = user_id
+            missing.discard(email)
+        if missing:
+            new_users = []
+            for email in missing:
+                # Full email as username: local parts collide across domains.
+                user = User(email=email, username=email[:150])
+                user.set_unusable_password()
+                new_users.append(user)
+            for user in User.objects.bulk_create(new_users, batch_size=self.batch_size):
+                self.users[user.email] = user.pk
+
+    def _flush_categories(self) -> None:
+        records = self.buffers["category"]
+        if not records:
+            return
+        names = {record["name"] for record in records}
+        existing = dict(
+            Category.objects.filter(name__in=names).values_list("name", "id")
+        )
+        to_create = [
+            Category(name=name) for name in names if name not in existing
+        ]
+        for category in Category.objects.bulk_create(to_create):
+            existing[category.name] = category.pk
+
+        for record in records:
+            self._map("category", record["id"], existing[record["name"]])
+        self.counts["category"] += len(records)
+        records.clear()
+
+    def _flush_authors(self) -> None:
+        records = self.buffers["author"]
+        if not records:
+            return
+        self._resolve_users({record["email"] for record in records})
+        user_ids = {self.users[record["email"]] for record in records}
+        existing = dict(
+            Author.objects.filter(user_id__in=user_ids).values_list("user_id", "id")
+        )
+
+        to_create = []
+        for record in records:
+            user_id = self.users[record["email"]]
+            if user_id not in existing:
+                to_create.append(
+                    Author(user_id=user_id, description=record.get("description"))
+                )
+                existing[user_id] = None
+        for author in Author.objects.bulk_create(to_create, batch_size=self.batch_size):
+            existing[author.user_id] = author.pk
+
+        for record in records:
+            self._map("author", record["id"], existing[self.users[record["email"]]])
+        self.counts["author"] += len(records)
+        records.clear()
+
+    def _flush_news(self) -> None:
+        records = self.buffers["news"]
+        if not records:
+            return
+        now = timezone.now()
+        objs = []
+        for record in records:
+            created_at = _parse_dt(record.get("created_at")) or now
+            objs.append(News(
+                title=record["title"],
+                content=record.get("content", ""),
+                image=record.get("image") or None,
+                category_id=self.maps["category"].get(record.get("category_id")),
+                author_id=self.maps["author"].get(record.get("author_id")),
+                is_published=record.get("is_published", True),
+                published_at=_parse_dt(record.get("published_at")) or created_at,
+                created_at=created_at,
+                updated_at=now,
+                deleted_at=_parse_dt(record.get("deleted_at")),
+            ))
+
+        with legacy_timestamps(News):
+            News.objects.bulk_create(objs, batch_size=self.batch_size)
+
+        for record, obj in zip(records, objs):
+            self._map("news", record["id"], obj.pk)
+        self._track("news", [obj.pk for obj in objs])
+        self.counts["news"] += len(records)
+        records.clear()
+
+    def _flush_comments(self) -> None:
+        records = self.buffers["comment"]
+        if not records:
+            return
+        self._resolve_users({record["user_email"] for record in records if record.get("user_email")})
+
+        # A reply may sit in the same batch as its parent, so insert in
+        # waves: everything whose parent is already known goes first.
+        now = timezone.now()
+        remaining = records
+        while remaining:
+            ready, waiting = [], []
+            for record in remaining:
+                parent = record.get("parent_id")
+                if parent is None or parent in self.maps["comment"]:
+                    ready.append(record)
+                else:
+                    waiting.append(record)
+
+            if not ready:
+                # Parents that never appear in the source: keep the
+                # comment as a top-level one rather than losing it.
+                for record in waiting:
+                    record["parent_id"] = None
+                continue
+
+            objs, kept = [], []
+            for record in ready:
+                news_id = self.maps["news"].get(record.get("news_id"))
+                user_id = self.users.get(record.get("user_email"))
+                if news_id is None or user_id is None:
+                    self.skipped += 1
+                    continue
+                created_at = _parse_dt(record.get("created_at")) or now
+                objs.append(Comment(
+                    news_id=news_id,
+                    user_id=user_id,
+                    parent_id=self.maps["comment"].get(record.get("parent_id")),
+                    text=record.get("text", ""),
+                    created_at=created_at,
+                    updated_at=now,
+                    deleted_at=_parse_dt(record.get("deleted_at")),
+                ))
+                kept.append(record)
+
+            with legacy_timestamps(Comment):
+                Comment.objects.bulk_create(objs, batch_size=self.batch_size)
+
+            for record, obj in zip(kept, objs):
+                self._map("comment", record["id"], obj.pk)
+            self._track("comment", [obj.pk for obj in objs])
+            self.counts["comment"] += len(kept)
+            remaining = waiting
+
+        records.clear()
+
+    def finish(self) -> None:
+        news_ids = self.id_ranges.get("news")
+        comment_ids = self.id_ranges.get("comment")
+        content_imported.send(
+            sender=self.__class__,
+            news_ids=tuple(news_ids) if news_ids else None,
+            comment_ids=tuple(comment_ids) if comment_ids else None,
+        )
+
+
+def iter_records(fh: BinaryIO) -> Iterator[tuple[dict[str, Any], int]]:
+    """Yields ``(record, offset_after_record)`` for every non-empty line."""
+    while True:
+        line = fh.readline()
+        if not line:
+            return
+        if line.strip():
+            yield json.loads(line), fh.tell()
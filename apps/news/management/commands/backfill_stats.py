@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.news.stats import CHUNK_SIZE, backfill
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily statistics rollups from news and comments history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        def progress(dataset, done, last):
+            self.stdout.write(f"  {dataset}: up to id {done} of {last}")
+
+        backfill(options["chunk_size"], progress=progress)
+        self.stdout.write(self.style.SUCCESS("✅ Daily stats rebuilt"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.news import feeds
+
+
+class Command(BaseCommand):
+    help = "Rebuild all sitemap and RSS/Atom feed artifacts"
+
+    def handle(self, *args, **options):
+        built = 0
+        for key in feeds.all_keys():
+            built += feeds.build(key)
+        self.stdout.write(self.style.SUCCESS(f"✅ {built} sitemaps and feeds built"))
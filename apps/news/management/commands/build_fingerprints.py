@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from apps.news.duplicates import fingerprint_range
+from apps.news.models import News
+
+
+class Command(BaseCommand):
+    help = "Compute the near-duplicate fingerprints of all news"
+
+    def handle(self, *args, **options):
+        last_id = News.objects.aggregate(last=Max("id"))["last"] or 0
+
+        def progress(done, last):
+            self.stdout.write(f"  news: up to id {done} of {last}")
+
+        written = fingerprint_range(1, last_id, progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"✅ {written} fingerprints written"))
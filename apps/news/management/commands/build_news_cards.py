@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from apps.news.cards import build_cards_in_range
+from apps.news.models import News
+
+
+class Command(BaseCommand):
+    help = "Regenerate the precomputed list cards of all news"
+
+    def handle(self, *args, **options):
+        last_id = News.objects.aggregate(last=Max("id"))["last"]
+        if last_id is None:
+            self.stdout.write("⚠️ No news found. Skipping.")
+            return
+
+        written = build_cards_in_range(1, last_id)
+        self.stdout.write(self.style.SUCCESS(f"✅ Built {written} news cards"))
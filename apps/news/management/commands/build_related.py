@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.news.related import build
+
+
+class Command(BaseCommand):
+    help = "Rebuild the TF-IDF vectors and related-news lists of all published news"
+
+    def handle(self, *args, **options):
+        def progress(done, total):
+            self.stdout.write(f"  neighbours: {done} of {total}")
+
+        indexed = build(progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"✅ Related news rebuilt for {indexed} news"))
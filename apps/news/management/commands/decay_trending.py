@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.news import trending
+
+
+class Command(BaseCommand):
+    help = "Drop decayed trending scores (run periodically, e.g. hourly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute all scores from recent comments and views instead",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            count = trending.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt {count} trending scores"))
+            return
+
+        deleted = trending.prune()
+        self.stdout.write(self.style.SUCCESS(f"✅ Pruned {deleted} decayed trending scores"))
@@ -0,0 +1,79 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.news.imports import (
+    DEFAULT_BATCH_SIZE,
+    ContentImporter,
+    ImportRecordError,
+    iter_records,
+    sqlite_bulk_mode,
+)
+
+
+class Command(BaseCommand):
+    help = "Bulk import categories, authors, news and comments from NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file exported from the legacy CMS")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint name, also the prefix of its side files (default: <path>.checkpoint)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and start from the beginning",
+        )
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Drop secondary indexes during the import and rebuild them at the end",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+
+        checkpoint = Path(options["checkpoint"] or f"{path}.checkpoint")
+        importer = ContentImporter(batch_size=options["batch_size"])
+
+        offset = 0
+        if not options["restart"]:
+            resumed = importer.load_checkpoint(checkpoint)
+            if resumed is not None:
+                offset = resumed
+                self.stdout.write(f"↻ Resuming from byte {offset}")
+
+        started = time.monotonic()
+        rows = 0
+
+        with sqlite_bulk_mode(
+            options["defer_indexes"],
+            ("news_news", "comments_comment"),
+            Path(f"{checkpoint}.indexes"),
+        ), open(path, "rb") as fh:
+            fh.seek(offset)
+            try:
+                for record, offset in iter_records(fh):
+                    importer.feed(record)
+                    rows += 1
+                    if importer.pending() >= options["batch_size"]:
+                        importer.flush(checkpoint, offset)
+                importer.flush(checkpoint, offset)
+            except (ImportRecordError, ValueError, KeyError) as exc:
+                raise CommandError(f"Import failed near byte {offset}: {exc}") from exc
+
+        importer.finish()
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        summary = ", ".join(f"{kind}: {count}" for kind, count in importer.counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Imported {rows} rows in {elapsed:.1f}s "
+                f"({rows / elapsed:.0f} rows/sec) — {summary}, skipped: {importer.skipped}"
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.news import prerender
+
+
+class Command(BaseCommand):
+    help = "Render the public news pages served to anonymous readers"
+
+    def handle(self, *args, **options):
+        def progress(done):
+            self.stdout.write(f"  news: {done} pages")
+
+        written = prerender.render_all(progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"✅ {written} pages rendered"))
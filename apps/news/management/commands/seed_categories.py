@@ -1,14 +1,15 @@
 from django.core.management.base import BaseCommand
-from faker import Faker
 from apps.news.models import Category
 
-fake = Faker()
-
 
 class Command(BaseCommand):
     help = "Seed categories"
 
     def handle(self, *args, **options):
+        from faker import Faker
+
+        fake = Faker()
+
         if Category.objects.exists():
             self.stdout.write("⚠️ Categories already exist. Skipping.")
             return
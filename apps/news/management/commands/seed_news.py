@@ -1,17 +1,18 @@
 from django.core.management.base import BaseCommand
-from faker import Faker
 import random
 
 from apps.news.models import News, Category
 from apps.accounts.models import Author
 
-fake = Faker()
-
 
 class Command(BaseCommand):
     help = "Seed news"
 
     def handle(self, *args, **options):
+        from faker import Faker
+
+        fake = Faker()
+
         categories = list(Category.objects.all())
         authors = list(Author.objects.all())
 
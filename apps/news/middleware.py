@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from . import prerender, views
+from .counters import view_counter
+
+
+class PrerenderedPageMiddleware(MiddlewareMixin):
+    """
+    Answers anonymous GETs of news_detail, news_list and news_by_category
+    with the page apps.news.prerender wrote, rendering it first when it
+    is stale or missing; blank pages go to the view. A request
+    without a session cookie or Authorization header is anonymous; that
+    check needs no session lookup. Goes last in MIDDLEWARE.
+    """
+
+    def _page_name(self, view_func, view_kwargs):
+        if view_func is views.news_detail:
+            return f"news-{view_kwargs['news_id']}"
+        if view_func is views.news_list:
+            return "list"
+        if view_func is views.news_by_category:
+            return f"category-{view_kwargs['category_id']}"
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not prerender.prerender_setting("ENABLED"):
+            return None
+        if request.method not in ("GET", "HEAD") or request.GET:
+            return None
+        if settings.SESSION_COOKIE_NAME in request.COOKIES or "Authorization" in request.headers:
+            return None
+        if request.headers.get("Accept") == "application/json":
+            return None
+        name = self._page_name(view_func, view_kwargs)
+        if name is None:
+            return None
+        body = prerender.read(name)
+        if body is None:
+            return None
+        if view_func is views.news_detail:
+            view_counter.record(view_kwargs["news_id"])
+        response = HttpResponse(body, content_type="text/html; charset=utf-8")
+        patch_vary_headers(response, ["Cookie", "Authorization", "Accept"])
+        return response
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsCard',
+            fields=[
+                ('news', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='news.news')),
+                ('category_id', models.BigIntegerField(null=True)),
+                ('author_id', models.BigIntegerField(null=True)),
+                ('is_published', models.BooleanField()),
+                ('created_at', models.DateTimeField()),
+                ('published_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('payload', models.JSONField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['is_published', '-created_at'], name='newscard_published_idx'), models.Index(fields=['category_id', '-created_at'], name='newscard_category_idx'), models.Index(fields=['author_id', '-created_at'], name='newscard_author_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_news_card'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='views_count',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='NewsViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='news.news')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('news', 'bucket_start'), name='newsviewbucket_unique')],
+            },
+        ),
+    ]
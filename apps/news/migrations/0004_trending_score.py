@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_news_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('news', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='news.news')),
+                ('category_id', models.BigIntegerField(null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('log_score', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['is_active', '-log_score'], name='trending_global_idx'), models.Index(fields=['category_id', 'is_active', '-log_score'], name='trending_category_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:38
+
+from django.db import migrations
+
+from apps.abstracts.search import fts_migration_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_trending_score'),
+    ]
+
+    operations = fts_migration_operations(
+        'news_news_fts',
+        'news_news',
+        ('title', 'content'),
+    )
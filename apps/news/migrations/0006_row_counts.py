@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:40
+
+from django.db import migrations
+
+from apps.abstracts.counting import counter_migration_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('abstracts', '0001_row_count'),
+        ('news', '0005_news_fts'),
+    ]
+
+    operations = counter_migration_operations(
+        'news_news',
+        [
+            (),
+            ("is_published",),
+            ("deleted_at__isnull",),
+        ],
+    ) + counter_migration_operations(
+        'news_newscard',
+        [
+            ("deleted_at__isnull", "is_published"),
+            ("category_id", "deleted_at__isnull", "is_published"),
+        ],
+    )
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:42
+
+from django.db import migrations, models
+
+from apps.news.stats import news_trigger_sql, trigger_migration_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_row_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCommenter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category_id', models.BigIntegerField(default=0)),
+                ('author_id', models.BigIntegerField(default=0)),
+                ('user_id', models.BigIntegerField()),
+                ('comments', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category_id', 'day'], name='dailycommenter_category_idx'), models.Index(fields=['author_id', 'day'], name='dailycommenter_author_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'category_id', 'author_id', 'user_id'), name='dailycommenter_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category_id', models.BigIntegerField(default=0)),
+                ('author_id', models.BigIntegerField(default=0)),
+                ('published', models.IntegerField(default=0)),
+                ('comments', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category_id', 'day'], name='dailystat_category_idx'), models.Index(fields=['author_id', 'day'], name='dailystat_author_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'category_id', 'author_id'), name='dailystat_unique')],
+            },
+        ),
+    ] + trigger_migration_operations('news_news', news_trigger_sql)
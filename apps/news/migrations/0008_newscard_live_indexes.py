@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newscard',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_published', True)), fields=['-created_at'], name='newscard_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newscard',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_published', True)), fields=['-published_at'], name='newscard_live_published_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0009_related_news'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsFingerprint',
+            fields=[
+                ('news', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='fingerprint', serialize=False, to='news.news')),
+                ('simhash', models.BigIntegerField()),
+                ('band_0', models.PositiveIntegerField()),
+                ('band_1', models.PositiveIntegerField()),
+                ('band_2', models.PositiveIntegerField()),
+                ('band_3', models.PositiveIntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band_0'], name='newsfingerprint_band_0_idx'), models.Index(fields=['band_1'], name='newsfingerprint_band_1_idx'), models.Index(fields=['band_2'], name='newsfingerprint_band_2_idx'), models.Index(fields=['band_3'], name='newsfingerprint_band_3_idx')],
+            },
+        ),
+    ]
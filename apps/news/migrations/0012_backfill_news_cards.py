@@ -0,0 +1,78 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:10
+
+from django.db import migrations
+from rest_framework.fields import DateTimeField
+
+CHUNK_SIZE = 500
+
+CARD_FIELDS = (
+    "category_id",
+    "author_id",
+    "is_published",
+    "created_at",
+    "published_at",
+    "deleted_at",
+    "payload",
+)
+
+
+def card_payload(news, as_datetime):
+    # Frozen copy of apps.news.serializers.NewsCardSerializer as of this
+    # migration; build_news_cards regenerates cards with the live one.
+    author = news.author
+    return {
+        "id": news.id,
+        "title": news.title,
+        "category_name": news.category.name if news.category else None,
+        "author": {"id": author.id, "email": author.user.email} if author else None,
+        "is_published": news.is_published,
+        "created_at": as_datetime(news.created_at),
+        "category_id": news.category_id,
+        "image": {"original": news.image.url} if news.image else None,
+        "published_at": as_datetime(news.published_at),
+        "updated_at": as_datetime(news.updated_at),
+    }
+
+
+def backfill_cards(apps, schema_editor):
+    News = apps.get_model("news", "News")
+    NewsCard = apps.get_model("news", "NewsCard")
+    as_datetime = DateTimeField().to_representation
+    news = News.objects.select_related("author", "author__user", "category").order_by("id")
+    cursor = 0
+    while True:
+        chunk = list(news.filter(id__gt=cursor)[:CHUNK_SIZE])
+        if not chunk:
+            return
+        NewsCard.objects.bulk_create(
+            [
+                NewsCard(
+                    news_id=item.id,
+                    category_id=item.category_id,
+                    author_id=item.author_id,
+                    is_published=item.is_published,
+                    created_at=item.created_at,
+                    published_at=item.published_at,
+                    deleted_at=item.deleted_at,
+                    payload=card_payload(item, as_datetime),
+                )
+                for item in chunk
+            ],
+            update_conflicts=True,
+            unique_fields=["news"],
+            update_fields=CARD_FIELDS,
+        )
+        cursor = chunk[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_author_slug'),
+        ('comments', '0005_updated_at_index'),
+        ('news', '0011_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_cards, migrations.RunPython.noop),
+    ]
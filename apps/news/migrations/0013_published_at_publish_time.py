@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:54
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0012_backfill_news_cards'),
+    ]
+
+    # The column is unchanged; altering it for real would make SQLite rebuild
+    # news_news and drop the stats triggers on it.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='news',
+                    name='published_at',
+                    field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0014_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='newscard',
+            name='newscard_published_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='newscard',
+            name='newscard_category_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='newscard',
+            name='newscard_author_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='newscard',
+            name='newscard_live_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='newscard',
+            name='newscard_live_published_idx',
+        ),
+        migrations.AddIndex(
+            model_name='newscard',
+            index=models.Index(fields=['is_published', '-created_at', '-news'], name='newscard_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newscard',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_published', True)), fields=['-created_at', '-news'], name='newscard_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newscard',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_published', True)), fields=['-published_at', '-news'], name='newscard_live_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newscard',
+            index=models.Index(fields=['category_id', '-created_at', '-news'], name='newscard_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newscard',
+            index=models.Index(fields=['author_id', '-created_at', '-news'], name='newscard_author_idx'),
+        ),
+    ]
@@ -1,10 +1,17 @@
 from django.db import models
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
 from apps.abstracts.models import AbstractBaseModel
 from apps.accounts.models import Author
 
 class Category(AbstractBaseModel):
     name = models.CharField(max_length=100, unique=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='category_updated_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -15,8 +22,265 @@ class News(AbstractBaseModel):
     image = models.ImageField(upload_to='news_images/', blank=True, null=True)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name='news')
     author = models.ForeignKey(Author, on_delete=models.SET_NULL, null=True, related_name='news')
-    published_at = models.DateTimeField(auto_now_add=True)
+    # When the news last went live: creation for news created published,
+    # otherwise stamped when a draft is published (see publish_values()).
+    published_at = models.DateTimeField(default=timezone.now, editable=False)
     is_published = models.BooleanField(default=True)
+    views_count = models.PositiveBigIntegerField(default=0)
+
+    # Filter combinations with trigger-maintained counts (apps.abstracts.counting).
+    ROW_COUNT_FILTERS = [
+        (),
+        ("is_published",),
+        ("deleted_at__isnull",),
+    ]
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='news_updated_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    # Fields whose loaded values are kept, so saves can tell they changed.
+    TRACKED_FIELDS = ("is_published", "deleted_at")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded = {
+            name: instance.__dict__[name] for name in cls.TRACKED_FIELDS if name in instance.__dict__
+        }
+        return instance
+
+    def changed_fields(self) -> set[str]:
+        """TRACKED_FIELDS that differ from their loaded (or last saved) values."""
+        loaded = getattr(self, "_loaded", {})
+        return {name for name, value in loaded.items() if getattr(self, name) != value}
+
+    def save(self, *args, **kwargs):
+        if self.is_published and getattr(self, "_loaded", {}).get("is_published") is False:
+            self.published_at = timezone.now()
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "published_at"}
+        super().save(*args, **kwargs)
+        self._loaded = {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+
+    @staticmethod
+    def publish_values(now) -> dict:
+        """UPDATE values publishing news; only drafts get a new published_at."""
+        return {
+            "is_published": True,
+            "published_at": Case(
+                When(is_published=False, then=Value(now)),
+                default=F("published_at"),
+            ),
+        }
+
+class NewsViewBucket(models.Model):
+    """Views of a news per hour, for the recent-views window."""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='view_buckets')
+    bucket_start = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['news', 'bucket_start'], name='newsviewbucket_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.news_id} @ {self.bucket_start:%Y-%m-%d %H:00}: {self.views}"
+
+
+class TrendingScore(models.Model):
+    """
+    Time-decayed engagement score of a news, kept in log space relative to a
+    fixed epoch (see apps.news.trending) so it never needs rescaling.
+    """
+    news = models.OneToOneField(News, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    category_id = models.BigIntegerField(null=True)
+    is_active = models.BooleanField(default=True)
+    log_score = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active', '-log_score'], name='trending_global_idx'),
+            models.Index(fields=['category_id', 'is_active', '-log_score'], name='trending_category_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.news_id}: {self.log_score:.3f}"
+
+
+class NewsCard(models.Model):
+    """
+    Denormalized, pre-serialized list representation of a News.
+
+    The filter columns mirror News so list endpoints can select and order
+    cards without joining author, user or category.
+    """
+    news = models.OneToOneField(News, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    category_id = models.BigIntegerField(null=True)
+    author_id = models.BigIntegerField(null=True)
+    is_published = models.BooleanField()
+    created_at = models.DateTimeField()
+    published_at = models.DateTimeField()
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    payload = models.JSONField()
+
+    ROW_COUNT_FILTERS = [
+        ("deleted_at__isnull", "is_published"),
+        ("category_id", "deleted_at__isnull", "is_published"),
+    ]
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_published', '-created_at', '-news'], name='newscard_published_idx'),
+            # Public feed. Django renders is_published=True as a bare column,
+            # which SQLite cannot search an index by; a partial index on the
+            # same condition is still chosen for it. Indexes end with the
+            # id so ties in the ordering need no extra sort.
+            models.Index(
+                fields=['-created_at', '-news'],
+                condition=models.Q(deleted_at__isnull=True, is_published=True),
+                name='newscard_live_created_idx',
+            ),
+            models.Index(
+                fields=['-published_at', '-news'],
+                condition=models.Q(deleted_at__isnull=True, is_published=True),
+                name='newscard_live_published_idx',
+            ),
+            models.Index(fields=['category_id', '-created_at', '-news'], name='newscard_category_idx'),
+            models.Index(fields=['author_id', '-created_at', '-news'], name='newscard_author_idx'),
+        ]
+
+    def __str__(self):
+        return self.payload.get('title', '')
+
+
+class DailyStat(models.Model):
+    """
+    Per day (UTC), category and author: published news and comments they
+    received. Maintained by triggers (apps.news.stats); 0 stands for
+    "no category" / "no author" so the unique key has no NULLs.
+    """
+    day = models.DateField()
+    category_id = models.BigIntegerField(default=0)
+    author_id = models.BigIntegerField(default=0)
+    published = models.IntegerField(default=0)
+    comments = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category_id', 'author_id'], name='dailystat_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['category_id', 'day'], name='dailystat_category_idx'),
+            models.Index(fields=['author_id', 'day'], name='dailystat_author_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} c{self.category_id} a{self.author_id}: {self.published}/{self.comments}"
+
+
+class DailyCommenter(models.Model):
+    """Live comments per day, category, author and commenting user."""
+    day = models.DateField()
+    category_id = models.BigIntegerField(default=0)
+    author_id = models.BigIntegerField(default=0)
+    user_id = models.BigIntegerField()
+    comments = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'category_id', 'author_id', 'user_id'],
+                name='dailycommenter_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['category_id', 'day'], name='dailycommenter_category_idx'),
+            models.Index(fields=['author_id', 'day'], name='dailycommenter_author_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} u{self.user_id}: {self.comments}"
+
+
+class NewsTermStat(models.Model):
+    """Number of indexed news whose vocabulary holds ``term`` (apps.news.related)."""
+    term = models.CharField(max_length=64, primary_key=True)
+    df = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.term}: {self.df}"
+
+
+class NewsTerm(models.Model):
+    """One non-zero entry of a news' normalised TF-IDF vector."""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=64)
+    weight = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'news'], name='newsterm_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.news_id} {self.term}: {self.weight:.3f}"
+
+
+class RelatedNews(models.Model):
+    """The most similar news of a news, ranked from 0."""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='related_news')
+    related = models.ForeignKey(News, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['news', 'rank'], name='relatednews_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.news_id} -> {self.related_id}: {self.score:.3f}"
+
+
+class NewsFingerprint(models.Model):
+    """
+    64-bit SimHash of a news' content (apps.news.duplicates), stored
+    signed, and its four 16-bit bands, each indexed for exact lookup.
+    """
+    news = models.OneToOneField(News, on_delete=models.CASCADE, primary_key=True, related_name='fingerprint')
+    simhash = models.BigIntegerField()
+    band_0 = models.PositiveIntegerField()
+    band_1 = models.PositiveIntegerField()
+    band_2 = models.PositiveIntegerField()
+    band_3 = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['band_0'], name='newsfingerprint_band_0_idx'),
+            models.Index(fields=['band_1'], name='newsfingerprint_band_1_idx'),
+            models.Index(fields=['band_2'], name='newsfingerprint_band_2_idx'),
+            models.Index(fields=['band_3'], name='newsfingerprint_band_3_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.news_id}: {self.simhash & (2 ** 64 - 1):016x}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of a legacy import (apps.news.imports), keyed by its
+    checkpoint path and written in the transaction of each flushed batch.
+    """
+    name = models.CharField(max_length=255, primary_key=True)
+    state = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.name}: byte {self.state.get('offset')}"
@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from apps.accounts.principals import get_principal
+
 
 class IsAuthorOrReadOnly(permissions.BasePermission):
 
@@ -7,10 +9,11 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        return hasattr(request.user, 'author_profile') and request.user.is_authenticated
+        return get_principal(request).is_author
 
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        return hasattr(request.user, 'author_profile') and obj.author.user == request.user
\ No newline at end of file
+        principal = get_principal(request)
+        return principal.is_author and obj.author_id == principal.author_id
\ No newline at end of file
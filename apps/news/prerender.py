@@ -0,0 +1,251 @@
+"""
+Pre-rendered HTML of the public news pages.
+
+Anonymous readers all get the same news_detail, news_list and
+news_by_category HTML (for the lists, their first page). So these pages
+are rendered once into ARTIFACTS_ROOT/pages, and PrerenderedPageMiddleware
+serves the files to anonymous GETs without touching the ORM or the
+template engine.
+
+A page is marked stale, after commit, when one of its news is published,
+edited, unpublished or deleted, when one of its comments changes and
+when its category is renamed: the commit only touches a ``<name>.stale``
+marker, as apps.news.feeds does. The next anonymous read of a stale or
+missing page renders it, so any number of changes in between cost one
+render. Pages the public can no longer see are replaced by an empty file
+rather than removed; they fall through to the view. Every file carries
+the time its render started as mtime and is current while newer than
+its marker, so a render that raced with a change is redone, and a render
+never overwrites a newer one. ``manage.py prerender_pages`` renders
+everything, e.g. after a deploy that changed the templates.
+"""
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpRequest
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from apps.abstracts.pagination import cursor_page
+
+from apps.comments import live
+from apps.comments.models import Comment
+from . import related
+from .models import Category, News
+
+DEFAULTS = {
+    "ENABLED": True,
+}
+
+
+def prerender_setting(name: str):
+    return getattr(settings, "PRERENDER", {}).get(name, DEFAULTS[name])
+
+
+def page_dir() -> Path:
+    return Path(settings.ARTIFACTS_ROOT) / "pages"
+
+
+def page_path(name: str) -> Path:
+    """``name`` is ``list``, ``news-<id>`` or ``category-<id>``."""
+    return page_dir() / f"{name}.html"
+
+
+def _marker(name: str) -> Path:
+    return page_dir() / f"{name}.stale"
+
+
+def _live_news():
+    return (
+        News.objects
+        .filter(is_published=True, deleted_at__isnull=True)
+        .select_related("author", "author__user", "category")
+    )
+
+
+def detail_context(news: News) -> dict:
+    comments = (
+        Comment.objects
+        .filter(
+            news=news,
+            deleted_at__isnull=True,
+            parent__isnull=True,
+        )
+        .select_related("user")
+        .prefetch_related("replies__user")
+        .order_by("created_at")
+    )
+    return {
+        "news": news,
+        "title": news.title,
+        "comments": comments,
+        "related_news": related.related_payloads(news.id),
+        "live_comments": live.live_setting("ENABLED"),
+    }
+
+
+# List pages show neither content nor anything else beyond the first page.
+LIST_ORDERING = ("-published_at", "-pk")
+
+
+def list_context(request) -> dict:
+    return {
+        "news": cursor_page(request, _live_news().defer("content"), LIST_ORDERING),
+        "title": "Все Новости",
+    }
+
+
+def category_context(request, category: Category) -> dict:
+    return {
+        "category": category,
+        "news": cursor_page(
+            request, _live_news().filter(category=category).defer("content"), LIST_ORDERING
+        ),
+        "title": f"Новости по категории: {category.name}",
+    }
+
+
+def _first_page_request(path: str) -> HttpRequest:
+    request = HttpRequest()
+    request.path = request.path_info = path
+    return request
+
+
+def _write(name: str, body: bytes, started: int) -> bool:
+    path = page_path(name)
+    try:
+        if path.stat().st_mtime_ns > started:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(body)
+    os.utime(tmp, ns=(started, started))
+    os.replace(tmp, path)
+    return True
+
+
+def _render(template: str, context: dict) -> bytes:
+    return render_to_string(template, context).encode()
+
+
+def render_detail(news_id: int, started: int) -> bool:
+    news = _live_news().filter(id=news_id).first()
+    if news is None:
+        # Drafts never had a page; a withdrawn one is blanked, not removed.
+        if not page_path(f"news-{news_id}").exists():
+            return False
+        return _write(f"news-{news_id}", b"", started)
+    return _write(f"news-{news_id}", _render("news_detail.html", detail_context(news)), started)
+
+
+def render_list(started: int) -> bool:
+    request = _first_page_request(reverse("news:news_list"))
+    return _write("list", _render("news_list.html", list_context(request)), started)
+
+
+def render_category(category_id: int, started: int) -> bool:
+    category = Category.objects.filter(id=category_id, deleted_at__isnull=True).first()
+    if category is None:
+        if not page_path(f"category-{category_id}").exists():
+            return False
+        return _write(f"category-{category_id}", b"", started)
+    request = _first_page_request(reverse("news:news_by_category", args=[category_id]))
+    body = _render("news_by_category.html", category_context(request, category))
+    return _write(f"category-{category_id}", body, started)
+
+
+def render(name: str, started: int) -> bool:
+    if name == "list":
+        return render_list(started)
+    kind, pk = name.split("-")
+    if kind == "news":
+        return render_detail(int(pk), started)
+    return render_category(int(pk), started)
+
+
+def _names(news_ids: Iterable[int] = (), keys: Iterable[str] = ()) -> list[str]:
+    """Pages of ``news_ids`` and of the apps.news.feeds keys ``news`` and ``category-<id>``."""
+    names = [f"news-{news_id}" for news_id in news_ids]
+    for key in keys:
+        if key == "news":
+            names.append("list")
+        elif key.startswith("category-"):
+            names.append(key)
+    return names
+
+
+def refresh(news_ids: Iterable[int] = (), keys: Iterable[str] = ()) -> int:
+    """
+    Re-renders the detail pages of ``news_ids`` and the list pages named
+    by apps.news.feeds keys (``news``, ``category-<id>``) right away;
+    returns how many files were written.
+    """
+    started = time.time_ns()
+    return sum(render(name, started) for name in _names(news_ids, keys))
+
+
+def invalidate(news_ids: Iterable[int] = (), keys: Iterable[str] = ()) -> None:
+    """Marks the pages of ``news_ids`` and ``keys`` (as for refresh()) stale."""
+    names = _names(news_ids, keys)
+    if names:
+        page_dir().mkdir(parents=True, exist_ok=True)
+    for name in names:
+        _marker(name).touch()
+
+
+def invalidate_on_commit(news_ids: Iterable[int] = (), keys: Iterable[str] = ()) -> None:
+    if not prerender_setting("ENABLED"):
+        return
+    news_ids, keys = list(news_ids), list(keys)
+    if news_ids or keys:
+        transaction.on_commit(lambda: invalidate(news_ids, keys))
+
+
+def invalidate_category_news(category_id: int) -> None:
+    """Marks the detail pages of every news of the category stale, e.g. after a rename."""
+    ids = News.objects.filter(category_id=category_id).order_by("id").values_list("id", flat=True)
+    invalidate(ids.iterator(chunk_size=2000))
+
+
+def _is_current(name: str) -> bool:
+    try:
+        built = page_path(name).stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    try:
+        return built > _marker(name).stat().st_mtime_ns
+    except FileNotFoundError:
+        return True
+
+
+def read(name: str) -> bytes | None:
+    """
+    The pre-rendered page, rendered first when stale or missing; None
+    when it must be rendered live.
+    """
+    if not _is_current(name):
+        render(name, time.time_ns())
+    try:
+        body = page_path(name).read_bytes()
+    except FileNotFoundError:
+        return None
+    return body or None
+
+
+def render_all(progress: Callable[[int], None] | None = None) -> int:
+    started = time.time_ns()
+    written = render_list(started)
+    for category_id in Category.objects.filter(deleted_at__isnull=True).values_list("id", flat=True):
+        written += render_category(category_id, started)
+    ids = _live_news().order_by("id").values_list("id", flat=True)
+    for done, news_id in enumerate(ids.iterator(), 1):
+        written += render_detail(news_id, started)
+        if progress and done % 500 == 0:
+            progress(done)
+    return written
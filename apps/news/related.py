@@ -0,0 +1,384 @@
+"""
+Related news from TF-IDF similarity.
+
+The vocabulary of a news is its MAX_TERMS most frequent terms (title
+words count twice). Each live, published news is stored in NewsTerm as a
+sparse vector over its vocabulary: sublinear tf times smoothed idf,
+L2-normalised. NewsTermStat holds how many indexed news have a term in
+their vocabulary. The cosine similarities of a news are the sparse
+product of its vector with the term postings (every other vector
+sharing a term). Its TOP_K nearest neighbours are stored in RelatedNews,
+so serving them is a single indexed read.
+
+build() recomputes everything in batches. index_news() folds articles
+in or out incrementally. It weighs them with the current frequencies,
+ranks their neighbours and offers them to those neighbours' lists. The
+lists an article leaves are re-ranked from the remaining vectors, so
+they do not shrink. The weights of other news are left as they are, so
+they drift slowly as the corpus grows until the next build().
+
+Saves only call index_on_commit(): the reindex runs on the background
+worker (apps.abstracts.background) once the saving transaction
+committed, and a failure there is logged, not raised.
+"""
+import heapq
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from apps.abstracts import background
+from apps.abstracts.models import RowCount
+from .models import News, NewsTerm, NewsTermStat, RelatedNews
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "TOP_K": 5,
+    "MAX_TERMS": 64,
+    # Terms in more vocabularies than this are too common to find
+    # neighbours by; they still count towards the similarity.
+    "MAX_POSTINGS": 5000,
+    "MIN_SCORE": 0.05,
+    "BATCH_SIZE": 500,
+}
+
+DOCUMENTS = "news_related|documents"
+
+TITLE_WEIGHT = 2
+TERM_LENGTH = NewsTerm._meta.get_field("term").max_length
+
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+
+STOPWORDS = frozenset("""
+    and are but for from has have its not that the their there this was
+    were which with will would been into than then them they what when
+    about also more most other some such only over after before
+    без был была были было быть вам вас ведь весь во все всех вот всё
+    где для его ее если есть еще ещё её же за здесь из или им их как
+    когда кто ли между мне может мы на над надо наш не него нее нет ни
+    них но ну об однако он она они оно от очень по под при про раз с
+    сам свою себя так также такой там те тем то того тоже только том
+    тот тут ты уже хотя чего чем что чтобы эта эти это этого этой этом
+    этот
+""".split())
+
+
+def related_setting(name: str):
+    return getattr(settings, "RELATED", {}).get(name, DEFAULTS[name])
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token[:TERM_LENGTH]
+        for token in TOKEN_RE.findall(text.lower().replace("ё", "е"))
+        if token not in STOPWORDS
+    ]
+
+
+def vocabulary(title: str, content: str) -> dict[str, int]:
+    """Term frequencies of the MAX_TERMS most frequent terms."""
+    counts = Counter(tokenize(content or ""))
+    for token in tokenize(title or ""):
+        counts[token] += TITLE_WEIGHT
+    return dict(counts.most_common(related_setting("MAX_TERMS")))
+
+
+def weigh(counts: dict[str, int], df, documents: int) -> dict[str, float]:
+    weights = {
+        term: (1 + math.log(n)) * (math.log((1 + documents) / (1 + df.get(term, 0))) + 1)
+        for term, n in counts.items()
+    }
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {term: w / norm for term, w in weights.items()}
+
+
+def similar(vector: dict[str, float], postings, exclude: int, limit: int) -> list[tuple[float, int]]:
+    """The ``limit`` best ``(score, news_id)`` over ``postings`` (term -> [(id, weight)])."""
+    scores: dict[int, float] = defaultdict(float)
+    for term, weight in vector.items():
+        for other, other_weight in postings.get(term, ()):
+            scores[other] += weight * other_weight
+    scores.pop(exclude, None)
+    min_score = related_setting("MIN_SCORE")
+    return heapq.nlargest(
+        limit,
+        ((score, pk) for pk, score in scores.items() if score >= min_score),
+    )
+
+
+def related_payloads(news_id: int) -> list[dict]:
+    """Card payloads of the related news of ``news_id``, best first."""
+    return list(
+        RelatedNews.objects
+        .filter(
+            news_id=news_id,
+            related__card__is_published=True,
+            related__card__deleted_at__isnull=True,
+        )
+        .order_by("rank")
+        .values_list("related__card__payload", flat=True)
+    )
+
+
+def _live():
+    return News.objects.filter(is_published=True, deleted_at__isnull=True)
+
+
+def _iter_live(*fields, first_id: int = 0, last_id: int | None = None):
+    qs = _live()
+    if last_id is not None:
+        qs = qs.filter(id__lte=last_id)
+    cursor = first_id - 1
+    batch_size = related_setting("BATCH_SIZE")
+    while True:
+        rows = list(
+            qs.filter(id__gt=cursor)
+            .order_by("id")
+            .values_list("id", *fields)[:batch_size]
+        )
+        if not rows:
+            return
+        yield from rows
+        cursor = rows[-1][0]
+
+
+def _ranked(news_id: int, neighbours) -> list[RelatedNews]:
+    return [
+        RelatedNews(news_id=news_id, related_id=pk, rank=rank, score=score)
+        for rank, (score, pk) in enumerate(neighbours)
+    ]
+
+
+def _documents() -> int:
+    return RowCount.objects.filter(name=DOCUMENTS).values_list("value", flat=True).first() or 0
+
+
+def _add_documents(delta: int) -> None:
+    if not RowCount.objects.filter(name=DOCUMENTS).update(value=F("value") + delta):
+        RowCount.objects.create(name=DOCUMENTS, value=max(delta, 0))
+
+
+def _add_df(delta: Counter) -> None:
+    existing = {stat.term: stat for stat in NewsTermStat.objects.filter(term__in=delta)}
+    new = []
+    for term, n in delta.items():
+        if term in existing:
+            existing[term].df += n
+        elif n > 0:
+            new.append(NewsTermStat(term=term, df=n))
+    NewsTermStat.objects.bulk_update(existing.values(), ["df"])
+    NewsTermStat.objects.bulk_create(new)
+    NewsTermStat.objects.filter(term__in=delta, df__lte=0).delete()
+
+
+def build(progress=None) -> int:
+    """Rebuilds vectors, frequencies and neighbour lists; returns how many news were indexed."""
+    top_k = related_setting("TOP_K")
+    batch_size = related_setting("BATCH_SIZE")
+    with transaction.atomic():
+        RelatedNews.objects.all().delete()
+        NewsTerm.objects.all().delete()
+        NewsTermStat.objects.all().delete()
+
+        vocabularies = {pk: vocabulary(title, content) for pk, title, content in _iter_live("title", "content")}
+        df = Counter()
+        for counts in vocabularies.values():
+            df.update(counts.keys())
+        documents = len(vocabularies)
+        vectors = {pk: weigh(counts, df, documents) for pk, counts in vocabularies.items()}
+        del vocabularies
+
+        NewsTermStat.objects.bulk_create(
+            (NewsTermStat(term=term, df=n) for term, n in df.items()),
+            batch_size=batch_size,
+        )
+        NewsTerm.objects.bulk_create(
+            (
+                NewsTerm(news_id=pk, term=term, weight=weight)
+                for pk, vector in vectors.items()
+                for term, weight in vector.items()
+            ),
+            batch_size=batch_size,
+        )
+        RowCount.objects.update_or_create(name=DOCUMENTS, defaults={"value": documents})
+
+        max_postings = related_setting("MAX_POSTINGS")
+        postings = defaultdict(list)
+        for pk, vector in vectors.items():
+            for term, weight in vector.items():
+                if df[term] <= max_postings:
+                    postings[term].append((pk, weight))
+
+        ids = sorted(vectors)
+        for start in range(0, len(ids), batch_size):
+            rows = []
+            for pk in ids[start:start + batch_size]:
+                rows.extend(_ranked(pk, similar(vectors[pk], postings, pk, top_k)))
+            RelatedNews.objects.bulk_create(rows)
+            if progress:
+                progress(min(start + batch_size, len(ids)), len(ids))
+    return documents
+
+
+def _postings(terms, df) -> dict[str, list[tuple[int, float]]]:
+    max_postings = related_setting("MAX_POSTINGS")
+    searchable = [term for term in terms if df.get(term, 0) <= max_postings]
+    postings = defaultdict(list)
+    for pk, term, weight in NewsTerm.objects.filter(term__in=searchable).values_list(
+        "news_id", "term", "weight"
+    ):
+        postings[term].append((pk, weight))
+    return postings
+
+
+def rerank(news_ids) -> None:
+    """Recomputes the neighbour lists of indexed news from the stored vectors."""
+    vectors = defaultdict(dict)
+    for pk, term, weight in NewsTerm.objects.filter(news_id__in=news_ids).values_list(
+        "news_id", "term", "weight"
+    ):
+        vectors[pk][term] = weight
+    terms = {term for vector in vectors.values() for term in vector}
+    df = dict(NewsTermStat.objects.filter(term__in=terms).values_list("term", "df"))
+    postings = _postings(terms, df)
+    top_k = related_setting("TOP_K")
+    rows = []
+    for pk, vector in vectors.items():
+        rows.extend(_ranked(pk, similar(vector, postings, pk, top_k)))
+    RelatedNews.objects.filter(news_id__in=news_ids).delete()
+    RelatedNews.objects.bulk_create(rows)
+
+
+def remove_news(news_ids) -> None:
+    """
+    Takes news out of the index and out of every neighbour list; the lists
+    they leave are re-ranked without them.
+    """
+    news_ids = list(news_ids)
+    with transaction.atomic():
+        entries = list(NewsTerm.objects.filter(news_id__in=news_ids).values_list("news_id", "term"))
+        if entries:
+            _add_df(Counter({term: -n for term, n in Counter(term for _, term in entries).items()}))
+            _add_documents(-len({pk for pk, _ in entries}))
+            NewsTerm.objects.filter(news_id__in=news_ids).delete()
+        neighbours = set(
+            RelatedNews.objects
+            .filter(related_id__in=news_ids)
+            .exclude(news_id__in=news_ids)
+            .values_list("news_id", flat=True)
+        )
+        RelatedNews.objects.filter(news_id__in=news_ids).delete()
+        RelatedNews.objects.filter(related_id__in=news_ids).delete()
+        if neighbours:
+            rerank(neighbours)
+
+
+def index_news(news_ids, instances=None) -> int:
+    """
+    (Re)indexes the given news, or removes those no longer live; returns
+    how many were indexed. ``instances``, when given, are the current
+    rows and are not read again.
+    """
+    news_ids = list(news_ids)
+    top_k = related_setting("TOP_K")
+    if instances is not None:
+        rows = [
+            (item.pk, item.title, item.content)
+            for item in instances
+            if item.is_published and item.deleted_at is None
+        ]
+    else:
+        rows = _live().filter(id__in=news_ids).values_list("id", "title", "content")
+    with transaction.atomic():
+        remove_news(news_ids)
+        vocabularies = {pk: vocabulary(title, content) for pk, title, content in rows}
+        if not vocabularies:
+            return 0
+
+        _add_df(Counter(term for counts in vocabularies.values() for term in counts))
+        _add_documents(len(vocabularies))
+        terms = {term for counts in vocabularies.values() for term in counts}
+        df = dict(NewsTermStat.objects.filter(term__in=terms).values_list("term", "df"))
+        documents = _documents()
+        vectors = {pk: weigh(counts, df, documents) for pk, counts in vocabularies.items()}
+        NewsTerm.objects.bulk_create(
+            NewsTerm(news_id=pk, term=term, weight=weight)
+            for pk, vector in vectors.items()
+            for term, weight in vector.items()
+        )
+
+        postings = _postings(terms, df)
+
+        own, offers = [], defaultdict(list)
+        for pk, vector in vectors.items():
+            # Similarity is symmetric: the news may also belong among the
+            # best of its own nearest candidates.
+            candidates = similar(vector, postings, pk, top_k * 4)
+            own.extend(_ranked(pk, candidates[:top_k]))
+            for score, other in candidates:
+                if other not in vectors:
+                    offers[other].append((score, pk))
+
+        current = defaultdict(list)
+        for row in RelatedNews.objects.filter(news_id__in=offers).only("news_id", "related_id", "score"):
+            current[row.news_id].append((row.score, row.related_id))
+        updated = []
+        for other, offered in offers.items():
+            best = heapq.nlargest(top_k, current[other] + offered, key=itemgetter(0))
+            if best != sorted(current[other], key=itemgetter(0), reverse=True):
+                updated.append(other)
+                own.extend(_ranked(other, best))
+        RelatedNews.objects.filter(news_id__in=updated).delete()
+        RelatedNews.objects.bulk_create(own)
+    return len(vectors)
+
+
+def index_range(first_id: int, last_id: int) -> int:
+    """Folds in the live news with ids in ``[first_id, last_id]``, in batches."""
+    indexed = 0
+    batch = []
+    for pk, in _iter_live(first_id=first_id, last_id=last_id):
+        batch.append(pk)
+        if len(batch) >= related_setting("BATCH_SIZE"):
+            indexed += index_news(batch)
+            batch = []
+    if batch:
+        indexed += index_news(batch)
+    return indexed
+
+
+def _listed_by(news_ids) -> set[int]:
+    return set(
+        RelatedNews.objects.filter(related_id__in=news_ids).values_list("news_id", flat=True)
+    )
+
+
+def _index_committed(news_ids, refresh_pages=None) -> None:
+    try:
+        # Lists the news leave and lists they join both changed.
+        changed = _listed_by(news_ids)
+        index_news(news_ids)
+        changed |= _listed_by(news_ids) | set(news_ids)
+    except Exception:
+        # The index only feeds "related news"; the next build_related repairs it.
+        logger.exception("Failed to index related news %s", news_ids)
+        return
+    if refresh_pages is not None and changed:
+        refresh_pages(sorted(changed))
+
+
+def index_on_commit(news_ids, refresh_pages=None) -> None:
+    """
+    (Re)indexes ``news_ids`` in the background once the current
+    transaction commits, then passes them and the news whose neighbour
+    lists changed to ``refresh_pages``.
+    """
+    news_ids = list(news_ids)
+    if news_ids:
+        background.submit_on_commit(_index_committed, news_ids, refresh_pages)
@@ -1,3 +1,6 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 from rest_framework.serializers import (
     ModelSerializer,
@@ -6,17 +9,40 @@ from rest_framework.serializers import (
     IntegerField,
     BooleanField,
     DateField,
+    DateTimeField,
+    CharField,
+    ChoiceField,
+    ListField,
 )
 
+from .changes import changes_setting, decode_token
+from .filters import DEFAULT_ORDERING, ORDERINGS
 from .models import News, Category
 from apps.accounts.models import Author
 
+class IntegerListField(ListField):
+    """Integers given repeated (``?id=1&id=2``) or comma separated (``?id=1,2``)."""
+    child = IntegerField(min_value=1)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        data = [
+            part for value in data for part in str(value).split(",") if part.strip()
+        ]
+        return super().to_internal_value(data)
+
 class NewsQueryParamsSerializer(Serializer):
-    category_id = IntegerField(required=False)
-    author_id = IntegerField(required=False)
-    is_published = BooleanField(required=False)
+    MAX_IDS = 50
+
+    category_id = IntegerListField(required=False, max_length=MAX_IDS)
+    author_id = IntegerListField(required=False, max_length=MAX_IDS)
+    # allow_null keeps a missing value None instead of the False that form
+    # input would otherwise default a BooleanField to.
+    is_published = BooleanField(required=False, allow_null=True)
     date_from = DateField(required=False)
     date_to = DateField(required=False)
+    ordering = ChoiceField(choices=ORDERINGS, required=False, default=DEFAULT_ORDERING)
 
     def validate(self, attrs):
         if (
@@ -29,6 +55,50 @@ class NewsQueryParamsSerializer(Serializer):
             })
         return attrs
 
+class ExportQueryParamsSerializer(Serializer):
+    fmt = ChoiceField(choices=("ndjson", "csv"), required=False, default="ndjson")
+    since = DateTimeField(required=False)
+
+class StatsQueryParamsSerializer(Serializer):
+    MAX_RANGE_DAYS = 366
+
+    date_from = DateField(required=False)
+    date_to = DateField(required=False)
+    group_by = ChoiceField(choices=("day", "category", "author", "none"), required=False, default="day")
+    category_id = IntegerField(required=False)
+    author_id = IntegerField(required=False)
+
+    def validate(self, attrs):
+        date_to = attrs.get("date_to") or timezone.now().date()
+        date_from = attrs.get("date_from") or date_to - timedelta(days=29)
+        if date_from > date_to:
+            raise ValidationError({
+                "date_from": "date_from cannot be greater than date_to"
+            })
+        if (date_to - date_from).days >= self.MAX_RANGE_DAYS:
+            raise ValidationError({
+                "date_from": f"Range cannot exceed {self.MAX_RANGE_DAYS} days"
+            })
+        attrs["date_from"], attrs["date_to"] = date_from, date_to
+        return attrs
+
+class ChangesQueryParamsSerializer(Serializer):
+    since = CharField(required=False)
+    limit = IntegerField(required=False, min_value=1)
+
+    def validate_since(self, value):
+        try:
+            return decode_token(value)
+        except ValueError:
+            raise ValidationError("Invalid or expired token")
+
+    def validate_limit(self, value):
+        return min(value, changes_setting("MAX_PAGE_SIZE"))
+
+class TrendingQueryParamsSerializer(Serializer):
+    category_id = IntegerField(required=False)
+    limit = IntegerField(required=False, default=20, min_value=1, max_value=100)
+
 class CategoryListSerializer(ModelSerializer):
     published_news_count = IntegerField(read_only=True)
 
@@ -72,6 +142,24 @@ class NewsListSerializer(ModelSerializer):
         return obj.category.name if obj.category else None
 
 
+class NewsCardSerializer(NewsListSerializer):
+    image = SerializerMethodField()
+
+    class Meta:
+        model = News
+        fields = NewsListSerializer.Meta.fields + (
+            "category_id",
+            "image",
+            "published_at",
+            "updated_at",
+        )
+
+    def get_image(self, obj: News):
+        if not obj.image:
+            return None
+        return {"original": obj.image.url}
+
+
 class NewsDetailSerializer(ModelSerializer):
     author = AuthorForeignSerializer(read_only=True)
 
@@ -85,6 +173,7 @@ class NewsDetailSerializer(ModelSerializer):
             "author",
             "category",
             "is_published",
+            "views_count",
             "published_at",
             "created_at",
             "updated_at",
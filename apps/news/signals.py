@@ -0,0 +1,260 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from apps.abstracts import background
+from apps.accounts import profiles
+from apps.accounts.models import Author
+from apps.comments.models import Comment
+from . import duplicates, feeds, prerender, related, trending
+from .cards import (
+    build_cards,
+    write_cards,
+    build_cards_in_range,
+    refresh_stale_author,
+    refresh_stale_category,
+)
+from .models import Category, News
+
+User = get_user_model()
+
+# News fields the related-news index depends on.
+RELATED_FIELDS = {"title", "content", "is_published", "deleted_at"}
+
+# News fields deciding whether the public sees a news and its comments.
+VISIBILITY_FIELDS = {"is_published", "deleted_at"}
+
+# Sent after a bulk import finished inserting rows with bulk_create(), which
+# skips post_save. Receivers rebuild whatever they derive from News/Comment
+# for the given inclusive id ranges (either may be None).
+#   kwargs: news_ids: tuple[int, int] | None, comment_ids: tuple[int, int] | None
+content_imported = Signal()
+
+# Sent after News rows were changed with QuerySet.update(), which skips
+# post_save. ``fields`` are the model fields that were written; senders
+# that re-read the rows (joined with author, author__user and category)
+# pass them as ``instances`` so receivers need not load them again.
+#   kwargs: news_ids: list[int], fields: set[str], instances: list[News] | None
+news_updated = Signal()
+
+# Sent after buffered article views were written to the database.
+#   kwargs: counts: dict[int, int] (news id -> views added)
+views_flushed = Signal()
+
+
+def _author_ids(keys) -> set[int]:
+    """Authors whose feeds are among ``keys``: their profiles changed too."""
+    return {int(key.removeprefix("author-")) for key in keys if key.startswith("author-")}
+
+
+def _invalidate_related_pages(news_ids) -> None:
+    if prerender.prerender_setting("ENABLED"):
+        prerender.invalidate(news_ids)
+
+
+# Pages rendered before the reindex finished show the old related news,
+# so the indexed news and the neighbours whose lists changed are marked
+# stale again after it.
+@receiver(post_save, sender=News)
+def index_related_news(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & RELATED_FIELDS:
+        return
+    related.index_on_commit([instance.pk], _invalidate_related_pages)
+
+
+@receiver(news_updated)
+def index_updated_related(sender, news_ids, fields, instances=None, **kwargs):
+    if fields & RELATED_FIELDS:
+        related.index_on_commit(news_ids, _invalidate_related_pages)
+
+
+# These come before refresh_news_card/refresh_updated_cards: listed_keys()
+# reads the cards as they were before those rewrite them.
+@receiver(post_save, sender=News)
+def refresh_saved_artifacts(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    keys = set()
+    if update_fields is None or set(update_fields) & feeds.FEED_FIELDS:
+        keys = feeds.listed_keys([instance.pk]) | feeds.current_keys([instance])
+        feeds.invalidate_on_commit(keys)
+        profiles.invalidate_on_commit(_author_ids(keys))
+    prerender.invalidate_on_commit([instance.pk], keys)
+
+
+@receiver(news_updated)
+def refresh_updated_artifacts(sender, news_ids, fields, instances=None, **kwargs):
+    keys = set()
+    if fields & feeds.FEED_FIELDS:
+        if instances is None:
+            instances = News.objects.filter(id__in=news_ids).only(
+                "id", "category_id", "author_id", "published_at", "is_published", "deleted_at"
+            )
+        keys = feeds.listed_keys(news_ids) | feeds.current_keys(instances)
+        feeds.invalidate_on_commit(keys)
+        profiles.invalidate_on_commit(_author_ids(keys))
+    prerender.invalidate_on_commit(news_ids, keys)
+
+
+@receiver(post_save, sender=News)
+def refresh_news_card(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    build_cards([instance.pk])
+    trending.sync_news(instance)
+
+
+@receiver(news_updated)
+def refresh_updated_cards(sender, news_ids, instances=None, **kwargs):
+    if instances is not None:
+        write_cards(instances)
+    else:
+        build_cards(news_ids)
+
+
+@receiver(post_save, sender=News)
+def fingerprint_saved_news(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and "content" not in update_fields:
+        return
+    duplicates.fingerprint_news([instance])
+
+
+@receiver(news_updated)
+def fingerprint_updated_news(sender, news_ids, fields, instances=None, **kwargs):
+    if "content" not in fields:
+        return
+    if instances is None:
+        instances = News.objects.filter(id__in=news_ids).only("id", "content")
+    duplicates.fingerprint_news(instances)
+
+
+@receiver(news_updated)
+def sync_updated_trending(sender, news_ids, fields, **kwargs):
+    if fields & {"is_published", "category", "deleted_at"}:
+        trending.sync_news_ids(news_ids)
+
+
+def _touch_comments(news_ids) -> None:
+    # Comments follow their news in and out of the changes feed
+    # (apps.news.changes), which only sees rows with a new updated_at.
+    Comment.objects.filter(news_id__in=news_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=News)
+def touch_comments_of_saved_news(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    if instance.changed_fields() & VISIBILITY_FIELDS:
+        _touch_comments([instance.pk])
+
+
+@receiver(news_updated)
+def touch_comments_of_updated_news(sender, news_ids, fields, **kwargs):
+    if fields & VISIBILITY_FIELDS:
+        _touch_comments(news_ids)
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_cards(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    refresh_stale_category(instance.pk, instance.name)
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_feed(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    feeds.invalidate_on_commit({f"category-{instance.pk}"})
+    # The name shows on the list pages and on the pages of its news.
+    prerender.invalidate_on_commit(keys=["news", f"category-{instance.pk}"])
+    if prerender.prerender_setting("ENABLED"):
+        background.submit_on_commit(prerender.invalidate_category_news, instance.pk)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feed(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and "username" not in update_fields:
+        return
+    author_id = Author.objects.filter(user_id=instance.pk).values_list("id", flat=True).first()
+    if author_id is not None:
+        feeds.invalidate_on_commit({f"author-{author_id}"})
+
+
+@receiver(post_save, sender=User)
+def refresh_user_cards(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and "email" not in update_fields:
+        return
+    author_id = Author.objects.filter(user_id=instance.pk).values_list("id", flat=True).first()
+    if author_id is not None:
+        refresh_stale_author(author_id, instance.email)
+
+
+@receiver(post_save, sender=Comment)
+def score_new_comment(sender, instance, raw=False, created=False, **kwargs):
+    if raw or not created:
+        return
+    trending.record_comment_on_commit(instance.news_id, instance.created_at)
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_commented_news_page(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    prerender.invalidate_on_commit([instance.news_id])
+
+
+@receiver(views_flushed)
+def score_views(sender, counts, **kwargs):
+    trending.record_views(counts)
+
+
+@receiver(content_imported)
+def build_imported_cards(sender, news_ids=None, **kwargs):
+    if news_ids is None:
+        return
+    build_cards_in_range(*news_ids)
+
+
+@receiver(content_imported)
+def fingerprint_imported_news(sender, news_ids=None, **kwargs):
+    if news_ids is None:
+        return
+    duplicates.fingerprint_range(*news_ids)
+
+
+@receiver(content_imported)
+def index_imported_related(sender, news_ids=None, **kwargs):
+    if news_ids is None:
+        return
+    related.index_range(*news_ids)
+
+
+@receiver(content_imported)
+def invalidate_imported_feeds(sender, news_ids=None, **kwargs):
+    if news_ids is None:
+        return
+    keys = feeds.range_keys(*news_ids)
+    feeds.invalidate_on_commit(keys)
+    profiles.invalidate_on_commit(_author_ids(keys))
+    # Detail pages of imported news are rendered live until prerender_pages runs.
+    prerender.invalidate_on_commit(keys=keys)
+
+
+@receiver(content_imported)
+def score_imported_comments(sender, comment_ids=None, **kwargs):
+    if comment_ids is None:
+        return
+    window = timedelta(hours=trending.trending_setting("HALF_LIFE_HOURS") * 10)
+    trending.backfill_comments(*comment_ids, since=timezone.now() - window)
@@ -0,0 +1,214 @@
+"""
+Daily statistics rollups.
+
+DailyStat holds per day, category and author the number of published
+news and of comments they received; DailyCommenter holds live comments
+per commenting user within the same grouping, so "active commenters"
+over any range is a COUNT(DISTINCT user_id) over few rows. Both are kept
+up to date by SQLite triggers on news_news and comments_comment, which
+also see bulk updates and imports. A news counts as published on the
+(UTC) day of its published_at (stamped when a draft goes live) while it
+is published and not deleted; a
+comment counts on the day it was written, for the category and author
+its news had at that time.
+"""
+from datetime import date
+
+from django.db import connection, migrations, transaction
+from django.db.models import Count, Sum
+
+from apps.comments.models import Comment
+from .models import DailyCommenter, DailyStat, News
+
+CHUNK_SIZE = 5000
+
+GROUPS = {
+    "day": "day",
+    "category": "category_id",
+    "author": "author_id",
+}
+
+STAT = DailyStat._meta.db_table
+COMMENTER = DailyCommenter._meta.db_table
+NEWS = News._meta.db_table
+COMMENT = Comment._meta.db_table
+
+
+def _news_bump(row: str, delta: int) -> str:
+    return (
+        f"INSERT INTO {STAT}(day, category_id, author_id, published, comments) "
+        f"SELECT date({row}.published_at), IFNULL({row}.category_id, 0), "
+        f"IFNULL({row}.author_id, 0), {delta}, 0 "
+        f"WHERE {row}.is_published AND {row}.deleted_at IS NULL "
+        f"ON CONFLICT(day, category_id, author_id) "
+        f"DO UPDATE SET published = published + excluded.published;"
+    )
+
+
+def _comment_bump(row: str, delta: int, condition: str) -> str:
+    source = (
+        f"FROM {NEWS} AS n WHERE n.id = {row}.news_id AND {condition}"
+    )
+    group = f"date({row}.created_at), IFNULL(n.category_id, 0), IFNULL(n.author_id, 0)"
+    return (
+        f"INSERT INTO {STAT}(day, category_id, author_id, published, comments) "
+        f"SELECT {group}, 0, {delta} {source} "
+        f"ON CONFLICT(day, category_id, author_id) "
+        f"DO UPDATE SET comments = comments + excluded.comments; "
+        f"INSERT INTO {COMMENTER}(day, category_id, author_id, user_id, comments) "
+        f"SELECT {group}, {row}.user_id, {delta} {source} "
+        f"ON CONFLICT(day, category_id, author_id, user_id) "
+        f"DO UPDATE SET comments = comments + excluded.comments; "
+        f"DELETE FROM {COMMENTER} WHERE user_id = {row}.user_id "
+        f"AND day = date({row}.created_at) AND comments <= 0;"
+    )
+
+
+def news_trigger_sql() -> list[str]:
+    columns = "is_published, deleted_at, category_id, author_id, published_at"
+    return [
+        f"CREATE TRIGGER {NEWS}_stats_ai AFTER INSERT ON {NEWS} "
+        f"BEGIN {_news_bump('new', 1)} END",
+        f"CREATE TRIGGER {NEWS}_stats_ad AFTER DELETE ON {NEWS} "
+        f"BEGIN {_news_bump('old', -1)} END",
+        f"CREATE TRIGGER {NEWS}_stats_au AFTER UPDATE OF {columns} ON {NEWS} "
+        f"BEGIN {_news_bump('old', -1)} {_news_bump('new', 1)} END",
+    ]
+
+
+def comment_trigger_sql() -> list[str]:
+    return [
+        f"CREATE TRIGGER {COMMENT}_stats_ai AFTER INSERT ON {COMMENT} "
+        f"BEGIN {_comment_bump('new', 1, 'new.deleted_at IS NULL')} END",
+        f"CREATE TRIGGER {COMMENT}_stats_ad AFTER DELETE ON {COMMENT} "
+        f"BEGIN {_comment_bump('old', -1, 'old.deleted_at IS NULL')} END",
+        f"CREATE TRIGGER {COMMENT}_stats_au AFTER UPDATE OF deleted_at, created_at, news_id, user_id "
+        f"ON {COMMENT} BEGIN "
+        f"{_comment_bump('old', -1, 'old.deleted_at IS NULL')} "
+        f"{_comment_bump('new', 1, 'new.deleted_at IS NULL')} "
+        f"END",
+    ]
+
+
+def trigger_migration_operations(table: str, statements) -> list:
+    """Migration operations installing rollup triggers on ``table`` (SQLite only)."""
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for sql in statements():
+                schema_editor.execute(sql)
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_stats_{suffix}")
+
+    return [migrations.RunPython(forwards, backwards)]
+
+
+_NEWS_BACKFILL = (
+    f"INSERT INTO {STAT}(day, category_id, author_id, published, comments) "
+    f"SELECT date(published_at), IFNULL(category_id, 0), IFNULL(author_id, 0), COUNT(*), 0 "
+    f"FROM {NEWS} WHERE id BETWEEN %s AND %s AND is_published AND deleted_at IS NULL "
+    f"GROUP BY 1, 2, 3 "
+    f"ON CONFLICT(day, category_id, author_id) "
+    f"DO UPDATE SET published = published + excluded.published"
+)
+
+_COMMENT_GROUP = (
+    f"FROM {COMMENT} AS c JOIN {NEWS} AS n ON n.id = c.news_id "
+    f"WHERE c.id BETWEEN %s AND %s AND c.deleted_at IS NULL "
+)
+
+_COMMENT_BACKFILL = (
+    f"INSERT INTO {STAT}(day, category_id, author_id, published, comments) "
+    f"SELECT date(c.created_at), IFNULL(n.category_id, 0), IFNULL(n.author_id, 0), 0, COUNT(*) "
+    f"{_COMMENT_GROUP} GROUP BY 1, 2, 3 "
+    f"ON CONFLICT(day, category_id, author_id) "
+    f"DO UPDATE SET comments = comments + excluded.comments"
+)
+
+_COMMENTER_BACKFILL = (
+    f"INSERT INTO {COMMENTER}(day, category_id, author_id, user_id, comments) "
+    f"SELECT date(c.created_at), IFNULL(n.category_id, 0), IFNULL(n.author_id, 0), c.user_id, COUNT(*) "
+    f"{_COMMENT_GROUP} GROUP BY 1, 2, 3, 4 "
+    f"ON CONFLICT(day, category_id, author_id, user_id) "
+    f"DO UPDATE SET comments = comments + excluded.comments"
+)
+
+
+def backfill(chunk_size: int = CHUNK_SIZE, progress=None) -> None:
+    """
+    Rebuilds both rollups from history in id-range chunks, in one
+    transaction so concurrent writes (and their triggers) wait for it.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {STAT}")
+        cursor.execute(f"DELETE FROM {COMMENTER}")
+
+        cursor.execute(f"SELECT MAX(id) FROM {NEWS}")
+        last_news = cursor.fetchone()[0] or 0
+        for first in range(1, last_news + 1, chunk_size):
+            cursor.execute(_NEWS_BACKFILL, [first, first + chunk_size - 1])
+            if progress:
+                progress("news", min(first + chunk_size - 1, last_news), last_news)
+
+        cursor.execute(f"SELECT MAX(id) FROM {COMMENT}")
+        last_comment = cursor.fetchone()[0] or 0
+        for first in range(1, last_comment + 1, chunk_size):
+            bounds = [first, first + chunk_size - 1]
+            cursor.execute(_COMMENT_BACKFILL, bounds)
+            cursor.execute(_COMMENTER_BACKFILL, bounds)
+            if progress:
+                progress("comments", min(first + chunk_size - 1, last_comment), last_comment)
+
+
+def _none_if_zero(row: dict) -> dict:
+    for field in ("category_id", "author_id"):
+        if field in row and row[field] == 0:
+            row[field] = None
+    return row
+
+
+def query(
+    date_from: date,
+    date_to: date,
+    group_by: str | None = "day",
+    category_id: int | None = None,
+    author_id: int | None = None,
+) -> dict:
+    """Sums over ``[date_from, date_to]``, per ``group_by`` and in total."""
+    filters = {"day__range": (date_from, date_to)}
+    if category_id is not None:
+        filters["category_id"] = category_id
+    if author_id is not None:
+        filters["author_id"] = author_id
+    stats = DailyStat.objects.filter(**filters)
+    commenters = DailyCommenter.objects.filter(comments__gt=0, **filters)
+
+    totals = stats.aggregate(published=Sum("published"), comments=Sum("comments"))
+    totals = {name: value or 0 for name, value in totals.items()}
+    totals["commenters"] = commenters.aggregate(n=Count("user_id", distinct=True))["n"]
+
+    results = []
+    if group_by:
+        field = GROUPS[group_by]
+        rows = {
+            row[field]: {**row, "commenters": 0}
+            for row in (
+                stats.values(field)
+                .annotate(published=Sum("published"), comments=Sum("comments"))
+                .order_by(field)
+            )
+        }
+        for row in (
+            commenters.values(field)
+            .annotate(n=Count("user_id", distinct=True))
+            .order_by()
+        ):
+            rows.setdefault(
+                row[field], {field: row[field], "published": 0, "comments": 0}
+            )["commenters"] = row["n"]
+        results = [_none_if_zero(rows[key]) for key in sorted(rows)]
+
+    return {"totals": totals, "results": results}
@@ -0,0 +1,255 @@
+"""
+Trending news ranking.
+
+Every engagement event adds ``weight * 2 ** (-age / half_life)`` to the
+score of a news. Instead of decaying all stored scores over time, each
+event is scaled *up* relative to a fixed EPOCH ("forward decay"): the
+relative order of scores never changes as time passes, so an event only
+touches its own row and the top N is an index scan on ``log_score``.
+Scores are kept as logarithms, which keeps the growing scale factor
+within float range indefinitely. Events are added in the UPDATE itself,
+so concurrent ones do not overwrite each other.
+"""
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Exp, Greatest, Least, Ln
+from django.utils import timezone
+
+from apps.comments.models import Comment
+from .models import News, NewsViewBucket, TrendingScore
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+DEFAULTS = {
+    "HALF_LIFE_HOURS": 12.0,
+    "COMMENT_WEIGHT": 3.0,
+    "VIEW_WEIGHT": 0.1,
+    "CACHE_TTL": 30.0,
+    "PRUNE_BELOW": 0.01,
+    "MAX_LIMIT": 100,
+}
+
+CHUNK_SIZE = 2000
+
+_cache: dict[tuple, tuple[float, list]] = {}
+_cache_lock = threading.Lock()
+
+
+def trending_setting(name: str):
+    return getattr(settings, "TRENDING", {}).get(name, DEFAULTS[name])
+
+
+def _rate() -> float:
+    return math.log(2) / (trending_setting("HALF_LIFE_HOURS") * 3600)
+
+
+def _log_weight(weight: float, at: datetime) -> float:
+    return math.log(weight) + _rate() * (at - EPOCH).total_seconds()
+
+
+def _logaddexp(a: float, b: float) -> float:
+    high, low = (a, b) if a >= b else (b, a)
+    return high + math.log1p(math.exp(low - high))
+
+
+def decayed_score(log_score: float, now: datetime | None = None) -> float:
+    """Score as of ``now`` in engagement units (comments weigh COMMENT_WEIGHT)."""
+    now = now or timezone.now()
+    return math.exp(log_score - _rate() * (now - EPOCH).total_seconds())
+
+
+def _add_log_weight(news_id: int, log_weight: float, now: datetime) -> int:
+    """logaddexp into the stored score in the UPDATE itself; returns rows matched."""
+    score, weight = F("log_score"), Value(log_weight, output_field=FloatField())
+    high, low = Greatest(score, weight), Least(score, weight)
+    return TrendingScore.objects.filter(news_id=news_id).update(
+        log_score=high + Ln(Value(1.0) + Exp(low - high)),
+        updated_at=now,
+    )
+
+
+def _merge(log_weights: dict[int, float]) -> None:
+    if not log_weights:
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        missing = [
+            news_id
+            for news_id, log_weight in log_weights.items()
+            if not _add_log_weight(news_id, log_weight, now)
+        ]
+        if not missing:
+            return
+        for news_id, category_id, is_published, deleted_at in (
+            News.objects
+            .filter(id__in=missing)
+            .values_list("id", "category_id", "is_published", "deleted_at")
+        ):
+            try:
+                with transaction.atomic():
+                    TrendingScore.objects.create(
+                        news_id=news_id,
+                        category_id=category_id,
+                        is_active=is_published and deleted_at is None,
+                        log_score=log_weights[news_id],
+                    )
+            except IntegrityError:
+                # Created concurrently since the UPDATE missed it.
+                _add_log_weight(news_id, log_weights[news_id], now)
+
+
+def bump_many(weights: dict[int, float], at: datetime | None = None) -> None:
+    at = at or timezone.now()
+    _merge({
+        news_id: _log_weight(weight, at)
+        for news_id, weight in weights.items()
+        if weight > 0
+    })
+
+
+def record_comment(news_id: int, at: datetime | None = None) -> None:
+    bump_many({news_id: trending_setting("COMMENT_WEIGHT")}, at)
+
+
+def _record_comment_committed(news_id: int, at: datetime) -> None:
+    try:
+        record_comment(news_id, at)
+    except Exception:
+        # A lost bump only lowers a score; the comment itself is saved.
+        logger.exception("Failed to score a comment on news %s", news_id)
+
+
+def record_comment_on_commit(news_id: int, at: datetime) -> None:
+    transaction.on_commit(lambda: _record_comment_committed(news_id, at))
+
+
+def record_views(counts: dict[int, int]) -> None:
+    weight = trending_setting("VIEW_WEIGHT")
+    bump_many({news_id: n * weight for news_id, n in counts.items()})
+
+
+def sync_news(news: News) -> None:
+    TrendingScore.objects.filter(news_id=news.id).update(
+        category_id=news.category_id,
+        is_active=news.is_published and news.deleted_at is None,
+    )
+
+
+def sync_news_ids(news_ids: list[int]) -> None:
+    """Like sync_news() for rows changed with QuerySet.update(), in one query."""
+    source = News.objects.filter(pk=OuterRef("news_id"))
+    TrendingScore.objects.filter(news_id__in=news_ids).update(
+        category_id=Subquery(source.values("category_id")[:1]),
+        is_active=Exists(source.filter(is_published=True, deleted_at__isnull=True)),
+    )
+
+
+def top(limit: int = 20, category_id: int | None = None) -> list[tuple[int, float]]:
+    """
+    ``(news_id, score)`` pairs of the top ``limit`` active news, best first.
+
+    Results are cached per process for CACHE_TTL seconds.
+    """
+    limit = max(1, min(limit, trending_setting("MAX_LIMIT")))
+    key = (category_id, limit)
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    qs = TrendingScore.objects.filter(is_active=True)
+    if category_id is not None:
+        qs = qs.filter(category_id=category_id)
+    current = timezone.now()
+    result = [
+        (news_id, decayed_score(log_score, current))
+        for news_id, log_score in qs.order_by("-log_score").values_list("news_id", "log_score")[:limit]
+    ]
+
+    with _cache_lock:
+        _cache[key] = (now + trending_setting("CACHE_TTL"), result)
+    return result
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def prune(now: datetime | None = None) -> int:
+    """
+    The periodic decay pass: drops news whose decayed score fell below
+    PRUNE_BELOW, keeping the ranking table limited to recent engagement.
+    """
+    now = now or timezone.now()
+    cutoff = _log_weight(trending_setting("PRUNE_BELOW"), now)
+    deleted = 0
+    for is_active in (True, False):
+        deleted += TrendingScore.objects.filter(
+            is_active=is_active,
+            log_score__lt=cutoff,
+        ).delete()[0]
+    clear_cache()
+    return deleted
+
+
+def backfill_comments(first_id: int, last_id: int, since: datetime | None = None) -> None:
+    """Folds comments with ids in ``[first_id, last_id]`` into the scores."""
+    weight = trending_setting("COMMENT_WEIGHT")
+    cursor = first_id - 1
+    while True:
+        rows = list(
+            Comment.objects
+            .filter(id__gt=cursor, id__lte=last_id, deleted_at__isnull=True)
+            .filter(**({"created_at__gte": since} if since else {}))
+            .order_by("id")
+            .values_list("id", "news_id", "created_at")[:CHUNK_SIZE]
+        )
+        if not rows:
+            return
+        logs: dict[int, float] = {}
+        for _, news_id, created_at in rows:
+            value = _log_weight(weight, created_at)
+            logs[news_id] = _logaddexp(logs[news_id], value) if news_id in logs else value
+        _merge(logs)
+        cursor = rows[-1][0]
+
+
+def rebuild(window_half_lives: int = 10) -> int:
+    """Recomputes all scores from recent comments and view buckets."""
+    now = timezone.now()
+    since = now - timedelta(hours=trending_setting("HALF_LIFE_HOURS") * window_half_lives)
+
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+
+        bounds = Comment.objects.filter(created_at__gte=since).values_list("id", flat=True)
+        first = bounds.order_by("id").first()
+        last = bounds.order_by("-id").first()
+        if first is not None:
+            backfill_comments(first, last, since)
+
+        view_weight = trending_setting("VIEW_WEIGHT")
+        logs: dict[int, float] = defaultdict(lambda: -math.inf)
+        for news_id, bucket_start, views in (
+            NewsViewBucket.objects
+            .filter(bucket_start__gte=since, views__gt=0)
+            .values_list("news_id", "bucket_start", "views")
+            .iterator(chunk_size=CHUNK_SIZE)
+        ):
+            logs[news_id] = _logaddexp(logs[news_id], _log_weight(views * view_weight, bucket_start))
+        _merge(dict(logs))
+
+    clear_cache()
+    return TrendingScore.objects.count()
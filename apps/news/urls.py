@@ -7,6 +7,8 @@ app_name = 'news'
 router = DefaultRouter()
 router.register(r'api/categories', views.CategoryViewSet, basename='category')
 router.register(r'api/news', views.NewsViewSet, basename='news')
+router.register(r'api/export', views.ExportViewSet, basename='export')
+router.register(r'api/stats', views.StatsViewSet, basename='stats')
 
 urlpatterns = [
     path('', views.news_list, name='news_list'),
@@ -1,25 +1,46 @@
+from django.db import transaction
 from django.db.models import Count, Q
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
 
 from rest_framework.viewsets import ViewSet
-from rest_framework.permissions import AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import (
+    AllowAny,
+    IsAdminUser,
+    IsAuthenticated,
+    IsAuthenticatedOrReadOnly,
+)
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 
-from .models import News, Category
+from .cards import card_payloads
+from . import changes, duplicates, feeds, prerender, related, stats, trending
+from .counters import view_counter, view_stats
+from .exports import DATASETS, iter_export, watermark
+from .filters import filter_cards, ordered_by
+from .models import News, NewsCard, Category
+from .signals import news_updated
 from .permissions import IsAuthorOrReadOnly
 from .serializers import (
     CategoryListSerializer,
-    NewsListSerializer,
     NewsDetailSerializer,
     NewsCreateSerializer,
     NewsUpdateSerializer,
     NewsQueryParamsSerializer,
+    ExportQueryParamsSerializer,
+    ChangesQueryParamsSerializer,
+    TrendingQueryParamsSerializer,
+    StatsQueryParamsSerializer,
 )
 
-from apps.comments.models import Comment
+from apps.abstracts.pagination import ApproximatePageNumberPagination, cursor_page
+from apps.abstracts.throttling import AnonNewsListThrottle
+from apps.accounts.principals import get_principal
 
 class CategoryViewSet(ViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -60,29 +81,32 @@ class CategoryViewSet(ViewSet):
         )
 
         qs = (
-            News.objects
+            NewsCard.objects
             .filter(
-                category=category,
+                category_id=category.id,
                 is_published=True,
                 deleted_at__isnull=True,
             )
-            .select_related("author", "author__user", "category")
-            .order_by("-created_at")
+            .order_by(*ordered_by("-created_at"))
         )
 
-        serializer = NewsListSerializer(qs, many=True)
-        return Response(serializer.data)
+        return Response(card_payloads(qs))
 
 class NewsViewSet(ViewSet):
     permission_classes = [IsAuthorOrReadOnly]
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "views", "related", "trending"]:
             return [AllowAny()]
         if self.action in ["create", "my_news"]:
             return [IsAuthenticated()]
         return [IsAuthorOrReadOnly()]
 
+    def get_throttles(self):
+        if self.action == "list":
+            return [AnonNewsListThrottle()]
+        return []
+
     def get_queryset(self):
         return (
             News.objects
@@ -90,18 +114,19 @@ class NewsViewSet(ViewSet):
             .select_related("author", "author__user", "category")
         )
 
+    def get_card_queryset(self):
+        return NewsCard.objects.filter(deleted_at__isnull=True)
+
     def list(self, request):
-        user = request.user
-        qs = self.get_queryset()
+        principal = get_principal(request)
+        qs = self.get_card_queryset()
 
-        if not user.is_authenticated:
-            qs = qs.filter(is_published=True)
-        elif not hasattr(user, "author_profile"):
+        if not principal.is_author:
             qs = qs.filter(is_published=True)
         else:
             qs = qs.filter(
                 Q(is_published=True) |
-                Q(author=user.author_profile)
+                Q(author_id=principal.author_id)
             )
 
         params_serializer = NewsQueryParamsSerializer(
@@ -110,36 +135,72 @@ class NewsViewSet(ViewSet):
         params_serializer.is_valid(raise_exception=True)
         params = params_serializer.validated_data
 
-        if "category_id" in params:
-            qs = qs.filter(category_id=params["category_id"])
-
-        if "author_id" in params:
-            qs = qs.filter(author_id=params["author_id"])
-
-        if "is_published" in params:
-            qs = qs.filter(is_published=params["is_published"])
-
-        if "date_from" in params:
-            qs = qs.filter(created_at__date__gte=params["date_from"])
+        cards = filter_cards(qs, params)
 
-        if "date_to" in params:
-            qs = qs.filter(created_at__date__lte=params["date_to"])
+        paginator = ApproximatePageNumberPagination()
+        if "page" in request.query_params:
+            page = paginator.paginate_queryset(cards, request, view=self)
+            return paginator.get_paginated_response(page)
 
-        qs = qs.order_by("-created_at")
-
-        serializer = NewsListSerializer(qs, many=True)
-        return Response(serializer.data)
+        # Without ?page: the first page, as a bare list.
+        return Response(list(cards[:paginator.get_page_size(request)]))
 
     def retrieve(self, request, pk=None):
         news = get_object_or_404(
             self.get_queryset(),
             pk=pk,
         )
+        view_counter.record(news.id)
         serializer = NewsDetailSerializer(news)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def trending(self, request):
+        params_serializer = TrendingQueryParamsSerializer(
+            data=request.query_params
+        )
+        params_serializer.is_valid(raise_exception=True)
+        params = params_serializer.validated_data
+
+        ranked = trending.top(params["limit"], params.get("category_id"))
+        cards = dict(
+            NewsCard.objects
+            .filter(
+                news_id__in=[news_id for news_id, _ in ranked],
+                is_published=True,
+                deleted_at__isnull=True,
+            )
+            .values_list("news_id", "payload")
+        )
+        return Response([
+            {**cards[news_id], "trending_score": round(score, 4)}
+            for news_id, score in ranked
+            if news_id in cards
+        ])
+
+    @action(detail=True, methods=["get"])
+    def related(self, request, pk=None):
+        get_object_or_404(
+            News.objects.only("id"),
+            pk=pk,
+            is_published=True,
+            deleted_at__isnull=True,
+        )
+        return Response(related.related_payloads(int(pk)))
+
+    @action(detail=True, methods=["get"])
+    def views(self, request, pk=None):
+        news = get_object_or_404(
+            News.objects.only("id", "views_count"),
+            pk=pk,
+            is_published=True,
+            deleted_at__isnull=True,
+        )
+        return Response(view_stats(news))
+
     def create(self, request):
-        if not hasattr(request.user, "author_profile"):
+        principal = get_principal(request)
+        if not principal.is_author:
             return Response(
                 {"detail": "Only authors can create news."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -151,155 +212,265 @@ class NewsViewSet(ViewSet):
         )
         serializer.is_valid(raise_exception=True)
         news = serializer.save(
-            author=request.user.author_profile
+            author_id=principal.author_id
         )
         return Response(
-            NewsDetailSerializer(news).data,
+            {
+                **NewsDetailSerializer(news).data,
+                "near_duplicates": duplicates.near_duplicates(news.id),
+            },
             status=status.HTTP_201_CREATED,
         )
 
-    def update(self, request, pk=None):
-        news = get_object_or_404(
-            News,
-            pk=pk,
-            deleted_at__isnull=True,
+    def _owned_update(self, request, pk, **values):
+        """
+        Ownership, existence and the write in one conditional UPDATE.
+
+        Returns the number of updated rows (0 or 1); the 403/404 decision
+        only costs an extra query when the update did not match.
+        """
+        principal = get_principal(request)
+        return (
+            News.objects
+            .filter(
+                pk=pk,
+                author_id=principal.author_id,
+                deleted_at__isnull=True,
+            )
+            .update(updated_at=timezone.now(), **values)
         )
 
-        if news.author != getattr(request.user, "author_profile", None):
+    def _mutation_failed(self, pk):
+        if News.objects.filter(pk=pk, deleted_at__isnull=True).exists():
             return Response(
                 {"detail": "Permission denied."},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        raise Http404
+
+    def _mutation_response(self, pk, fields):
+        news = self.get_queryset().get(pk=pk)
+        news_updated.send(
+            sender=News,
+            news_ids=[news.id],
+            fields=set(fields),
+            instances=[news],
+        )
+        return Response(NewsDetailSerializer(news).data)
 
+    def _update(self, request, pk, partial):
         serializer = NewsUpdateSerializer(
-            news,
             data=request.data,
+            partial=partial,
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(
-            NewsDetailSerializer(news).data
-        )
-
-    def partial_update(self, request, pk=None):
-        news = get_object_or_404(
-            News,
-            pk=pk,
-            deleted_at__isnull=True,
-        )
+        data = dict(serializer.validated_data)
 
-        if news.author != getattr(request.user, "author_profile", None):
-            return Response(
-                {"detail": "Permission denied."},
-                status=status.HTTP_403_FORBIDDEN,
+        image = data.pop("image", None)
+        values = {
+            ("category_id" if field == "category" else field): (
+                value.pk if field == "category" and value is not None else value
             )
+            for field, value in data.items()
+        }
+        fields = set(data)
+        if values.get("is_published"):
+            values.update(News.publish_values(timezone.now()))
+            fields.add("published_at")
+        stored = None
+        if "image" in serializer.validated_data:
+            image_field = News._meta.get_field("image")
+            if image:
+                stored = image_field.storage.save(
+                    image_field.generate_filename(None, image.name),
+                    image,
+                    max_length=image_field.max_length,
+                )
+            values["image"] = stored
+            fields.add("image")
+
+        # The row, its derived cards and the on-commit refreshes change
+        # together or not at all.
+        try:
+            with transaction.atomic():
+                if self._owned_update(request, pk, **values):
+                    return self._mutation_response(pk, fields)
+        except Exception:
+            self._discard_image(stored)
+            raise
+        self._discard_image(stored)
+        return self._mutation_failed(pk)
+
+    @staticmethod
+    def _discard_image(name):
+        if name:
+            News._meta.get_field("image").storage.delete(name)
 
-        serializer = NewsUpdateSerializer(
-            news,
-            data=request.data,
-            partial=True,
-        )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(
-            NewsDetailSerializer(news).data
-        )
+    def update(self, request, pk=None):
+        return self._update(request, pk, partial=False)
 
-    def destroy(self, request, pk=None):
-        news = get_object_or_404(
-            News,
-            pk=pk,
-            deleted_at__isnull=True,
-        )
+    def partial_update(self, request, pk=None):
+        return self._update(request, pk, partial=True)
 
-        if news.author != getattr(request.user, "author_profile", None):
-            return Response(
-                {"detail": "Permission denied."},
-                status=status.HTTP_403_FORBIDDEN,
+    def destroy(self, request, pk=None):
+        now = timezone.now()
+        with transaction.atomic():
+            if not self._owned_update(request, pk, deleted_at=now):
+                return self._mutation_failed(pk)
+
+            news_updated.send(
+                sender=News,
+                news_ids=[int(pk)],
+                fields={"deleted_at"},
+                instances=None,
             )
-
-        news.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=False, methods=["get"])
     def my_news(self, request):
-        if not hasattr(request.user, "author_profile"):
+        principal = get_principal(request)
+        if not principal.is_author:
             return Response(
                 {"detail": "You are not an author."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
         qs = (
-            self.get_queryset()
-            .filter(author=request.user.author_profile)
-            .order_by("-created_at")
+            self.get_card_queryset()
+            .filter(author_id=principal.author_id)
+            .order_by(*ordered_by("-created_at"))
         )
-        serializer = NewsListSerializer(qs, many=True)
-        return Response(serializer.data)
+        return Response(card_payloads(qs))
 
     @action(detail=True, methods=["post"])
     def publish(self, request, pk=None):
-        news = get_object_or_404(
-            News,
-            pk=pk,
-            deleted_at__isnull=True,
+        with transaction.atomic():
+            if not self._owned_update(request, pk, **News.publish_values(timezone.now())):
+                return self._mutation_failed(pk)
+            response = self._mutation_response(pk, ["is_published", "published_at"])
+        response.data["near_duplicates"] = duplicates.near_duplicates(int(pk))
+        return response
+
+    @action(detail=True, methods=["post"])
+    def unpublish(self, request, pk=None):
+        with transaction.atomic():
+            if not self._owned_update(request, pk, is_published=False):
+                return self._mutation_failed(pk)
+            return self._mutation_response(pk, ["is_published"])
+
+class ExportViewSet(ViewSet):
+    permission_classes = [IsAdminUser]
+
+    def retrieve(self, request, pk=None):
+        if pk not in DATASETS:
+            raise Http404
+
+        params_serializer = ExportQueryParamsSerializer(
+            data=request.query_params
+        )
+        params_serializer.is_valid(raise_exception=True)
+        params = params_serializer.validated_data
+
+        fmt = params["fmt"]
+        until = watermark()
+        response = StreamingHttpResponse(
+            iter_export(pk, fmt, since=params.get("since"), until=until),
+            content_type=(
+                "application/x-ndjson" if fmt == "ndjson" else "text/csv"
+            ),
         )
+        response["Content-Disposition"] = f'attachment; filename="{pk}.{fmt}"'
+        response["X-Export-Watermark"] = until.isoformat()
+        return response
 
-        if news.author != getattr(request.user, "author_profile", None):
-            return Response(
-                {"detail": "Permission denied."},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+class StatsViewSet(ViewSet):
+    permission_classes = [IsAdminUser]
 
-        news.is_published = True
-        news.save(update_fields=["is_published"])
-        return Response(
-            NewsDetailSerializer(news).data
+    def list(self, request):
+        params_serializer = StatsQueryParamsSerializer(
+            data=request.query_params
         )
+        params_serializer.is_valid(raise_exception=True)
+        params = params_serializer.validated_data
 
-    @action(detail=True, methods=["post"])
-    def unpublish(self, request, pk=None):
-        news = get_object_or_404(
-            News,
-            pk=pk,
-            deleted_at__isnull=True,
+        group_by = params["group_by"]
+        result = stats.query(
+            params["date_from"],
+            params["date_to"],
+            group_by=None if group_by == "none" else group_by,
+            category_id=params.get("category_id"),
+            author_id=params.get("author_id"),
         )
+        return Response({
+            "date_from": params["date_from"],
+            "date_to": params["date_to"],
+            "group_by": group_by,
+            **result,
+        })
 
-        if news.author != getattr(request.user, "author_profile", None):
-            return Response(
-                {"detail": "Permission denied."},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+class ChangesViewSet(ViewSet):
+    permission_classes = [AllowAny]
 
-        news.is_published = False
-        news.save(update_fields=["is_published"])
-        return Response(
-            NewsDetailSerializer(news).data
+    def list(self, request):
+        params_serializer = ChangesQueryParamsSerializer(
+            data=request.query_params
         )
+        params_serializer.is_valid(raise_exception=True)
+        params = params_serializer.validated_data
+
+        return Response(changes.page(params.get("since"), params.get("limit")))
+
+def _artifact_response(request, key, ext, content_type):
+    artifact = feeds.get_artifact(key, ext)
+    if artifact is None:
+        raise Http404
+    last_modified = int(artifact.last_modified)
+    response = get_conditional_response(
+        request, etag=artifact.etag, last_modified=last_modified
+    )
+    if response is None:
+        response = HttpResponse(artifact.body, content_type=content_type)
+    response["ETag"] = artifact.etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = f"public, max-age={feeds.feeds_setting('MAX_AGE')}"
+    return response
+
+
+@require_GET
+def sitemap_index(request):
+    return _artifact_response(request, "sitemap", "xml", feeds.SITEMAP_CONTENT_TYPE)
+
+
+@require_GET
+def sitemap_month(request, month):
+    if not feeds.MONTH.match(month):
+        raise Http404
+    return _artifact_response(request, f"sitemap-{month}", "xml", feeds.SITEMAP_CONTENT_TYPE)
+
+
+@require_GET
+def feed(request, key, fmt):
+    """``key`` is ``news``, ``category-<id>`` or ``author-<id>``."""
+    if fmt not in feeds.FORMATS or not feeds.FEED_KEY.match(key):
+        raise Http404
+    return _artifact_response(request, key, fmt, feeds.FORMATS[fmt][1])
+
 
 def home_page(request):
     return render(request, "home.html", {"title": "Главная"})
 
 
 def news_list(request):
-    qs = (
-        News.objects
-        .filter(is_published=True, deleted_at__isnull=True)
-        .select_related("author", "author__user", "category")
-        .order_by("-published_at", "-created_at")
-    )
-
     if request.headers.get("Accept") == "application/json":
-        return JsonResponse(
-            NewsListSerializer(qs, many=True).data,
-            safe=False,
+        cards = (
+            NewsCard.objects
+            .filter(is_published=True, deleted_at__isnull=True)
+            .only("news_id", "published_at", "payload")
         )
+        page = cursor_page(request, cards, prerender.LIST_ORDERING)
+        return JsonResponse(page.payload([card.payload for card in page]))
 
-    return render(
-        request,
-        "news_list.html",
-        {"news": qs, "title": "Все Новости"},
-    )
+    return render(request, "news_list.html", prerender.list_context(request))
 
 
 def news_detail(request, news_id):
@@ -313,18 +484,7 @@ def news_detail(request, news_id):
         is_published=True,
         deleted_at__isnull=True,
     )
-
-    comments = (
-        Comment.objects
-        .filter(
-            news=news,
-            deleted_at__isnull=True,
-            parent__isnull=True,
-        )
-        .select_related("user")
-        .prefetch_related("replies__user")
-        .order_by("created_at")
-    )
+    view_counter.record(news.id)
 
     if request.headers.get("Accept") == "application/json":
         return JsonResponse(
@@ -332,15 +492,7 @@ def news_detail(request, news_id):
             safe=False,
         )
 
-    return render(
-        request,
-        "news_detail.html",
-        {
-            "news": news,
-            "title": news.title,
-            "comments": comments,
-        },
-    )
+    return render(request, "news_detail.html", prerender.detail_context(news))
     
 def category_list(request):
     qs = (
@@ -355,20 +507,19 @@ def category_list(request):
                 ),
             )
         )
-        .order_by("name")
     )
+    page = cursor_page(request, qs, ("name", "pk"))
 
     if request.headers.get("Accept") == "application/json":
         return JsonResponse(
-            CategoryListSerializer(qs, many=True).data,
-            safe=False,
+            page.payload(CategoryListSerializer(page, many=True).data)
         )
 
     return render(
         request,
         "category_list.html",
         {
-            "categories": qs,
+            "categories": page,
             "title": "Все категории",
         },
     )
@@ -380,29 +531,17 @@ def news_by_category(request, category_id):
         deleted_at__isnull=True,
     )
 
-    qs = (
-        News.objects
-        .filter(
-            category=category,
-            is_published=True,
-            deleted_at__isnull=True,
-        )
-        .select_related("author", "author__user", "category")
-        .order_by("-published_at", "-created_at")
-    )
-
     if request.headers.get("Accept") == "application/json":
-        return JsonResponse(
-            NewsListSerializer(qs, many=True).data,
-            safe=False,
+        cards = (
+            NewsCard.objects
+            .filter(
+                category_id=category.id,
+                is_published=True,
+                deleted_at__isnull=True,
+            )
+            .only("news_id", "published_at", "payload")
         )
+        page = cursor_page(request, cards, prerender.LIST_ORDERING)
+        return JsonResponse(page.payload([card.payload for card in page]))
 
-    return render(
-        request,
-        "news_by_category.html",
-        {
-            "category": category,
-            "news": qs,
-            "title": f"Новости по категории: {category.name}",
-        },
-    )
\ No newline at end of file
+    return render(request, "news_by_category.html", prerender.category_context(request, category))
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Cold-start benchmark.
+
+Times fresh interpreters that set Django up and load the URLconf and
+compares the median with the target (STARTUP_TARGET_MS, in ms).
+
+    python benchmarks/bench_startup.py [--runs 10] [--target-ms 600]
+
+Exits with status 1 when the target is missed. For a per-module
+breakdown use ``python manage.py profile_startup``.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from apps.abstracts import startup  # noqa: E402
+
+TARGET_MS = float(os.getenv("STARTUP_TARGET_MS", 600))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--target-ms", type=float, default=TARGET_MS)
+    parser.add_argument("--settings", default="settings.base")
+    args = parser.parse_args()
+
+    summary = startup.summarize(startup.measure(args.runs, args.settings))
+    summary["target_ms"] = args.target_ms
+    print(json.dumps({name: round(value, 1) for name, value in summary.items()}))
+    return 0 if summary["median_ms"] <= args.target_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
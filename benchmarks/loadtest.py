@@ -0,0 +1,356 @@
+"""
+Load test with a weighted traffic mix.
+
+Replays a mix of anonymous feed and detail reads, JWT logins, comment
+posts and news publishing against a running server (runserver, uvicorn,
+gunicorn, ...). Each concurrency level runs for a fixed time, with every
+worker sending its next request as soon as the last one returned. For
+each level it reports throughput, latency percentiles and outcome rates,
+and marks the knee: the last level that still raised throughput by
+KNEE_GAIN.
+
+    python benchmarks/loadtest.py --base-url http://127.0.0.1:8000 \\
+        [--concurrency 1,2,4,8,16,32] [--duration 20] \\
+        [--mix feed=50,detail=30,login=5,comment=10,publish=5] \\
+        [--label uvicorn-4w] [--output results.jsonl]
+
+News, categories and author logins are read from the seeded database
+(--db, opened read-only); seed users have the password password123. The
+comment and publish operations write through the API, so run against a
+copy of db.sqlite3, or use a mix without them. 429 (throttled) and 503
+(shed) responses are reported separately from errors.
+"""
+import argparse
+import http.client
+import json
+import random
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_MIX = "feed=50,detail=30,login=5,comment=10,publish=5"
+KNEE_GAIN = 0.10
+TIMEOUT = 30.0
+
+
+@dataclass
+class Targets:
+    news_ids: list[int]
+    category_ids: list[int]
+    credentials: list[tuple[str, str]]
+
+
+def load_targets(db: Path, password: str, limit: int = 5000) -> Targets:
+    connection = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+    try:
+        news_ids = [row[0] for row in connection.execute(
+            "SELECT id FROM news_news WHERE is_published AND deleted_at IS NULL "
+            "ORDER BY id DESC LIMIT ?", (limit,)
+        )]
+        category_ids = [row[0] for row in connection.execute(
+            "SELECT id FROM news_category WHERE deleted_at IS NULL"
+        )]
+        emails = [row[0] for row in connection.execute(
+            "SELECT u.email FROM accounts_user u "
+            "JOIN accounts_author a ON a.user_id = u.id "
+            "WHERE u.is_active AND a.deleted_at IS NULL LIMIT ?", (limit,)
+        )]
+    finally:
+        connection.close()
+    return Targets(news_ids, category_ids, [(email, password) for email in emails])
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Client:
+    """One keep-alive connection and, once logged in, one JWT."""
+
+    def __init__(self, base_url: str, targets: Targets, rng: random.Random):
+        parts = urlsplit(base_url)
+        connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self.connection = connection_class(parts.netloc, timeout=TIMEOUT)
+        self.prefix = parts.path.rstrip("/")
+        self.targets = targets
+        self.rng = rng
+        self.token: str | None = None
+
+    def request(self, method: str, path: str, body: dict | None = None, auth=False) -> int:
+        headers = {"Accept": "application/json"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        if auth and self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        try:
+            self.connection.request(method, self.prefix + path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            raise
+        if response.status == 200 and path == "/api/token/":
+            self.token = json.loads(data)["access"]
+        return response.status
+
+    def html(self, path: str) -> int:
+        try:
+            self.connection.request("GET", self.prefix + path, headers={"Accept": "text/html"})
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            raise
+        return response.status
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def op_feed(client: Client) -> int:
+    params = {"page": 1}
+    if client.targets.category_ids and client.rng.random() < 0.3:
+        params["category_id"] = client.rng.choice(client.targets.category_ids)
+    return client.request("GET", f"/news/api/news/?{urlencode(params)}")
+
+
+def op_detail(client: Client) -> int:
+    return client.html(f"/news/{client.rng.choice(client.targets.news_ids)}/")
+
+
+def op_login(client: Client) -> int:
+    email, password = client.rng.choice(client.targets.credentials)
+    return client.request("POST", "/api/token/", {"email": email, "password": password})
+
+
+def _ensure_login(client: Client) -> int | None:
+    if client.token is None:
+        status = op_login(client)
+        if client.token is None:
+            return status
+    return None
+
+
+def op_comment(client: Client) -> int:
+    failed = _ensure_login(client)
+    if failed is not None:
+        return failed
+    return client.request(
+        "POST",
+        "/comments/api/comments/",
+        {"news": client.rng.choice(client.targets.news_ids), "text": "Load test comment"},
+        auth=True,
+    )
+
+
+def op_publish(client: Client) -> int:
+    failed = _ensure_login(client)
+    if failed is not None:
+        return failed
+    body = {
+        "title": f"Load test {client.rng.getrandbits(32):08x}",
+        "content": "Load test content. " * 20,
+    }
+    if client.targets.category_ids:
+        body["category"] = client.rng.choice(client.targets.category_ids)
+    return client.request("POST", "/news/api/news/", body, auth=True)
+
+
+OPERATIONS = {
+    "feed": op_feed,
+    "detail": op_detail,
+    "login": op_login,
+    "comment": op_comment,
+    "publish": op_publish,
+}
+
+
+def outcome(status: int | None) -> str:
+    if status is None:
+        return "failed"
+    if status == 429:
+        return "throttled"
+    if status == 503:
+        return "shed"
+    if status >= 500:
+        return "server_error"
+    if status >= 400:
+        return "client_error"
+    return "ok"
+
+
+@dataclass
+class Recorder:
+    latencies: defaultdict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    outcomes: Counter = field(default_factory=Counter)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, operation: str, seconds: float, status: int | None) -> None:
+        with self.lock:
+            self.latencies[operation].append(seconds)
+            self.outcomes[outcome(status)] += 1
+
+
+def worker(base_url, targets, mix, seed, recorder, warmup_until, stop_at):
+    rng = random.Random(seed)
+    client = Client(base_url, targets, rng)
+    names, weights = list(mix), list(mix.values())
+    try:
+        while True:
+            started = time.perf_counter()
+            if started >= stop_at:
+                return
+            name = rng.choices(names, weights)[0]
+            try:
+                status = OPERATIONS[name](client)
+            except (OSError, http.client.HTTPException):
+                status = None
+            finished = time.perf_counter()
+            if started >= warmup_until:
+                recorder.add(name, finished - started, status)
+    finally:
+        client.close()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted ``values``."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(fraction * len(values) + 0.5) - 1))]
+
+
+def latency_summary(values: list[float]) -> dict:
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p90_ms": percentile(values, 0.90) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": (values[-1] if values else 0.0) * 1000,
+    }
+
+
+def run_level(base_url, targets, mix, concurrency, duration, warmup, seed) -> dict:
+    recorder = Recorder()
+    start = time.perf_counter()
+    warmup_until = start + warmup
+    stop_at = warmup_until + duration
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(base_url, targets, mix, seed + index, recorder, warmup_until, stop_at),
+            daemon=True,
+        )
+        for index in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    every = [value for values in recorder.latencies.values() for value in values]
+    total = len(every)
+    return {
+        "concurrency": concurrency,
+        "rps": total / duration,
+        **latency_summary(every),
+        "rates": {name: count / total for name, count in recorder.outcomes.items()} if total else {},
+        "operations": {
+            name: latency_summary(values) for name, values in sorted(recorder.latencies.items())
+        },
+    }
+
+
+def find_knee(levels: list[dict]) -> int | None:
+    """Concurrency of the last level that still gained KNEE_GAIN throughput."""
+    knee = levels[0]["concurrency"] if levels else None
+    for previous, level in zip(levels, levels[1:]):
+        if level["rps"] < previous["rps"] * (1 + KNEE_GAIN):
+            break
+        knee = level["concurrency"]
+    return knee
+
+
+def print_level(level: dict, by_operation: bool) -> None:
+    rates = level["rates"]
+    print(
+        f"{level['concurrency']:>5} {level['rps']:>9.1f} {level['p50_ms']:>8.1f} "
+        f"{level['p90_ms']:>8.1f} {level['p99_ms']:>8.1f} {level['max_ms']:>9.1f} "
+        f"{rates.get('server_error', 0) + rates.get('failed', 0):>7.2%} "
+        f"{rates.get('client_error', 0):>7.2%} {rates.get('throttled', 0):>7.2%} "
+        f"{rates.get('shed', 0):>7.2%}"
+    )
+    if by_operation:
+        for name, summary in level["operations"].items():
+            print(
+                f"{'':>5} {name:>9} {summary['p50_ms']:>8.1f} {summary['p90_ms']:>8.1f} "
+                f"{summary['p99_ms']:>8.1f} {summary['max_ms']:>9.1f}  n={summary['count']}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds measured per level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds ignored per level")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--db", type=Path, default=BASE_DIR / "db.sqlite3")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", default="", help="deployment profile, e.g. uvicorn-4w")
+    parser.add_argument("--output", type=Path, help="append the results as a JSON line")
+    parser.add_argument("--by-operation", action="store_true")
+    args = parser.parse_args()
+
+    targets = load_targets(args.db, args.password)
+    if not targets.news_ids or not targets.credentials:
+        print("No published news or authors found; seed the database first.", file=sys.stderr)
+        return 1
+
+    print(
+        f"{'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>9} "
+        f"{'errors':>7} {'4xx':>7} {'429':>7} {'503':>7}"
+    )
+    levels = []
+    for concurrency in (int(value) for value in args.concurrency.split(",")):
+        level = run_level(
+            args.base_url, targets, args.mix, concurrency, args.duration, args.warmup, args.seed
+        )
+        levels.append(level)
+        print_level(level, args.by_operation)
+
+    knee = find_knee(levels)
+    print(f"knee: {knee} concurrent clients")
+    if args.output:
+        result = {
+            "label": args.label,
+            "base_url": args.base_url,
+            "mix": args.mix,
+            "duration": args.duration,
+            "knee": knee,
+            "levels": levels,
+        }
+        with args.output.open("a") as output:
+            output.write(json.dumps(result) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
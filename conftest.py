@@ -0,0 +1,86 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _unbuffered_view_counter(settings):
+    # Buffered views must not outlive the test database they belong to.
+    settings.VIEW_COUNTER = {**settings.VIEW_COUNTER, "FLUSH_INTERVAL": 0}
+
+
+@pytest.fixture(autouse=True)
+def _inline_background_work(settings):
+    # Background calls run where they are submitted, inside the test database.
+    settings.BACKGROUND = {**settings.BACKGROUND, "INLINE": True}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_trending_cache():
+    from apps.news import trending
+
+    trending.clear_cache()
+    yield
+    trending.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_principal_cache():
+    from apps.accounts.principals import principal_cache
+
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_token_buckets():
+    from apps.abstracts.throttling import bucket_store
+
+    bucket_store.clear()
+    yield
+    bucket_store.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_artifacts(settings, tmp_path):
+    from apps.abstracts import schema
+
+    settings.ARTIFACTS_ROOT = tmp_path / "var"
+    schema.reset()
+    yield
+    schema.reset()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_count_cache():
+    from apps.abstracts.pagination import clear_count_cache
+
+    clear_count_cache()
+    yield
+    clear_count_cache()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_live_broker():
+    from apps.comments.live import broker
+
+    broker.reset()
+    yield
+    broker.reset()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_profiler_samples():
+    from apps.abstracts import profiling
+
+    profiling.reset()
+    yield
+    profiling.reset()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_default_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
@@ -4,18 +4,22 @@ Django settings for now_kz project.
 
 # Python modules
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
 NOWKZ_ENV_ID = os.getenv("NOWKZ_ENV_ID", "local")
-print(f"Current environment: {NOWKZ_ENV_ID}")
+if "runserver" in sys.argv:
+    print(f"Current environment: {NOWKZ_ENV_ID}")
 
 # ----------------------------------------------
 # Path
 #
 BASE_DIR = Path(__file__).resolve().parent.parent
+# Generated build artifacts (prebuilt OpenAPI schema, ...); not in git.
+ARTIFACTS_ROOT = Path(os.getenv("ARTIFACTS_ROOT", BASE_DIR / "var"))
 ROOT_URLCONF = "settings.urls"
 WSGI_APPLICATION = "settings.wsgi.application"
 ASGI_APPLICATION = "settings.asgi.application"
@@ -60,18 +64,22 @@ PROJECT_APPS = [
 INSTALLED_APPS = DJANGO_AND_THIRD_PARTY_APPS + PROJECT_APPS
 
 AUTH_USER_MODEL = "accounts.User"
+AUTHENTICATION_BACKENDS = ["apps.accounts.authentication.CachedModelBackend"]
 
 # ----------------------------------------------
 # Middleware | Templates | Validators
 #
 MIDDLEWARE = [
+    "apps.abstracts.middleware.ConcurrencyLimitMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.abstracts.middleware.ProfilerMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.news.middleware.PrerenderedPageMiddleware",
 ]
 
 TEMPLATES = [
@@ -115,16 +123,20 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.abstracts.pagination.ApproximatePageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": [
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    # Reverse proxies in front of the app. Anonymous throttles key on the
+    # client address; with 0 X-Forwarded-For is ignored, as clients can
+    # forge it. Behind N proxies, the Nth address from the right is used.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -135,6 +147,185 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
 }
 
+# Authenticated users are resolved through an in-process LRU
+# (apps.accounts.principals); TTL bounds staleness across workers.
+PRINCIPAL_CACHE = {
+    "MAX_SIZE": 10_000,
+    "TTL": 60.0,
+}
+
+# ----------------------------------------------
+# Pagination
+#
+# apps.abstracts.pagination: counts come from trigger-maintained counters
+# where the filters allow; otherwise above COUNT_LIMIT rows they are
+# estimated (filtered SQLite queries: counted up to ESTIMATE_LIMIT). Non-counter counts are cached for CACHE_TTL seconds. HTML
+# list views (and their JSON variants) use cursors, CURSOR_PAGE_SIZE rows
+# a page.
+PAGINATION = {
+    "COUNT_LIMIT": 10_000,
+    "ESTIMATE_LIMIT": 1_000_000,
+    "CACHE_TTL": 10.0,
+    "CACHE_SIZE": 1000,
+    "CURSOR_PAGE_SIZE": 20,
+}
+
+# ----------------------------------------------
+# News view counters
+#
+VIEW_COUNTER = {
+    "FLUSH_INTERVAL": float(os.getenv("VIEW_COUNTER_FLUSH_INTERVAL", 5)),
+    "MAX_PENDING": 1000,
+    "RECENT_WINDOW_HOURS": 24,
+    "LOCK_RETRIES": 3,
+}
+
+# ----------------------------------------------
+# Background work
+#
+# apps.abstracts.background: a per-process thread running work responses
+# need not wait for (related-news reindexing, page invalidation sweeps).
+BACKGROUND = {
+    "INLINE": False,
+    "DRAIN_TIMEOUT": 10.0,
+}
+
+# ----------------------------------------------
+# Trending
+#
+TRENDING = {
+    "HALF_LIFE_HOURS": 12.0,
+    "COMMENT_WEIGHT": 3.0,
+    "VIEW_WEIGHT": 0.1,
+    "CACHE_TTL": 30.0,
+    "PRUNE_BELOW": 0.01,
+    "MAX_LIMIT": 100,
+}
+
+# ----------------------------------------------
+# Related news
+#
+# apps.news.related: TF-IDF neighbours kept up to date on every save;
+# `python manage.py build_related` recomputes them from scratch.
+RELATED = {
+    "TOP_K": 5,
+    "MAX_TERMS": 64,
+    "MAX_POSTINGS": 5000,
+    "MIN_SCORE": 0.05,
+    "BATCH_SIZE": 500,
+}
+
+# ----------------------------------------------
+# Near-duplicate detection
+#
+# apps.news.duplicates: SimHash fingerprints of news content. Creating and
+# publishing news lists published news within MAX_DISTANCE bits (< 4).
+DUPLICATES = {
+    "MAX_DISTANCE": 3,
+    "SHINGLE_SIZE": 3,
+    "LIMIT": 5,
+}
+
+# ----------------------------------------------
+# Live comments
+#
+# apps.comments.live: Server-Sent Events per news (ASGI only). Set
+# LIVE_COMMENTS_ENABLED=1 when serving through settings.asgi; under WSGI
+# the stream would hold a thread per reader, so pages leave it out and the
+# endpoint answers 204. Set LIVE_COMMENTS_BRIDGE_DIR to a directory shared
+# by the workers of a host so a comment saved in one reaches subscribers
+# of all the others.
+LIVE_COMMENTS = {
+    "ENABLED": os.getenv("LIVE_COMMENTS_ENABLED") == "1",
+    "MAX_SUBSCRIBERS": 10_000,
+    "QUEUE_SIZE": 100,
+    "HEARTBEAT": 15.0,
+    "REPLAY_LIMIT": 500,
+    "RETRY_MS": 3000,
+    "BRIDGE_DIR": os.getenv("LIVE_COMMENTS_BRIDGE_DIR") or None,
+}
+
+# ----------------------------------------------
+# Changes feed
+#
+# apps.news.changes: /api/changes/ pages through created, updated and
+# deleted records by (updated_at, id); rows younger than SETTLE_SECONDS
+# wait for the next request.
+CHANGES = {
+    "PAGE_SIZE": 500,
+    "MAX_PAGE_SIZE": 1000,
+    "SETTLE_SECONDS": 1.0,
+}
+
+# ----------------------------------------------
+# Sitemaps | feeds
+#
+# apps.news.feeds: sitemap and RSS/Atom files under ARTIFACTS_ROOT/feeds,
+# rebuilt on demand for the keys a publish, edit or delete touched.
+# SITE_URL prefixes every link in them.
+FEEDS = {
+    "SITE_URL": os.getenv("SITE_URL", "http://localhost:8000"),
+    "TITLE": "Новости",
+    "ITEMS": 50,
+    "DESCRIPTION_WORDS": 60,
+    "MAX_AGE": 300,
+}
+
+# ----------------------------------------------
+# Pre-rendered pages
+#
+# apps.news.prerender: news_detail, news_list and news_by_category HTML
+# marked stale by each commit that changes them, rendered on the next
+# anonymous read and served by PrerenderedPageMiddleware.
+PRERENDER = {
+    "ENABLED": True,
+}
+
+# ----------------------------------------------
+# Author profiles
+#
+# apps.accounts.profiles: /accounts/authors/<slug>/ is served from one
+# bundle per author in the CACHES alias CACHE, dropped when the author
+# publishes or edits; with the default local-memory cache other workers
+# see the change once TTL (seconds) expires.
+AUTHOR_PROFILES = {
+    "LATEST": 10,
+    "CACHE": "default",
+    "TTL": 300,
+}
+
+# ----------------------------------------------
+# Profiling
+#
+# apps.abstracts.profiling: staff run a request under cProfile with
+# ?_profile=1 (or memory, adding tracemalloc); reports show up in the
+# admin. SAMPLE_RATES profiles one in N requests of a URL name, e.g.
+# {"news:news-list": 1000}.
+PROFILER = {
+    "SAMPLE_RATES": {},
+    "KEEP_SAMPLED": 200,
+    "TOP_FUNCTIONS": 40,
+    "TOP_ALLOCATIONS": 20,
+    "MAX_QUERIES": 500,
+}
+
+# ----------------------------------------------
+# Throttling | load shedding
+#
+# Token buckets (apps.abstracts.throttling): "rate" is tokens per second,
+# "burst" the bucket size. SHARED_CACHE names a CACHES alias to share
+# buckets between workers; by default each process keeps its own.
+THROTTLING = {
+    "BUCKETS": {
+        "comment_write": {"rate": 0.2, "burst": 10},
+        "anon_news_list": {"rate": 5.0, "burst": 60},
+    },
+    "MAX_KEYS": 100_000,
+    "SHARED_CACHE": os.getenv("THROTTLING_SHARED_CACHE") or None,
+    "MAX_IN_FLIGHT": int(os.getenv("THROTTLING_MAX_IN_FLIGHT", 64)),
+    "RETRY_AFTER": 1,
+}
+
 # ----------------------------------------------
 # Internationalization
 #
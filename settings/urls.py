@@ -1,24 +1,22 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from apps.news.views import home_page
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-)
+from apps.abstracts.views import openapi_schema, swagger_ui
+from apps.news.views import ChangesViewSet, feed, home_page, sitemap_index, sitemap_month
 
 urlpatterns = [
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
+    path("api/schema/", openapi_schema, name="schema"),
+    path("api/docs/", swagger_ui, name="swagger-ui"),
 
     path('', home_page, name='home'),
 
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/changes/', ChangesViewSet.as_view({'get': 'list'}), name='changes'),
+
+    path('sitemap.xml', sitemap_index, name='sitemap'),
+    re_path(r'^sitemaps/(?P<month>\d{4}-\d{2})\.xml$', sitemap_month, name='sitemap_month'),
+    re_path(r'^feeds/(?P<key>[\w-]+)\.(?P<fmt>rss|atom)$', feed, name='feed'),
 
     path('news/', include('apps.news.urls', namespace='news')),
     path('accounts/', include('apps.accounts.urls', namespace='accounts')),
@@ -0,0 +1,113 @@
+import pytest
+from django.urls import reverse
+
+from apps.accounts.models import User, Author
+from apps.comments.models import Comment
+from apps.news.models import News, NewsCard, Category
+
+
+@pytest.fixture
+def staff(db):
+    return User.objects.create_superuser(email="admin@test.com", password="password123")
+
+
+@pytest.fixture
+def admin_client(client, staff):
+    client.force_login(staff)
+    return client
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    return Author.objects.create(user=user)
+
+
+@pytest.fixture
+def many_news(db, author):
+    category = Category.objects.create(name="General")
+    return [
+        News.objects.create(
+            title=f"Title {i}",
+            content="Budget debate in parliament" if i % 2 else "Football results",
+            category=category,
+            author=author,
+            is_published=False,
+        )
+        for i in range(6)
+    ]
+
+
+def changelist(model):
+    return reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+
+
+@pytest.mark.django_db
+def test_news_changelist_query_count_constant(admin_client, many_news, django_assert_max_num_queries):
+    # GOOD: Список новостей в админке не делает N+1 запросов
+    with django_assert_max_num_queries(8):
+        response = admin_client.get(changelist(News))
+    assert response.status_code == 200
+    assert "author@test.com" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_news_fts_search(admin_client, many_news):
+    # GOOD: Поиск идёт по полнотекстовому индексу, в том числе по префиксу
+    response = admin_client.get(changelist(News), {"q": "parlia"})
+
+    found = {news.id for news in response.context["cl"].result_list}
+    assert found == {news.id for news in many_news if "Budget" in news.content}
+
+
+@pytest.mark.django_db
+def test_news_fts_tracks_updates(admin_client, many_news):
+    # GOOD: Триггеры обновляют индекс при изменении новости
+    News.objects.filter(pk=many_news[0].pk).update(content="Parliament session")
+
+    response = admin_client.get(changelist(News), {"q": "parliament"})
+    assert many_news[0] in response.context["cl"].result_list
+
+
+@pytest.mark.django_db
+def test_news_publish_action_refreshes_cards(admin_client, many_news):
+    # GOOD: Массовая публикация идёт пачками и обновляет карточки
+    response = admin_client.post(changelist(News), {
+        "action": "publish_selected",
+        "_selected_action": [news.pk for news in many_news[:3]],
+    })
+
+    assert response.status_code == 302
+    assert News.objects.filter(is_published=True).count() == 3
+    assert NewsCard.objects.filter(is_published=True).count() == 3
+
+
+@pytest.mark.django_db
+def test_news_hard_delete_action_removed(admin_client):
+    # BAD: Стандартное удаление (с загрузкой всех связей) недоступно
+    response = admin_client.get(changelist(News))
+    actions = dict(response.context["action_form"].fields["action"].choices)
+    assert "delete_selected" not in actions
+    assert "soft_delete_selected" in actions
+
+
+@pytest.mark.django_db
+def test_comment_soft_delete_action_cascades(admin_client, many_news, staff):
+    # GOOD: Мягкое удаление комментариев удаляет и ответы
+    parent = Comment.objects.create(user=staff, news=many_news[0], text="Root")
+    reply = Comment.objects.create(user=staff, news=many_news[0], text="Reply", parent=parent)
+
+    admin_client.post(changelist(Comment), {
+        "action": "soft_delete_selected",
+        "_selected_action": [parent.pk],
+    })
+
+    reply.refresh_from_db()
+    assert reply.deleted_at is not None
+
+
+@pytest.mark.django_db
+def test_user_prefix_search(admin_client, author):
+    # GOOD: Поиск пользователей — по индексируемому префиксу email
+    response = admin_client.get(changelist(User), {"q": "autho"})
+    assert [user.email for user in response.context["cl"].result_list] == ["author@test.com"]
@@ -0,0 +1,145 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, Author
+from apps.news.models import News, Category
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="john@test.com", password="password123")
+    return Author.objects.create(user=user, description="Sports desk")
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(name="Sport")
+
+
+def create_news(author, category, title, is_published=True):
+    return News.objects.create(
+        title=title, content="Content", category=category, author=author, is_published=is_published
+    )
+
+
+def profile(client, slug):
+    return client.get(
+        reverse("accounts:author_profile", args=[slug]), HTTP_ACCEPT="application/json"
+    )
+
+
+@pytest.mark.django_db
+def test_slug_unique_and_kept_on_rename_good(author):
+    # GOOD: Слаг строится из имени, дубликаты получают суффикс, переименование его не меняет
+    namesake = User.objects.create_user(email="john@other.com", password="password123", username="John!")
+    second = Author.objects.create(user=namesake)
+
+    author.user.username = "renamed"
+    author.user.save()
+    author.refresh_from_db()
+
+    assert author.slug == "john"
+    assert second.slug == "john-2"
+
+
+@pytest.mark.django_db
+def test_cyrillic_username_keeps_its_letters_good(client):
+    # GOOD: Кириллическое имя даёт осмысленный слаг, профиль открывается по нему
+    user = User.objects.create_user(email="aigerim@test.com", password="password123", username="Айгерим Сагинтаева")
+    author = Author.objects.create(user=user)
+
+    assert author.slug == "айгерим-сагинтаева"
+    assert profile(client, author.slug).status_code == 200
+
+
+@pytest.mark.django_db
+def test_slug_taken_concurrently_retried_bad(author, monkeypatch):
+    # BAD: Слаг, занятый параллельной регистрацией, не роняет сохранение
+    # Другой username, но тот же базовый слаг "john", что и у автора из фикстуры.
+    namesake = User.objects.create_user(email="john@other.com", password="password123", username="John!")
+    picked = []
+    original = Author._free_slug
+
+    def free_slug(self):
+        # Первая попытка видит устаревшее состояние, как при гонке двух регистраций.
+        picked.append("john" if not picked else original(self))
+        return picked[-1]
+
+    monkeypatch.setattr(Author, "_free_slug", free_slug)
+
+    second = Author.objects.create(user=namesake)
+
+    assert picked == ["john", "john-2"]
+    assert second.slug == "john-2"
+    assert Author.objects.get(pk=second.pk).slug == "john-2"
+
+
+@pytest.mark.django_db
+def test_profile_bundle_served_from_cache_good(client, author, category, settings, django_assert_num_queries):
+    # GOOD: Профиль, счётчики и последние N новостей; повторный запрос — без обращения к базе
+    settings.AUTHOR_PROFILES = {**settings.AUTHOR_PROFILES, "LATEST": 2}
+    for title in ("First", "Second", "Third"):
+        create_news(author, category, title)
+    create_news(author, category, "Draft", is_published=False)
+
+    data = profile(client, author.slug).json()
+    with django_assert_num_queries(0):
+        again = profile(client, author.slug)
+
+    assert data["author"]["slug"] == "john"
+    assert data["author"]["description"] == "Sports desk"
+    assert data["counts"]["published"] == 3
+    assert [card["title"] for card in data["latest"]] == ["Third", "Second"]
+    assert again.json() == data
+
+
+@pytest.mark.django_db
+def test_publish_and_edit_invalidate_bundle_good(
+    client, api_client, author, category, django_capture_on_commit_callbacks
+):
+    # GOOD: Публикация и правка новости автора сбрасывают закешированный профиль
+    draft = create_news(author, category, "Draft", is_published=False)
+    assert profile(client, author.slug).json()["latest"] == []
+
+    api_client.force_authenticate(author.user)
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(reverse("news:news-publish", args=[draft.id]))
+    published = profile(client, author.slug).json()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.patch(reverse("news:news-detail", args=[draft.id]), {"title": "Renamed"})
+    edited = profile(client, author.slug).json()
+
+    assert [card["title"] for card in published["latest"]] == ["Draft"]
+    assert published["counts"]["published"] == 1
+    assert [card["title"] for card in edited["latest"]] == ["Renamed"]
+
+
+@pytest.mark.django_db
+def test_profile_html_lists_latest_news_good(client, author, category):
+    # GOOD: HTML-страница автора показывает его новости, список авторов ссылается на неё
+    news = create_news(author, category, "Match report")
+
+    page = client.get(reverse("accounts:author_profile", args=[author.slug])).content.decode()
+    listing = client.get(reverse("accounts:author_list")).content.decode()
+
+    assert "Match report" in page
+    assert reverse("news:news_detail", args=[news.id]) in page
+    assert reverse("accounts:author_profile", args=[author.slug]) in listing
+
+
+@pytest.mark.django_db
+def test_unknown_or_deleted_author_bad(client, author, django_capture_on_commit_callbacks):
+    # BAD: Неизвестный слаг и удалённый автор — 404
+    profile(client, author.slug)
+    with django_capture_on_commit_callbacks(execute=True):
+        author.delete()
+
+    assert profile(client, "nobody").status_code == 404
+    assert profile(client, author.slug).status_code == 404
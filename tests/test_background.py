@@ -0,0 +1,30 @@
+import threading
+
+from apps.abstracts.background import Worker
+
+
+def test_calls_run_in_order_off_the_request_thread_good(settings):
+    # GOOD: Вызовы выполняются по порядку в отдельном потоке
+    settings.BACKGROUND = {**settings.BACKGROUND, "INLINE": False}
+    worker = Worker()
+    calls = []
+
+    for n in (1, 2, 3):
+        worker.submit(lambda n: calls.append((n, threading.current_thread().name)), n)
+
+    assert worker.drain(timeout=5)
+    assert calls == [(1, "background"), (2, "background"), (3, "background")]
+
+
+def test_failed_call_does_not_stop_the_worker_bad(settings, caplog):
+    # BAD: Упавший вызов логируется, следующие всё равно выполняются
+    settings.BACKGROUND = {**settings.BACKGROUND, "INLINE": False}
+    worker = Worker()
+    calls = []
+
+    worker.submit(lambda: 1 / 0)
+    worker.submit(calls.append, "after")
+
+    assert worker.drain(timeout=5)
+    assert calls == ["after"]
+    assert "Background call" in caplog.text
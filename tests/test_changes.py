@@ -0,0 +1,194 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, Author
+from apps.comments.models import Comment
+from apps.news.models import News, NewsCard, Category
+
+
+@pytest.fixture(autouse=True)
+def _no_settle(settings):
+    settings.CHANGES = {**settings.CHANGES, "SETTLE_SECONDS": 0}
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    return Author.objects.create(user=user)
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(name="General")
+
+
+@pytest.fixture
+def news(author, category):
+    return News.objects.create(title="News", content="Content", category=category, author=author)
+
+
+@pytest.fixture
+def comment(news, author):
+    return Comment.objects.create(news=news, user=author.user, text="Hello")
+
+
+def sync(client, since=None, limit=None):
+    params = {}
+    if since:
+        params["since"] = since
+    if limit:
+        params["limit"] = limit
+    response = client.get(reverse("changes"), params)
+    assert response.status_code == 200
+    return response.data
+
+
+def drain(client, since=None, limit=None):
+    changes = []
+    while True:
+        data = sync(client, since, limit)
+        changes += data["changes"]
+        since = data["next"]
+        if not data["has_more"]:
+            return changes, since
+
+
+def keys(changes):
+    return [(change["type"], change["op"], change["id"]) for change in changes]
+
+
+@pytest.mark.django_db
+def test_full_sync_pages_through_everything_once_good(api_client, comment, news, author, category):
+    # GOOD: Постраничная синхронизация отдаёт каждую запись ровно один раз
+    changes, token = drain(api_client, limit=1)
+
+    assert sorted(keys(changes)) == sorted([
+        ("category", "upsert", category.id),
+        ("author", "upsert", author.id),
+        ("news", "upsert", news.id),
+        ("comment", "upsert", comment.id),
+    ])
+    assert sync(api_client, token) == {"changes": [], "next": token, "has_more": False}
+
+
+@pytest.mark.django_db
+def test_delta_contains_only_changes_good(api_client, comment, news, author):
+    # GOOD: После водяного знака приходят только изменения, удаления — как delete
+    _, token = drain(api_client)
+
+    news.title = "Renamed"
+    news.save()
+    comment.delete()
+    author.user.username = "renamed"
+    author.user.save()
+
+    changes, _ = drain(api_client, token)
+
+    assert sorted(keys(changes)) == sorted([
+        ("news", "upsert", news.id),
+        ("comment", "delete", comment.id),
+        ("author", "upsert", author.id),
+    ])
+    by_type = {change["type"]: change for change in changes}
+    assert by_type["news"]["data"]["title"] == "Renamed"
+    assert by_type["author"]["data"]["user"]["username"] == "renamed"
+    assert by_type["comment"]["data"] is None
+
+
+@pytest.mark.django_db
+def test_unpublish_and_reply_cascade_seen_as_deletes_good(api_client, comment, news, author):
+    # GOOD: Снятие с публикации и каскадное удаление ответов видны как delete
+    reply = Comment.objects.create(news=news, user=author.user, text="Reply", parent=comment)
+    _, token = drain(api_client)
+
+    api_client.force_authenticate(author.user)
+    api_client.delete(reverse("comments:comment-detail", args=[comment.id]))
+    api_client.post(reverse("news:news-unpublish", args=[news.id]))
+    api_client.force_authenticate(None)
+
+    changes, _ = drain(api_client, token)
+
+    assert sorted(keys(changes)) == sorted([
+        ("comment", "delete", comment.id),
+        ("comment", "delete", reply.id),
+        ("news", "delete", news.id),
+    ])
+
+
+@pytest.mark.django_db
+def test_unpublished_news_comments_seen_as_deletes_good(api_client, comment, news, author):
+    # GOOD: Комментарии снятой с публикации новости уходят как delete
+    _, token = drain(api_client)
+
+    api_client.force_authenticate(author.user)
+    api_client.post(reverse("news:news-unpublish", args=[news.id]))
+    api_client.force_authenticate(None)
+
+    changes, _ = drain(api_client, token)
+
+    assert sorted(keys(changes)) == sorted([
+        ("comment", "delete", comment.id),
+        ("news", "delete", news.id),
+    ])
+
+
+@pytest.mark.django_db
+def test_saved_draft_comments_seen_as_deletes_good(api_client, comment, news):
+    # GOOD: То же при save() новости, а не QuerySet.update()
+    _, token = drain(api_client)
+
+    news.is_published = False
+    news.save()
+
+    changes, _ = drain(api_client, token)
+
+    assert ("comment", "delete", comment.id) in keys(changes)
+
+
+@pytest.mark.django_db
+def test_author_email_change_resends_news_good(api_client, news, author):
+    # GOOD: Смена почты автора заново отправляет его новости с новой почтой
+    _, token = drain(api_client)
+
+    author.user.email = "renamed@test.com"
+    author.user.save(update_fields=["email"])
+
+    changes, _ = drain(api_client, token)
+    resent = [change for change in changes if change["type"] == "news"]
+
+    assert keys(resent) == [("news", "upsert", news.id)]
+    assert resent[0]["data"]["author"]["email"] == "renamed@test.com"
+
+
+@pytest.mark.django_db
+def test_news_without_card_serialized_directly_good(api_client, news):
+    # GOOD: Новость без карточки всё равно попадает в ленту изменений
+    payload = NewsCard.objects.get(news=news).payload
+    NewsCard.objects.filter(news=news).delete()
+
+    changes = sync(api_client)["changes"]
+
+    assert [change["data"] for change in changes if change["type"] == "news"] == [payload]
+
+
+@pytest.mark.django_db
+def test_recent_rows_wait_to_settle_good(api_client, news, settings):
+    # GOOD: Слишком свежие записи откладываются до следующего запроса
+    settings.CHANGES = {**settings.CHANGES, "SETTLE_SECONDS": 3600}
+
+    assert sync(api_client)["changes"] == []
+
+
+@pytest.mark.django_db
+def test_invalid_token_bad(api_client):
+    # BAD: Испорченный токен — 400
+    response = api_client.get(reverse("changes"), {"since": "not-a-token"})
+
+    assert response.status_code == 400
+    assert "since" in response.data
@@ -151,4 +151,38 @@ def test_delete_comment_bad_not_found(api_client, user):
 
     response = api_client.delete(url)
 
-    assert response.status_code == status.HTTP_404_NOT_FOUND
\ No newline at end of file
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+# Nested users
+
+@pytest.mark.django_db
+def test_comment_list_public_user_good(api_client, user, news, comment):
+    # GOOD: Во вложенном пользователе только публичные поля
+    url = reverse("comments:comment-list")
+    response = api_client.get(url, {"news_id": news.id})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data[0]["user"] == {
+        "id": user.id,
+        "username": user.username,
+        "display_name": user.username,
+        "is_author": True,
+    }
+
+
+@pytest.mark.django_db
+def test_comment_list_no_per_row_queries(
+    api_client, user, another_user, news, django_assert_num_queries
+):
+    # GOOD: Количество запросов не зависит от числа комментариев
+    for i in range(10):
+        parent = Comment.objects.create(user=user if i % 2 else another_user, news=news, text="c")
+        if i % 3 == 0:
+            Comment.objects.create(user=user, news=news, text="r", parent=parent)
+
+    url = reverse("comments:comment-list")
+    with django_assert_num_queries(1):
+        response = api_client.get(url, {"news_id": news.id})
+
+    assert len(response.data) == 10
+    assert [c["has_replies"] for c in response.data] == [i % 3 == 0 for i in range(10)]
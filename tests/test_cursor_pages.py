@@ -0,0 +1,119 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.accounts.models import User, Author
+from apps.comments.models import Comment
+from apps.news.models import News, NewsCard, Category
+
+
+@pytest.fixture(autouse=True)
+def _small_pages(settings):
+    settings.PAGINATION = {**settings.PAGINATION, "CURSOR_PAGE_SIZE": 2}
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    return Author.objects.create(user=user)
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(name="General")
+
+
+@pytest.fixture
+def many_news(author, category):
+    news = [
+        News.objects.create(title=f"Title {i}", content=f"Body {i}", category=category, author=author)
+        for i in range(5)
+    ]
+    # Equal published_at: pages must still split and join them exactly.
+    tie = news[0].published_at
+    News.objects.filter(pk__in=[news[1].pk, news[2].pk, news[3].pk]).update(published_at=tie)
+    NewsCard.objects.filter(news_id__in=[news[1].pk, news[2].pk, news[3].pk]).update(published_at=tie)
+    return news
+
+
+def get_json(client, url):
+    response = client.get(url, HTTP_ACCEPT="application/json")
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.django_db
+def test_json_pages_forward_and_back_good(client, many_news):
+    # GOOD: Курсорные страницы JSON проходят список без пропусков и повторов в обе стороны
+    pages, url = [], reverse("news:news_list")
+    while url:
+        data = get_json(client, url)
+        pages.append([item["id"] for item in data["results"]])
+        url = data["next"]
+
+    back, url = [], data["previous"]
+    while url:
+        data = get_json(client, url)
+        back.insert(0, [item["id"] for item in data["results"]])
+        url = data["previous"]
+
+    expected = [n.id for n in sorted(many_news, key=lambda n: (n.published_at, n.id), reverse=True)]
+    assert [pk for page in pages for pk in page] == expected
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert back == pages[:-1]
+
+
+@pytest.mark.django_db
+def test_html_page_links_and_no_content_loaded_good(client, many_news, category):
+    # GOOD: HTML-страница категории отдаёт ссылки и не читает content
+    first = client.get(reverse("news:news_by_category", args=[category.id]), {"x": "1"})
+    next_url = first.context["news"].next_url
+
+    with CaptureQueriesContext(connection) as queries:
+        second = client.get(next_url)
+
+    assert 'rel="next"' in first.content.decode() and 'rel="prev"' not in first.content.decode()
+    assert 'rel="prev"' in second.content.decode()
+    assert "x=1" in next_url
+    assert not any('"news_news"."content"' in query["sql"] for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_category_and_author_lists_paginated_good(client, author, category):
+    # GOOD: Списки категорий и авторов тоже постраничные
+    for name in ("B", "C"):
+        Category.objects.create(name=name)
+
+    categories = get_json(client, reverse("news:category_list"))
+    authors = get_json(client, reverse("accounts:author_list"))
+
+    assert [item["name"] for item in categories["results"]] == ["B", "C"]
+    assert get_json(client, categories["next"])["results"][0]["name"] == "General"
+    assert authors["next"] is None and len(authors["results"]) == 1
+
+
+@pytest.mark.django_db
+def test_my_comments_constant_queries_good(client, many_news, author, django_assert_max_num_queries):
+    # GOOD: «Мои комментарии» — страница за фиксированное число запросов
+    parent = Comment.objects.create(news=many_news[0], user=author.user, text="parent")
+    for news in many_news:
+        Comment.objects.create(news=news, user=author.user, text="reply", parent=parent)
+    client.force_login(author.user)
+
+    with django_assert_max_num_queries(4):
+        response = client.get(reverse("comments:my_comments_list"))
+
+    assert len(response.context["comments"]) == 2
+    assert response.context["comments"].has_next
+
+
+@pytest.mark.django_db
+def test_garbage_cursor_falls_back_to_first_page_bad(client, many_news):
+    # BAD: Испорченный курсор — первая страница, а не ошибка
+    first = get_json(client, reverse("news:news_list"))
+
+    for cursor in ("garbage", "WzEsMl0", "W3RydWUsICJ4IiwgMV0"):
+        data = get_json(client, reverse("news:news_list") + f"?cursor={cursor}")
+        assert data["results"] == first["results"]
+        assert data["previous"] is None
@@ -0,0 +1,140 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, Author
+from apps.news import duplicates
+from apps.news.models import News, NewsFingerprint, Category
+
+WIRE = (
+    "Национальный банк сохранил базовую ставку на уровне 14,25 процента. "
+    "Решение принято с учётом замедления инфляции и ожиданий участников рынка. "
+    "Следующее заседание по ставке запланировано на конец квартала, сообщает пресс-служба."
+)
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def author_user(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    Author.objects.create(user=user)
+    return user
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(name="Economy")
+
+
+@pytest.fixture
+def original(author_user, category):
+    return News.objects.create(
+        title="Ставка сохранена",
+        content=WIRE,
+        category=category,
+        author=author_user.author_profile,
+    )
+
+
+def test_simhash_close_for_small_edits_good():
+    # GOOD: Небольшая правка текста меняет лишь несколько бит
+    edited = WIRE.replace("сообщает пресс-служба", "сообщает пресс служба банка")
+    other = "Футбольный клуб подписал контракт с новым нападающим до конца сезона."
+
+    assert duplicates.distance(duplicates.simhash(WIRE), duplicates.simhash(edited)) <= 12
+    assert duplicates.distance(duplicates.simhash(WIRE), duplicates.simhash(other)) > 12
+
+
+@pytest.mark.django_db
+def test_fingerprint_stored_on_save_good(original):
+    # GOOD: Отпечаток и его полосы сохраняются вместе с новостью
+    value = duplicates.simhash(WIRE)
+    row = NewsFingerprint.objects.get(news=original)
+
+    assert row.simhash & (2 ** 64 - 1) == value
+    assert [row.band_0, row.band_1, row.band_2, row.band_3] == duplicates.bands(value)
+
+
+@pytest.mark.django_db
+def test_create_reports_near_duplicate_good(api_client, author_user, category, original):
+    # GOOD: Повтор агентской заметки возвращается в near_duplicates
+    api_client.force_authenticate(author_user)
+    response = api_client.post(
+        reverse("news:news-list"),
+        {"title": "Нацбанк не изменил ставку", "content": WIRE, "category": category.id},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["near_duplicates"] == [
+        {"id": original.id, "title": original.title, "distance": 0}
+    ]
+
+
+@pytest.mark.django_db
+def test_publish_reports_near_duplicate_good(api_client, author_user, category, original):
+    # GOOD: Публикация черновика-дубликата тоже предупреждает
+    draft = News.objects.create(
+        title="Черновик",
+        content=WIRE,
+        category=category,
+        author=author_user.author_profile,
+        is_published=False,
+    )
+    api_client.force_authenticate(author_user)
+
+    response = api_client.post(reverse("news:news-publish", args=[draft.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data["near_duplicates"]] == [original.id]
+
+
+@pytest.mark.django_db
+def test_distinct_or_unpublished_news_not_reported_bad(author_user, category, original):
+    # BAD: Разные тексты и неопубликованные новости не считаются дубликатами
+    other = News.objects.create(
+        title="Трансфер",
+        content="Футбольный клуб подписал контракт с новым нападающим до конца сезона.",
+        category=category,
+        author=author_user.author_profile,
+    )
+    News.objects.create(
+        title="Черновик",
+        content=WIRE,
+        category=category,
+        author=author_user.author_profile,
+        is_published=False,
+    )
+
+    assert duplicates.near_duplicates(other.id) == []
+    assert duplicates.near_duplicates(original.id) == []
+
+
+@pytest.mark.django_db
+def test_content_update_refreshes_fingerprint_good(api_client, author_user, original):
+    # GOOD: Изменение текста через API пересчитывает отпечаток
+    api_client.force_authenticate(author_user)
+    api_client.patch(
+        reverse("news:news-detail", args=[original.id]),
+        {"content": "Совсем другой текст о погоде на выходных."},
+        format="json",
+    )
+
+    value = duplicates.simhash("Совсем другой текст о погоде на выходных.")
+    assert NewsFingerprint.objects.get(news=original).simhash & (2 ** 64 - 1) == value
+
+
+@pytest.mark.django_db
+def test_build_fingerprints_command_good(original):
+    # GOOD: Команда заполняет отпечатки для существующих новостей
+    NewsFingerprint.objects.all().delete()
+
+    call_command("build_fingerprints")
+
+    assert NewsFingerprint.objects.filter(news=original).exists()
@@ -0,0 +1,125 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.comments.models import Comment
+from apps.news.models import News, Category
+from apps.accounts.models import User, Author
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def staff_user(db):
+    return User.objects.create_user(
+        email="staff@test.com",
+        password="password123",
+        is_staff=True,
+    )
+
+@pytest.fixture
+def author_user(db):
+    user = User.objects.create_user(
+        email="author@test.com",
+        password="password123",
+    )
+    Author.objects.create(user=user)
+    return user
+
+@pytest.fixture
+def news(db, author_user):
+    category = Category.objects.create(name="Technology")
+    return News.objects.create(
+        title="Test news",
+        content="Content",
+        category=category,
+        author=author_user.author_profile,
+    )
+
+@pytest.fixture
+def thread(db, author_user, news):
+    root = Comment.objects.create(user=author_user, news=news, text="root")
+    reply = Comment.objects.create(user=author_user, news=news, text="reply", parent=root)
+    nested = Comment.objects.create(user=author_user, news=news, text="nested", parent=reply)
+    return root, reply, nested
+
+# GET /news/api/export/{dataset}/
+
+@pytest.mark.django_db
+def test_export_news_ndjson_good(api_client, staff_user, news):
+    # GOOD: Сотрудник получает NDJSON с категорией и автором
+    api_client.force_authenticate(staff_user)
+    url = reverse("news:export-detail", args=["news"])
+
+    response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["X-Export-Watermark"]
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert rows[0]["id"] == news.id
+    assert rows[0]["category_name"] == "Technology"
+    assert rows[0]["author_email"] == "author@test.com"
+
+
+@pytest.mark.django_db
+def test_export_comments_thread_path_good(api_client, staff_user, thread):
+    # GOOD: Комментарии выгружаются с путём в дереве
+    root, reply, nested = thread
+    api_client.force_authenticate(staff_user)
+    url = reverse("news:export-detail", args=["comments"]) + "?fmt=csv"
+
+    response = api_client.get(url)
+
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0].startswith("id,news_id,user_id,parent_id,thread_path")
+    assert lines[3].split(",")[4] == f"{root.id}/{reply.id}/{nested.id}"
+
+
+@pytest.mark.django_db
+def test_export_since_watermark_good(api_client, staff_user, news):
+    # GOOD: Инкрементальная выгрузка после watermark пуста
+    api_client.force_authenticate(staff_user)
+    url = reverse("news:export-detail", args=["news"])
+    watermark = api_client.get(url)["X-Export-Watermark"]
+
+    response = api_client.get(url, {"since": watermark})
+
+    assert b"".join(response.streaming_content) == b""
+
+
+@pytest.mark.django_db
+def test_export_bad_not_staff(api_client, author_user):
+    # BAD: Обычный пользователь не может выгружать данные
+    api_client.force_authenticate(author_user)
+    url = reverse("news:export-detail", args=["news"])
+
+    response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_export_bad_unknown_dataset(api_client, staff_user):
+    # BAD: Неизвестный набор данных
+    api_client.force_authenticate(staff_user)
+    url = reverse("news:export-detail", args=["passwords"])
+
+    response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_export_command_good(tmp_path, news):
+    # GOOD: Команда пишет выгрузку в файл
+    output = tmp_path / "news.ndjson"
+
+    call_command("export_content", "news", output=str(output), stderr=io.StringIO())
+
+    assert json.loads(output.read_text())["title"] == "Test news"
@@ -0,0 +1,146 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, Author
+from apps.news import feeds
+from apps.news.models import News, Category
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    return Author.objects.create(user=user)
+
+
+@pytest.fixture
+def sport(db):
+    return Category.objects.create(name="Sport")
+
+
+@pytest.fixture
+def politics(db):
+    return Category.objects.create(name="Politics")
+
+
+def create_news(category, author=None, title="News", is_published=True):
+    return News.objects.create(
+        title=title,
+        content="Content",
+        category=category,
+        author=author,
+        is_published=is_published,
+    )
+
+
+def month():
+    return feeds.month_of(timezone.now())
+
+
+def built_at(key, ext):
+    return (feeds.artifact_dir() / f"{key}.{ext}").stat().st_mtime_ns
+
+
+@pytest.mark.django_db
+def test_sitemap_index_and_month_shard_good(client, sport):
+    # GOOD: Индекс ссылается на месячный шард, в шарде только опубликованные новости
+    published = create_news(sport, title="Published")
+    draft = create_news(sport, title="Draft", is_published=False)
+
+    index = client.get(reverse("sitemap"))
+    shard = client.get(reverse("sitemap_month", args=[month()]))
+
+    assert index.status_code == 200
+    assert index["Content-Type"].startswith("application/xml")
+    assert f"/sitemaps/{month()}.xml</loc>" in index.content.decode()
+    assert f"/news/{published.id}/</loc>" in shard.content.decode()
+    assert f"/news/{draft.id}/</loc>" not in shard.content.decode()
+
+
+@pytest.mark.django_db
+def test_category_and_author_feeds_good(client, sport, politics, author):
+    # GOOD: Лента категории и автора содержит только их новости
+    mine = create_news(sport, author, title="Match report")
+    create_news(politics, title="Elections")
+
+    rss = client.get(reverse("feed", args=[f"category-{sport.id}", "rss"])).content.decode()
+    atom = client.get(reverse("feed", args=[f"author-{author.id}", "atom"]))
+
+    assert "Match report" in rss and "Elections" not in rss
+    assert atom["Content-Type"].startswith("application/atom+xml")
+    assert f"/news/{mine.id}/" in atom.content.decode()
+    assert "Elections" not in atom.content.decode()
+
+
+@pytest.mark.django_db
+def test_conditional_get_not_modified_good(client, sport):
+    # GOOD: Повторный запрос с ETag или If-Modified-Since — 304 без тела
+    create_news(sport)
+    first = client.get(reverse("feed", args=["news", "rss"]))
+
+    by_etag = client.get(reverse("feed", args=["news", "rss"]), HTTP_IF_NONE_MATCH=first["ETag"])
+    by_date = client.get(
+        reverse("feed", args=["news", "rss"]), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+    )
+
+    assert first.status_code == 200
+    assert by_etag.status_code == 304 and by_etag.content == b""
+    assert by_date.status_code == 304
+
+
+@pytest.mark.django_db
+def test_unpublish_rebuilds_only_affected_artifacts_good(
+    api_client, sport, politics, author, django_capture_on_commit_callbacks
+):
+    # GOOD: Снятие с публикации перестраивает только затронутые шарды и ленты
+    news = create_news(sport, author, title="Match report")
+    create_news(politics, title="Elections")
+    for key in feeds.all_keys():
+        feeds.build(key)
+    before = {
+        key: built_at(key, ext)
+        for key, ext in [("news", "rss"), (f"category-{politics.id}", "rss")]
+    }
+
+    api_client.force_authenticate(author.user)
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(reverse("news:news-unpublish", args=[news.id]))
+
+    global_feed = api_client.get(reverse("feed", args=["news", "rss"])).content.decode()
+    api_client.get(reverse("feed", args=[f"category-{politics.id}", "rss"]))
+    sport_feed = api_client.get(reverse("feed", args=[f"category-{sport.id}", "rss"]))
+
+    assert "Match report" not in global_feed
+    assert built_at("news", "rss") > before["news"]
+    assert built_at(f"category-{politics.id}", "rss") == before[f"category-{politics.id}"]
+    assert "Match report" not in sport_feed.content.decode()
+
+
+@pytest.mark.django_db
+def test_build_racing_with_invalidation_is_redone_good(client, sport):
+    # GOOD: Сборка, начатая до инвалидации, считается устаревшей
+    create_news(sport)
+    feeds.build("news")
+    feeds.invalidate({"news"})
+    stale = built_at("news", "rss")
+
+    client.get(reverse("feed", args=["news", "rss"]))
+
+    assert built_at("news", "rss") > stale
+
+
+@pytest.mark.django_db
+def test_unknown_feed_and_empty_month_bad(client, sport):
+    # BAD: Несуществующая категория и пустой месяц — 404
+    create_news(sport)
+
+    assert client.get(reverse("feed", args=["category-9999", "rss"])).status_code == 404
+    assert client.get(reverse("feed", args=["tag-1", "rss"])).status_code == 404
+    assert client.get(reverse("sitemap_month", args=["1999-01"])).status_code == 404
+    assert client.get(reverse("sitemap_month", args=["2024-13"])).status_code == 404
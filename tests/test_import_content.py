@@ -0,0 +1,156 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from apps.comments.models import Comment
+from apps.news.models import News, Category, ImportCheckpoint
+from apps.accounts.models import User, Author
+from apps.news.imports import ContentImporter, iter_records
+from apps.news.signals import content_imported
+
+RECORDS = [
+    {"type": "category", "id": 1, "name": "Politics"},
+    {"type": "author", "id": 7, "email": "writer@legacy.kz", "description": "Old"},
+    {
+        "type": "news", "id": 100, "title": "Archive", "content": "Text",
+        "category_id": 1, "author_id": 7, "created_at": "2015-03-01T10:00:00",
+    },
+    {"type": "comment", "id": 500, "news_id": 100, "user_email": "reader@legacy.kz", "text": "First"},
+    {"type": "comment", "id": 501, "news_id": 100, "user_email": "reader@legacy.kz", "text": "Reply", "parent_id": 500},
+]
+
+@pytest.fixture
+def ndjson_file(tmp_path):
+    path = tmp_path / "legacy.ndjson"
+    path.write_text("".join(json.dumps(record) + "\n" for record in RECORDS))
+    return path
+
+# manage.py import_content
+
+@pytest.mark.django_db
+def test_import_content_good(ndjson_file):
+    # GOOD: Все записи импортированы, ссылки разрешены через карты id
+    call_command("import_content", str(ndjson_file), stdout=io.StringIO())
+
+    news = News.objects.get(title="Archive")
+    assert news.category == Category.objects.get(name="Politics")
+    assert news.author == Author.objects.get(user__email="writer@legacy.kz")
+    assert news.created_at.year == 2015
+
+    reply = Comment.objects.get(text="Reply")
+    assert reply.parent.text == "First"
+    assert reply.user == User.objects.get(email="reader@legacy.kz")
+
+
+@pytest.mark.django_db
+def test_import_content_bumps_updated_at_good(ndjson_file):
+    # GOOD: Импортированные записи получают свежий updated_at и попадают в ленту изменений
+    before = timezone.now()
+    call_command("import_content", str(ndjson_file), stdout=io.StringIO())
+
+    assert News.objects.get(title="Archive").updated_at >= before
+    assert not Comment.objects.filter(updated_at__lt=before).exists()
+
+
+@pytest.mark.django_db
+def test_import_content_resume_good(ndjson_file):
+    # GOOD: Повторный запуск продолжает с контрольной точки и ничего не дублирует
+    call_command("import_content", str(ndjson_file), stdout=io.StringIO())
+    call_command("import_content", str(ndjson_file), stdout=io.StringIO())
+
+    assert News.objects.count() == 1
+    assert Comment.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_import_content_checkpoint_keeps_maps_aside_good(ndjson_file):
+    # GOOD: Карты id пишутся в отдельный файл, контрольная точка остаётся маленькой
+    call_command("import_content", str(ndjson_file), stdout=io.StringIO())
+
+    checkpoint = ndjson_file.parent / "legacy.ndjson.checkpoint"
+    state = ImportCheckpoint.objects.get(name=str(checkpoint)).state
+    assert "maps" not in state
+
+    importer = ContentImporter()
+    importer.load_checkpoint(checkpoint)
+    assert importer.maps["news"] == {100: News.objects.get(title="Archive").id}
+    assert set(importer.maps["comment"]) == {500, 501}
+
+
+@pytest.mark.django_db
+def test_import_content_checkpoint_commits_with_rows_bad(ndjson_file, monkeypatch):
+    # BAD: Сбой при записи контрольной точки откатывает и записи пачки
+    def fail(*args, **kwargs):
+        raise DatabaseError("disk I/O error")
+
+    monkeypatch.setattr(ImportCheckpoint.objects, "update_or_create", fail)
+    with pytest.raises(DatabaseError):
+        call_command("import_content", str(ndjson_file), stdout=io.StringIO())
+
+    assert News.objects.count() == 0
+    assert Comment.objects.count() == 0
+    assert not ImportCheckpoint.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_content_bad_unknown_type(tmp_path):
+    # BAD: Записи неизвестного типа пропускаются
+    path = tmp_path / "legacy.ndjson"
+    path.write_text(json.dumps({"type": "poll", "id": 1}) + "\n")
+    out = io.StringIO()
+
+    call_command("import_content", str(path), stdout=out)
+
+    assert "skipped: 1" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_content_resume_keeps_imported_ranges_good(ndjson_file):
+    # GOOD: После возобновления content_imported охватывает и записи до сбоя
+    lines = ndjson_file.read_text().splitlines(keepends=True)
+    head = ndjson_file.parent / "head.ndjson"
+    head.write_text("".join(lines[:3]))
+    importer = ContentImporter()
+    with head.open("rb") as fh:
+        for record, offset in iter_records(fh):
+            importer.feed(record)
+    checkpoint = ndjson_file.parent / "legacy.ndjson.checkpoint"
+    importer.flush(checkpoint, offset)
+
+    received = []
+    def receiver(sender, news_ids, comment_ids, **kwargs):
+        received.append((news_ids, comment_ids))
+    content_imported.connect(receiver)
+    try:
+        call_command("import_content", str(ndjson_file), stdout=io.StringIO())
+    finally:
+        content_imported.disconnect(receiver)
+
+    news_id = News.objects.get(title="Archive").id
+    news_ids, comment_ids = received[-1]
+    assert news_ids == (news_id, news_id)
+    assert comment_ids is not None
+
+
+@pytest.mark.django_db
+def test_import_content_restores_indexes_of_killed_run_good(ndjson_file):
+    # GOOD: Индексы, удалённые прерванным импортом, восстанавливаются при следующем запуске
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name = 'news_updated_idx'"
+        )
+        index = list(cursor.fetchone())
+        cursor.execute('DROP INDEX "news_updated_idx"')
+    pending = ndjson_file.parent / "legacy.ndjson.checkpoint.indexes"
+    pending.write_text(json.dumps([index]))
+
+    call_command("import_content", str(ndjson_file), stdout=io.StringIO())
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'news_updated_idx'")
+        assert cursor.fetchone() is not None
+    assert not pending.exists()
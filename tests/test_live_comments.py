@@ -0,0 +1,179 @@
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.management import call_command
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.comments import live
+from apps.comments.models import Comment
+from apps.news.models import News, Category
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(email="user@test.com", password="password123")
+
+
+@pytest.fixture
+def news(db):
+    return News.objects.create(
+        title="Test news",
+        content="Content",
+        category=Category.objects.create(name="General"),
+    )
+
+
+def frame(event_id):
+    return live.Event(event_id, f"id: {event_id}\nevent: comment\ndata: {{}}\n\n".encode())
+
+
+@pytest.mark.django_db
+def test_publish_from_other_thread_reaches_subscriber_good(news):
+    # GOOD: Событие из другого потока доходит до подписчика в event loop
+    async def scenario():
+        subscription = live.broker.subscribe(news.id)
+        await sync_to_async(live.broker.publish, thread_sensitive=False)(news.id, frame(7))
+        return await subscription.get(1)
+
+    assert async_to_sync(scenario)().id == 7
+
+
+@pytest.mark.django_db
+def test_stream_replays_after_last_event_id_then_goes_live_good(news, user):
+    # GOOD: Переподключение догоняет пропущенное, затем идут живые события без повторов
+    first = Comment.objects.create(news=news, user=user, text="first")
+    second = Comment.objects.create(news=news, user=user, text="second")
+
+    async def scenario():
+        stream = live.stream(news.id, first.id)
+        frames = [await anext(stream), await anext(stream)]
+        live.broker.publish(news.id, frame(second.id))
+        live.broker.publish(news.id, frame(second.id + 100))
+        frames.append(await anext(stream))
+        await stream.aclose()
+        return frames
+
+    retry, replayed, live_frame = async_to_sync(scenario)()
+
+    assert retry.startswith(b"retry:")
+    assert replayed.startswith(f"id: {second.id}\n".encode())
+    assert '"text": "second"' in replayed.decode()
+    assert live_frame == frame(second.id + 100).frame
+    assert live.broker.subscribers == 0
+
+
+@pytest.mark.django_db
+def test_saved_comment_is_published_on_commit_good(news, user, django_capture_on_commit_callbacks):
+    # GOOD: Новый ответ публикуется подписчикам после коммита
+    parent = Comment.objects.create(news=news, user=user, text="parent")
+
+    def reply():
+        with django_capture_on_commit_callbacks(execute=True):
+            return Comment.objects.create(news=news, user=user, text="reply", parent=parent)
+
+    async def scenario():
+        subscription = live.broker.subscribe(news.id)
+        created = await sync_to_async(reply)()
+        return created, await subscription.get(1)
+
+    created, event = async_to_sync(scenario)()
+
+    assert event.id == created.id
+    assert f'"parent": {parent.id}' in event.frame.decode()
+
+
+@pytest.mark.django_db
+def test_slow_subscriber_overflows_bad(news, settings):
+    # BAD: Переполненная очередь закрывает поток, клиент переподключится
+    settings.LIVE_COMMENTS = {**settings.LIVE_COMMENTS, "QUEUE_SIZE": 2}
+
+    async def scenario():
+        subscription = live.broker.subscribe(news.id)
+        for event_id in (1, 2, 3):
+            subscription.put(frame(event_id))
+        return await subscription.get(1)
+
+    assert async_to_sync(scenario)() is None
+
+
+def test_bridge_relays_between_workers_good(tmp_path):
+    # GOOD: Мост передаёт события другому процессу на той же машине
+    received, arrived = [], threading.Event()
+
+    def deliver(news_id, event):
+        received.append((news_id, event))
+        arrived.set()
+
+    sender = live.LocalBridge(tmp_path, deliver=lambda *args: None, name="a")
+    receiver = live.LocalBridge(tmp_path, deliver=deliver, name="b")
+    sender.start()
+    receiver.start()
+    try:
+        sender.send(5, frame(9))
+        assert arrived.wait(2)
+    finally:
+        sender.close()
+        receiver.close()
+
+    assert received == [(5, frame(9))]
+
+
+@pytest.mark.django_db
+def test_stream_unknown_news_bad(client):
+    # BAD: Поток для несуществующей новости — 404
+    response = client.get(reverse("comments:comment_stream", args=[9999]))
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_stream_unpublished_news_bad(client, news, settings):
+    # BAD: Поток для черновика — 404, комментарии неопубликованной новости не раскрываются
+    settings.LIVE_COMMENTS = {**settings.LIVE_COMMENTS, "ENABLED": True}
+    News.objects.filter(pk=news.pk).update(is_published=False)
+
+    response = client.get(reverse("comments:comment_stream", args=[news.id]))
+
+    assert response.status_code == 404
+    assert live.broker.subscribers == 0
+
+
+@pytest.mark.django_db
+def test_stream_under_wsgi_bad(client, news, settings):
+    # BAD: Под WSGI поток не открывается — 204, и браузер не переподключается
+    settings.LIVE_COMMENTS = {**settings.LIVE_COMMENTS, "ENABLED": True}
+
+    response = client.get(reverse("comments:comment_stream", args=[news.id]))
+
+    assert response.status_code == 204
+    assert live.broker.subscribers == 0
+
+
+@pytest.mark.django_db
+def test_stream_script_only_when_enabled_good(client, news, settings):
+    # GOOD: Страница новости подключает EventSource только при включённом потоке
+    url = reverse("news:news_detail", args=[news.id])
+    settings.LIVE_COMMENTS = {**settings.LIVE_COMMENTS, "ENABLED": False}
+    assert "EventSource(" not in client.get(url).content.decode()
+
+    settings.LIVE_COMMENTS = {**settings.LIVE_COMMENTS, "ENABLED": True}
+    # Готовые страницы после смены настроек перерисовывает prerender_pages.
+    call_command("prerender_pages")
+    assert "EventSource(" in client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_stream_over_capacity_bad(async_client, news, settings):
+    # BAD: Сверх MAX_SUBSCRIBERS — 503 с Retry-After
+    settings.LIVE_COMMENTS = {
+        **settings.LIVE_COMMENTS, "ENABLED": True, "MAX_SUBSCRIBERS": 0,
+    }
+
+    response = async_to_sync(async_client.get)(
+        reverse("comments:comment_stream", args=[news.id])
+    )
+
+    assert response.status_code == 503
+    assert response["Retry-After"] == "3"
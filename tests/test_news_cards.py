@@ -0,0 +1,97 @@
+import importlib
+
+import pytest
+from django.apps import apps
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.news.models import News, NewsCard, Category
+from apps.accounts.models import User, Author
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def author_user(db):
+    user = User.objects.create_user(
+        email="author@test.com",
+        password="password123",
+    )
+    Author.objects.create(user=user)
+    return user
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(name="Technology")
+
+@pytest.fixture
+def news(db, author_user, category):
+    return News.objects.create(
+        title="Test news",
+        content="Content",
+        category=category,
+        author=author_user.author_profile,
+    )
+
+
+@pytest.mark.django_db
+def test_card_created_with_news_good(news):
+    # GOOD: Карточка создаётся вместе с новостью
+    card = NewsCard.objects.get(news=news)
+
+    assert card.payload["title"] == "Test news"
+    assert card.payload["category_name"] == "Technology"
+    assert card.payload["author"]["email"] == "author@test.com"
+
+
+@pytest.mark.django_db
+def test_card_refreshed_on_category_rename_good(news, category):
+    # GOOD: Переименование категории обновляет карточки
+    category.name = "Science"
+    category.save()
+
+    assert NewsCard.objects.get(news=news).payload["category_name"] == "Science"
+
+
+@pytest.mark.django_db
+def test_card_refreshed_on_author_email_change_good(news, author_user):
+    # GOOD: Смена email автора обновляет карточки
+    author_user.email = "renamed@test.com"
+    author_user.save()
+
+    assert NewsCard.objects.get(news=news).payload["author"]["email"] == "renamed@test.com"
+
+
+@pytest.mark.django_db
+def test_category_news_cards_good(api_client, news, category, django_assert_num_queries):
+    # GOOD: Список собирается из карточек без join'ов (категория + карточки)
+    url = reverse("news:category-news", args=[category.id])
+
+    with django_assert_num_queries(2):
+        response = api_client.get(url)
+
+    assert response.data[0]["id"] == news.id
+
+
+@pytest.mark.django_db
+def test_category_news_bad_soft_deleted(api_client, news, category):
+    # BAD: Удалённая новость не попадает в список
+    news.delete()
+    url = reverse("news:category-news", args=[category.id])
+
+    response = api_client.get(url)
+
+    assert response.data == []
+
+
+@pytest.mark.django_db
+def test_migration_backfill_matches_live_cards_good(news):
+    # GOOD: Миграция заполняет карточки так же, как живой сериализатор
+    backfill = importlib.import_module("apps.news.migrations.0012_backfill_news_cards")
+    live = NewsCard.objects.get(news=news).payload
+    NewsCard.objects.all().delete()
+
+    backfill.backfill_cards(apps, None)
+
+    assert NewsCard.objects.get(news=news).payload == live
@@ -0,0 +1,175 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.abstracts.pagination import ApproximatePageNumberPagination
+from apps.accounts.models import User, Author
+from apps.news.filters import filter_cards
+from apps.news.models import News, NewsCard, Category
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    return Author.objects.create(user=user)
+
+
+@pytest.fixture
+def categories(db):
+    return [Category.objects.create(name=name) for name in ("Tech", "Sport", "Culture")]
+
+
+@pytest.fixture
+def feed(author, categories):
+    # Девять новостей, по одной в день, категории по кругу.
+    news = []
+    for i in range(9):
+        item = News.objects.create(
+            title=f"Title {i}",
+            content="Content",
+            category=categories[i % 3],
+            author=author,
+        )
+        NewsCard.objects.filter(news=item).update(
+            created_at=datetime(2025, 1, i + 1, 12, tzinfo=dt_timezone.utc)
+        )
+        news.append(item)
+    return news
+
+
+def ids(data):
+    return [card["id"] for card in data]
+
+
+@pytest.mark.django_db
+def test_list_without_params_returns_published_good(api_client, feed):
+    # GOOD: Без параметров аноним видит все опубликованные новости
+    response = api_client.get(reverse("news:news-list"))
+
+    assert response.status_code == 200
+    assert ids(response.data) == [n.id for n in reversed(feed)]
+
+
+@pytest.mark.django_db
+def test_list_without_page_is_first_page_bad(api_client, feed, monkeypatch):
+    # BAD: Без ?page список не отдаёт все строки — только первую страницу
+    monkeypatch.setattr(ApproximatePageNumberPagination, "page_size", 4)
+
+    response = api_client.get(reverse("news:news-list"))
+
+    assert ids(response.data) == [n.id for n in reversed(feed)][:4]
+
+
+@pytest.mark.django_db
+def test_same_timestamp_ordered_by_id_good(api_client, feed, categories):
+    # GOOD: Новости с одинаковым created_at упорядочены по id, в том числе при слиянии категорий
+    NewsCard.objects.update(created_at=datetime(2025, 1, 1, 12, tzinfo=dt_timezone.utc))
+    base = reverse("news:news-list")
+    merged = [n.id for n in feed if n.category_id != categories[2].id]
+
+    newest = api_client.get(base)
+    oldest = api_client.get(base + "?ordering=created_at")
+    both = api_client.get(f"{base}?category_id={categories[0].id},{categories[1].id}")
+
+    assert ids(newest.data) == [n.id for n in reversed(feed)]
+    assert ids(oldest.data) == [n.id for n in feed]
+    assert ids(both.data) == merged[::-1]
+
+
+@pytest.mark.django_db
+def test_date_range_is_inclusive_by_day_good(api_client, feed):
+    # GOOD: date_to включает весь день, date_from — с начала дня
+    NewsCard.objects.filter(news=feed[4]).update(
+        created_at=datetime(2025, 1, 5, 23, 59, 59, tzinfo=dt_timezone.utc)
+    )
+    url = reverse("news:news-list") + "?date_from=2025-01-03&date_to=2025-01-05"
+    response = api_client.get(url)
+
+    assert ids(response.data) == [feed[4].id, feed[3].id, feed[2].id]
+
+
+@pytest.mark.django_db
+def test_multiple_categories_are_merged_in_order_good(api_client, feed, categories):
+    # GOOD: Несколько категорий (повтором и через запятую) сливаются по дате
+    expected = [n.id for n in reversed(feed) if n.category_id != categories[2].id]
+    base = reverse("news:news-list")
+
+    repeated = api_client.get(f"{base}?category_id={categories[0].id}&category_id={categories[1].id}")
+    comma = api_client.get(f"{base}?category_id={categories[1].id},{categories[0].id}")
+
+    assert ids(repeated.data) == expected
+    assert ids(comma.data) == expected
+
+
+@pytest.mark.django_db
+def test_multiple_categories_paginate_with_exact_count_good(api_client, feed, categories, monkeypatch):
+    # GOOD: Пагинация по нескольким категориям с точным количеством
+    monkeypatch.setattr(ApproximatePageNumberPagination, "page_size", 2)
+    url = reverse("news:news-list") + f"?category_id={categories[0].id},{categories[1].id}&page=2"
+    response = api_client.get(url)
+
+    assert response.status_code == 200
+    assert response.data["count"] == 6
+    assert response.data["count_exact"] is True
+    assert ids(response.data["results"]) == [feed[4].id, feed[3].id]
+
+
+@pytest.mark.django_db
+def test_multiple_authors_and_ordering_good(api_client, feed, author):
+    # GOOD: Несколько авторов и сортировка по возрастанию
+    url = reverse("news:news-list") + f"?author_id={author.id},9999&ordering=created_at"
+    response = api_client.get(url)
+
+    assert ids(response.data) == [n.id for n in feed]
+
+
+@pytest.mark.django_db
+def test_unknown_ordering_bad(api_client):
+    # BAD: Сортировка только по разрешённым полям
+    response = api_client.get(reverse("news:news-list") + "?ordering=payload")
+
+    assert response.status_code == 400
+    assert "ordering" in response.data
+
+
+@pytest.mark.django_db
+def test_invalid_category_list_bad(api_client):
+    # BAD: Нечисловой id в списке категорий
+    response = api_client.get(reverse("news:news-list") + "?category_id=1,abc")
+
+    assert response.status_code == 400
+    assert "category_id" in response.data
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN is SQLite syntax")
+@pytest.mark.parametrize("params", [
+    {},
+    {"date_from": date(2025, 1, 1), "date_to": date(2025, 2, 1)},
+    {"ordering": "created_at"},
+    {"ordering": "-published_at"},
+    {"category_id": [1]},
+    {"category_id": [1, 2], "date_from": date(2025, 1, 1)},
+    {"author_id": [1], "date_to": date(2025, 2, 1)},
+    {"author_id": [1, 2]},
+])
+@pytest.mark.django_db
+def test_filters_use_index_good(params):
+    # GOOD: Каждая комбинация фильтров читается по индексу, а не полным сканом
+    live = NewsCard.objects.filter(deleted_at__isnull=True, is_published=True)
+    cards = filter_cards(live, params)
+
+    for qs in getattr(cards, "querysets", [cards]):
+        sql, sql_params = qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", sql_params)
+            plan = [row[-1] for row in cursor.fetchall()]
+        assert any("USING INDEX" in step for step in plan), plan
+        assert not any(step == f"SCAN {NewsCard._meta.db_table}" for step in plan), plan
@@ -0,0 +1,128 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.abstracts import background
+from apps.news import related, signals
+from apps.news.models import News, NewsCard, Category
+from apps.accounts.models import User, Author
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+def make_author(email):
+    user = User.objects.create_user(email=email, password="password123")
+    Author.objects.create(user=user)
+    return user
+
+@pytest.fixture
+def author_user(db):
+    return make_author("author@test.com")
+
+@pytest.fixture
+def other_author(db):
+    return make_author("other@test.com")
+
+@pytest.fixture
+def news(db, author_user):
+    return News.objects.create(
+        title="Test news",
+        content="Content",
+        category=Category.objects.create(name="Technology"),
+        author=author_user.author_profile,
+        is_published=False,
+    )
+
+@pytest.mark.django_db
+def test_publish_query_count_good(
+    api_client, author_user, news, settings, monkeypatch, django_capture_on_commit_callbacks
+):
+    # GOOD: Публикация — фиксированное число запросов, переиндексация уходит в фон
+    settings.BACKGROUND = {**settings.BACKGROUND, "INLINE": False}
+    submitted = []
+    monkeypatch.setattr(background.worker, "submit", lambda func, *args: submitted.append(func))
+    api_client.force_authenticate(author_user)
+    url = reverse("news:news-publish", args=[news.id])
+
+    with CaptureQueriesContext(connection) as ctx:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["author"]["email"] == "author@test.com"
+    assert len(ctx.captured_queries) == 12, [query["sql"] for query in ctx.captured_queries]
+    assert submitted == [related._index_committed]
+    assert NewsCard.objects.get(news=news).is_published is True
+
+
+@pytest.mark.django_db
+def test_partial_update_good(api_client, author_user, news):
+    # GOOD: Частичное обновление меняет заголовок и карточку
+    api_client.force_authenticate(author_user)
+    url = reverse("news:news-detail", args=[news.id])
+
+    response = api_client.patch(url, {"title": "Renamed"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["title"] == "Renamed"
+    assert NewsCard.objects.get(news=news).payload["title"] == "Renamed"
+
+
+@pytest.mark.django_db
+def test_destroy_good(api_client, author_user, news):
+    # GOOD: Мягкое удаление своей новости
+    api_client.force_authenticate(author_user)
+    url = reverse("news:news-detail", args=[news.id])
+
+    response = api_client.delete(url)
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    news.refresh_from_db()
+    assert news.deleted_at is not None
+
+
+@pytest.mark.django_db
+def test_update_bad_other_author(api_client, other_author, news):
+    # BAD: Чужая новость не меняется
+    api_client.force_authenticate(other_author)
+    url = reverse("news:news-detail", args=[news.id])
+
+    response = api_client.patch(url, {"title": "Hijacked"})
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    news.refresh_from_db()
+    assert news.title == "Test news"
+
+
+@pytest.mark.django_db
+def test_destroy_bad_already_deleted(api_client, author_user, news):
+    # BAD: Удалённая новость — 404
+    news.delete()
+    api_client.force_authenticate(author_user)
+    url = reverse("news:news-detail", args=[news.id])
+
+    response = api_client.delete(url)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_update_rolled_back_when_refresh_fails_bad(api_client, author_user, news, monkeypatch):
+    # BAD: Сбой при обновлении карточки откатывает и саму правку
+    api_client.raise_request_exception = False
+    api_client.force_authenticate(author_user)
+    url = reverse("news:news-detail", args=[news.id])
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("card refresh failed")
+    monkeypatch.setattr(signals, "write_cards", broken)
+
+    response = api_client.patch(url, {"title": "Half applied"})
+
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    news.refresh_from_db()
+    assert news.title == "Test news"
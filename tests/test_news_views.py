@@ -0,0 +1,120 @@
+import pytest
+from django.db import OperationalError
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.news.counters import ViewCounter
+from apps.news.models import News, NewsViewBucket, Category
+from apps.accounts.models import User, Author
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def news(db):
+    user = User.objects.create_user(
+        email="author@test.com",
+        password="password123",
+    )
+    author = Author.objects.create(user=user)
+    return News.objects.create(
+        title="Test news",
+        content="Content",
+        category=Category.objects.create(name="Technology"),
+        author=author,
+    )
+
+
+@pytest.mark.django_db
+def test_views_counted_good(api_client, news):
+    # GOOD: Просмотры учитываются и видны в API
+    api_client.get(reverse("news:news-detail", args=[news.id]))
+    api_client.get(reverse("news:news_detail", args=[news.id]))
+
+    response = api_client.get(reverse("news:news-views", args=[news.id]))
+
+    assert response.data["views_count"] == 2
+    assert response.data["recent_views"] == 2
+
+
+@pytest.mark.django_db
+def test_views_buffered_until_flush_good(news, settings):
+    # GOOD: Просмотры копятся в памяти и пишутся одним пакетом
+    settings.VIEW_COUNTER = {**settings.VIEW_COUNTER, "FLUSH_INTERVAL": 3600}
+    counter = ViewCounter()
+
+    for _ in range(5):
+        counter.record(news.id)
+
+    news.refresh_from_db()
+    assert news.views_count == 0
+    assert counter.pending_for(news.id) == 5
+
+    assert counter.flush() == {news.id: 5}
+    news.refresh_from_db()
+    assert news.views_count == 5
+    assert NewsViewBucket.objects.get(news=news).views == 5
+
+
+@pytest.mark.django_db
+def test_views_bad_not_found(api_client):
+    # BAD: Новость не существует
+    response = api_client.get(reverse("news:news-views", args=[9999]))
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_views_flushed_by_timer_good(news, settings):
+    # GOOD: Без новых запросов накопленные просмотры пишет таймер
+    settings.VIEW_COUNTER = {**settings.VIEW_COUNTER, "FLUSH_INTERVAL": 60}
+    counter = ViewCounter()
+
+    counter.record(news.id)
+    timer = counter._timer
+    assert timer is not None and timer.is_alive()
+    assert counter.pending_for(news.id) == 1
+
+    timer.cancel()
+    counter._flush_on_timer()
+
+    news.refresh_from_db()
+    assert news.views_count == 1
+    assert counter.pending_for(news.id) == 0
+    assert counter._timer is None
+
+
+@pytest.mark.django_db
+def test_views_flush_retried_when_locked_bad(news, settings, monkeypatch):
+    # BAD: Заблокированная таблица не теряет и не откладывает просмотры
+    settings.VIEW_COUNTER = {**settings.VIEW_COUNTER, "FLUSH_INTERVAL": 60}
+    monkeypatch.setattr("apps.news.counters.LOCK_BACKOFF", 0)
+    counter = ViewCounter()
+    counter.record(news.id)
+    write = ViewCounter._write
+    attempts = []
+
+    def locked_once(pending, totals):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OperationalError("database table is locked: news_news")
+        write(pending, totals)
+
+    monkeypatch.setattr(counter, "_write", locked_once)
+
+    assert counter.flush() == {news.id: 1}
+    news.refresh_from_db()
+    assert news.views_count == 1
+    assert len(attempts) == 2
+
+
+@pytest.mark.django_db
+def test_views_bad_unpublished(api_client, news):
+    # BAD: Статистика неопубликованной новости недоступна
+    news.is_published = False
+    news.save()
+
+    response = api_client.get(reverse("news:news-views", args=[news.id]))
+
+    assert response.status_code == 404
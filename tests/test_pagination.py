@@ -0,0 +1,116 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.abstracts.counting import counted_rows, filter_key
+from apps.abstracts.pagination import ApproximateCountPaginator, estimate_rows
+from apps.accounts.models import User, Author
+from apps.comments.models import Comment
+from apps.news.models import News, NewsCard, Category
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    return Author.objects.create(user=user)
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(name="General")
+
+
+@pytest.fixture
+def many_news(db, author, category):
+    return [
+        News.objects.create(
+            title=f"Title {i}",
+            content="Content",
+            category=category,
+            author=author,
+            is_published=i % 3 != 0,
+        )
+        for i in range(6)
+    ]
+
+
+@pytest.mark.django_db
+def test_counters_follow_inserts_updates_and_deletes(many_news, django_assert_num_queries):
+    # GOOD: Счётчики точны после вставки, массового update и удаления
+    live = News.objects.filter(deleted_at__isnull=True)
+    with django_assert_num_queries(1):
+        assert counted_rows(live) == 6
+
+    News.objects.filter(pk__in=[n.pk for n in many_news[:2]]).update(is_published=False)
+    many_news[2].delete()
+    News.objects.filter(pk=many_news[3].pk).delete()
+
+    assert counted_rows(News.objects.all()) == 5
+    assert counted_rows(live) == 4
+    assert counted_rows(News.objects.filter(is_published=True)) == News.objects.filter(is_published=True).count()
+
+
+@pytest.mark.django_db
+def test_card_counters_by_category(many_news, category):
+    # GOOD: Счётчики карточек по категории совпадают с COUNT(*)
+    qs = NewsCard.objects.filter(deleted_at__isnull=True, is_published=True, category_id=category.id)
+    assert counted_rows(qs) == qs.count() == 4
+
+
+@pytest.mark.django_db
+def test_uncounted_filters_fall_back():
+    # BAD: Фильтры без счётчика (OR, LIKE, противоречивые условия) не используют счётчики
+    assert filter_key(News.objects.filter(title__startswith="T")) is None
+    assert filter_key(News.objects.filter(is_published=True).filter(is_published=False)) is None
+    assert filter_key(Comment.objects.filter(news_id=1)) is None
+
+
+@pytest.mark.django_db
+def test_paginator_bounded_then_estimated(many_news, settings):
+    # GOOD: Без счётчика — ограниченный COUNT, сверх лимита — оценка
+    settings.PAGINATION = {**settings.PAGINATION, "COUNT_LIMIT": 10}
+    exact = ApproximateCountPaginator(News.objects.filter(title__startswith="Title").order_by("id"), 2)
+    assert (exact.count, exact.count_is_exact) == (6, True)
+
+    settings.PAGINATION = {**settings.PAGINATION, "COUNT_LIMIT": 2}
+    News.objects.filter(pk=many_news[0].pk).delete()
+    estimated = ApproximateCountPaginator(News.objects.filter(title__contains="e").order_by("id"), 2)
+    assert estimated.count == 5
+    assert estimated.count_is_exact is False
+
+
+@pytest.mark.django_db
+def test_filtered_estimate_not_whole_table_bad(many_news, settings):
+    # BAD: Оценка для отфильтрованной выборки не равна размеру всей таблицы
+    settings.PAGINATION = {**settings.PAGINATION, "ESTIMATE_LIMIT": 3}
+    assert estimate_rows(News.objects.all()) == max(news.id for news in many_news)
+    assert estimate_rows(News.objects.filter(title="Title 1")) == 1
+    assert estimate_rows(News.objects.filter(title__startswith="Title")) == 3
+
+
+@pytest.mark.django_db
+def test_paginator_caches_count_per_signature(many_news, django_assert_num_queries):
+    # GOOD: Повторный подсчёт с теми же фильтрами берётся из кэша
+    qs = News.objects.filter(title__startswith="Title").order_by("id")
+    assert ApproximateCountPaginator(qs, 2).count == 6
+
+    with django_assert_num_queries(0):
+        assert ApproximateCountPaginator(qs.all(), 2).count == 6
+
+
+@pytest.mark.django_db
+def test_news_list_paginated_opt_in(api_client, many_news, category):
+    # GOOD: ?page= включает пагинацию с признаком точности count
+    url = reverse("news:news-list")
+    response = api_client.get(url, {"page": 1, "category_id": category.id, "is_published": True})
+
+    assert response.status_code == 200
+    assert response.data["count"] == 4
+    assert response.data["count_exact"] is True
+    assert len(response.data["results"]) == 4
+    assert response.data["results"][0]["title"] == "Title 5"
@@ -0,0 +1,157 @@
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, Author
+from apps.comments.models import Comment
+from apps.news import prerender
+from apps.news.counters import view_counter
+from apps.news.models import News, Category
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    return Author.objects.create(user=user)
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(name="General")
+
+
+@pytest.fixture
+def news(author, category, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return News.objects.create(
+            title="Prerendered", content="Content", category=category, author=author
+        )
+
+
+@pytest.mark.django_db
+def test_anonymous_read_served_without_queries_good(
+    client, news, category, monkeypatch, django_assert_num_queries
+):
+    # GOOD: Аноним получает готовую страницу без запросов к базе, просмотр учтён
+    recorded = []
+    monkeypatch.setattr(view_counter, "record", recorded.append)
+    # Первое чтение отрисовывает страницы, следующие отдаются с диска.
+    client.get(reverse("news:news_detail", args=[news.id]))
+    client.get(reverse("news:news_list"))
+    client.get(reverse("news:news_by_category", args=[category.id]))
+    recorded.clear()
+
+    with django_assert_num_queries(0):
+        detail = client.get(reverse("news:news_detail", args=[news.id]))
+        listing = client.get(reverse("news:news_list"))
+        by_category = client.get(reverse("news:news_by_category", args=[category.id]))
+
+    assert detail.status_code == 200
+    assert "Prerendered" in detail.content.decode()
+    assert "Prerendered" in listing.content.decode()
+    assert "Prerendered" in by_category.content.decode()
+    assert "Cookie" in detail["Vary"]
+    assert recorded == [news.id]
+
+
+@pytest.mark.django_db
+def test_logged_in_and_json_requests_render_live_good(client, news, author):
+    # GOOD: Вошедший пользователь и JSON-запрос идут мимо готовых страниц
+    prerender.page_path(f"news-{news.id}").write_text("stale")
+
+    json_response = client.get(
+        reverse("news:news_detail", args=[news.id]), HTTP_ACCEPT="application/json"
+    )
+    client.force_login(author.user)
+    html_response = client.get(reverse("news:news_detail", args=[news.id]))
+
+    assert json_response.json()["title"] == "Prerendered"
+    assert "Prerendered" in html_response.content.decode()
+
+
+@pytest.mark.django_db
+def test_comment_rerenders_page_good(client, news, author, django_capture_on_commit_callbacks):
+    # GOOD: Новый комментарий перерисовывает страницу новости
+    with django_capture_on_commit_callbacks(execute=True):
+        Comment.objects.create(news=news, user=author.user, text="First!")
+
+    response = client.get(reverse("news:news_detail", args=[news.id]))
+
+    assert "First!" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_comments_coalesced_into_one_render_good(
+    client, news, author, monkeypatch, django_capture_on_commit_callbacks
+):
+    # GOOD: Комментарии только помечают страницу устаревшей; несколько — одна отрисовка
+    rendered = []
+    render_detail = prerender.render_detail
+    monkeypatch.setattr(
+        prerender, "render_detail", lambda *args: rendered.append(args[0]) or render_detail(*args)
+    )
+    for text in ("First!", "Second!", "Third!"):
+        with django_capture_on_commit_callbacks(execute=True):
+            Comment.objects.create(news=news, user=author.user, text=text)
+
+    assert rendered == []
+    first = client.get(reverse("news:news_detail", args=[news.id]))
+    again = client.get(reverse("news:news_detail", args=[news.id]))
+
+    assert rendered == [news.id]
+    assert "Third!" in first.content.decode()
+    assert again.content == first.content
+
+
+@pytest.mark.django_db
+def test_category_rename_invalidates_pages_good(
+    client, news, category, django_capture_on_commit_callbacks
+):
+    # GOOD: Переименование категории обновляет страницы её новостей и списки
+    for url in (
+        reverse("news:news_detail", args=[news.id]),
+        reverse("news:news_list"),
+        reverse("news:news_by_category", args=[category.id]),
+    ):
+        assert "General" in client.get(url).content.decode()
+
+    category.name = "Renamed"
+    with django_capture_on_commit_callbacks(execute=True):
+        category.save()
+
+    for url in (
+        reverse("news:news_detail", args=[news.id]),
+        reverse("news:news_list"),
+        reverse("news:news_by_category", args=[category.id]),
+    ):
+        assert "Renamed" in client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_unpublish_blanks_page_bad(client, api_client, news, author, django_capture_on_commit_callbacks):
+    # BAD: Снятая с публикации новость больше не отдаётся из готовой страницы
+    api_client.force_authenticate(author.user)
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(reverse("news:news-unpublish", args=[news.id]))
+
+    detail = client.get(reverse("news:news_detail", args=[news.id]))
+    listing = client.get(reverse("news:news_list"))
+
+    assert detail.status_code == 404
+    assert "Prerendered" not in listing.content.decode()
+
+
+@pytest.mark.django_db
+def test_older_render_does_not_overwrite_newer_bad(news):
+    # BAD: Рендер, начатый раньше, не затирает более свежую страницу
+    older = time.time_ns()
+    prerender.refresh([news.id])
+
+    assert prerender.render_detail(news.id, older) is False
@@ -0,0 +1,63 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, Author
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def author_user(db):
+    user = User.objects.create_user(
+        email="author@test.com",
+        password="password123",
+    )
+    Author.objects.create(user=user)
+    return user
+
+@pytest.fixture
+def auth_header(api_client, author_user):
+    response = api_client.post(
+        reverse("token_obtain_pair"),
+        {"email": "author@test.com", "password": "password123"},
+    )
+    return {"HTTP_AUTHORIZATION": f"Bearer {response.data['access']}"}
+
+
+@pytest.mark.django_db
+def test_jwt_steady_state_no_identity_queries_good(api_client, auth_header, django_assert_num_queries):
+    # GOOD: Повторный запрос с тем же токеном не ходит в базу за пользователем
+    url = reverse("news:news-my-news")
+    api_client.get(url, **auth_header)
+
+    with django_assert_num_queries(1):
+        response = api_client.get(url, **auth_header)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_principal_evicted_on_author_change_good(api_client, author_user, auth_header):
+    # GOOD: Удаление профиля автора сразу отражается в правах
+    url = reverse("news:news-my-news")
+    api_client.get(url, **auth_header)
+
+    Author.objects.filter(user=author_user).delete()
+
+    response = api_client.get(url, **auth_header)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_principal_bad_inactive_user(api_client, author_user, auth_header):
+    # BAD: Деактивированный пользователь теряет доступ без ожидания TTL
+    author_user.is_active = False
+    author_user.save()
+
+    response = api_client.get(reverse("news:news-my-news"), **auth_header)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
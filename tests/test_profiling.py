@@ -0,0 +1,115 @@
+import pytest
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.abstracts import profiling
+from apps.abstracts.models import ProfileReport
+from apps.accounts.models import User
+from apps.news.models import News, Category
+
+
+@pytest.fixture
+def staff(db):
+    return User.objects.create_user(email="staff@test.com", password="password123", is_staff=True)
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(email="user@test.com", password="password123")
+
+
+@pytest.fixture
+def news(db):
+    return News.objects.create(
+        title="News", content="Content", category=Category.objects.create(name="General")
+    )
+
+
+def bearer(user):
+    return {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+
+@pytest.mark.django_db
+def test_staff_jwt_profiles_request_good(client, staff, news):
+    # GOOD: Сотрудник с JWT получает отчёт профайлера со списком SQL
+    response = client.get(reverse("news:news-list"), {"_profile": "1"}, **bearer(staff))
+
+    report = ProfileReport.objects.get()
+    assert response.status_code == 200
+    assert response["X-Profile-Report"] == reverse(
+        "admin:abstracts_profilereport_change", args=[report.pk]
+    )
+    assert report.user == staff and report.view_name == "news:news-list"
+    assert report.query_count == len(report.queries) > 0
+    assert any("news_newscard" in query["sql"] for query in report.queries)
+    assert "cumulative" in report.functions
+    assert report.allocations == ""
+
+
+@pytest.mark.django_db
+def test_memory_mode_via_header_and_session_good(client, staff, news):
+    # GOOD: Режим memory по заголовку добавляет отчёт tracemalloc
+    client.force_login(staff)
+
+    client.get(reverse("news:news_detail", args=[news.id]), HTTP_X_PROFILE="memory")
+
+    report = ProfileReport.objects.get()
+    assert report.view_name == "news:news_detail"
+    assert report.allocations
+
+
+@pytest.mark.django_db
+def test_sampling_keeps_newest_reports_good(client, news, settings):
+    # GOOD: Сэмплирование профилирует каждый N-й запрос и хранит последние
+    settings.PROFILER = {
+        **settings.PROFILER,
+        "SAMPLE_RATES": {"news:news-list": 2},
+        "KEEP_SAMPLED": 1,
+    }
+
+    for _ in range(4):
+        response = client.get(reverse("news:news-list"))
+        assert "X-Profile-Report" not in response
+
+    report = ProfileReport.objects.get()
+    assert report.sampled and report.user is None
+
+
+@pytest.mark.django_db
+def test_admin_shows_report_good(client, staff, news):
+    # GOOD: Отчёт открывается в админке
+    admin = User.objects.create_superuser(email="admin@test.com", password="password123")
+    client.get(reverse("news:news-list"), {"_profile": "1"}, **bearer(staff))
+    client.force_login(admin)
+
+    response = client.get(
+        reverse("admin:abstracts_profilereport_change", args=[ProfileReport.objects.get().pk])
+    )
+
+    assert response.status_code == 200
+    assert "news_newscard" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_non_staff_cannot_profile_bad(client, user, news):
+    # BAD: Обычный пользователь и аноним не запускают профайлер
+    client.get(reverse("news:news-list"), {"_profile": "1"}, **bearer(user))
+    client.get(reverse("news:news-list"), {"_profile": "1"})
+    client.get(reverse("news:news-list"), {"_profile": "1"}, HTTP_AUTHORIZATION="Bearer broken")
+
+    assert not ProfileReport.objects.exists()
+
+
+@pytest.mark.django_db
+def test_concurrent_profile_runs_unprofiled_bad(client, staff, news):
+    # BAD: Пока профилируется другой запрос, этот выполняется без профилировщика
+    client.force_login(staff)
+    profiling._cpu_lock.acquire()
+    try:
+        response = client.get(reverse("news:news_detail", args=[news.id]), {"_profile": "1"})
+    finally:
+        profiling._cpu_lock.release()
+
+    assert response.status_code == 200
+    assert "X-Profile-Report" not in response
+    assert not ProfileReport.objects.exists()
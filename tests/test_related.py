@@ -0,0 +1,146 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, Author
+from apps.news import related
+from apps.news.models import News, NewsTerm, NewsTermStat, RelatedNews, Category
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    return Author.objects.create(user=user)
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(name="General")
+
+
+@pytest.fixture
+def make_news(author, category, django_capture_on_commit_callbacks):
+    def make(title, content, **kwargs):
+        with django_capture_on_commit_callbacks(execute=True):
+            return News.objects.create(
+                title=title, content=content, category=category, author=author, **kwargs
+            )
+    return make
+
+
+@pytest.fixture
+def corpus(make_news):
+    return {
+        "football": make_news("Футбол: сборная выиграла матч", "Сборная по футболу выиграла матч в финале турнира."),
+        "football2": make_news("Футбол: финал турнира", "Финал футбольного турнира, сборная и матч года."),
+        "budget": make_news("Бюджет на следующий год", "Парламент утвердил бюджет и налоги на следующий год."),
+        "taxes": make_news("Новые налоги", "Правительство меняет налоги, бюджет получит доходы."),
+    }
+
+
+def related_ids(news):
+    return list(
+        RelatedNews.objects.filter(news=news).order_by("rank").values_list("related_id", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_new_news_folded_in_incrementally_good(corpus):
+    # GOOD: Новости попадают в индекс при сохранении, без полной перестройки
+    assert related_ids(corpus["football"])[0] == corpus["football2"].id
+    assert related_ids(corpus["football2"])[0] == corpus["football"].id
+    assert related_ids(corpus["budget"])[0] == corpus["taxes"].id
+    assert corpus["budget"].id not in related_ids(corpus["football"])
+
+
+@pytest.mark.django_db
+def test_build_matches_incremental_neighbours_good(corpus):
+    # GOOD: Полная перестройка даёт те же ближайшие новости
+    incremental = {key: related_ids(news)[:1] for key, news in corpus.items()}
+
+    call_command("build_related")
+
+    assert {key: related_ids(news)[:1] for key, news in corpus.items()} == incremental
+    assert NewsTermStat.objects.get(term="бюджет").df == 2
+
+
+@pytest.mark.django_db
+def test_index_waits_for_commit_good(make_news, django_capture_on_commit_callbacks):
+    # GOOD: Индекс пересчитывается после коммита, а не внутри сохранения
+    with django_capture_on_commit_callbacks() as callbacks:
+        news = News.objects.create(title="Футбол", content="Сборная выиграла матч.")
+
+    assert not NewsTerm.objects.filter(news=news).exists()
+
+    for callback in callbacks:
+        callback()
+    assert NewsTerm.objects.filter(news=news).exists()
+
+
+@pytest.mark.django_db
+def test_unpublished_news_leaves_index_good(corpus, django_capture_on_commit_callbacks):
+    # GOOD: Снятая с публикации новость исчезает из индекса и чужих списков
+    corpus["football2"].is_published = False
+    with django_capture_on_commit_callbacks(execute=True):
+        corpus["football2"].save()
+
+    assert not NewsTerm.objects.filter(news=corpus["football2"]).exists()
+    assert corpus["football2"].id not in related_ids(corpus["football"])
+    assert NewsTermStat.objects.get(term="сборная").df == 1
+    assert not NewsTermStat.objects.filter(term="финал").exists()
+
+
+@pytest.mark.django_db
+def test_neighbour_list_refilled_after_removal_good(settings, make_news, django_capture_on_commit_callbacks):
+    # GOOD: Освободившееся место в списке соседей занимает следующая похожая новость
+    settings.RELATED = {**settings.RELATED, "TOP_K": 1}
+    first = make_news("Футбол: сборная выиграла матч", "Сборная по футболу выиграла матч в финале турнира.")
+    second = make_news("Футбол: финал турнира", "Финал футбольного турнира, сборная и матч года.")
+    third = make_news("Футбол: сборная в финале", "Сборная сыграет финал турнира по футболу.")
+    [gone_id] = related_ids(first)
+
+    gone = News.objects.get(id=gone_id)
+    gone.deleted_at = timezone.now()
+    with django_capture_on_commit_callbacks(execute=True):
+        gone.save()
+
+    assert related_ids(first) == list({second.id, third.id} - {gone_id})
+
+
+@pytest.mark.django_db
+def test_related_single_query_good(api_client, corpus, django_assert_num_queries):
+    # GOOD: Похожие новости читаются одним запросом
+    with django_assert_num_queries(1):
+        payloads = related.related_payloads(corpus["taxes"].id)
+
+    assert payloads[0]["id"] == corpus["budget"].id
+
+    response = api_client.get(reverse("news:news-related", args=[corpus["taxes"].id]))
+    assert response.status_code == 200
+    assert response.data == payloads
+
+
+@pytest.mark.django_db
+def test_related_shown_on_detail_page_good(client, corpus):
+    # GOOD: Страница новости показывает похожие новости
+    response = client.get(reverse("news:news_detail", args=[corpus["football"].id]))
+    newer = client.get(reverse("news:news_detail", args=[corpus["football2"].id]))
+
+    assert response.status_code == 200
+    assert corpus["football2"].title in response.content.decode()
+    assert corpus["football"].title in newer.content.decode()
+
+
+@pytest.mark.django_db
+def test_related_unknown_news_bad(api_client, db):
+    # BAD: Для несуществующей новости — 404
+    response = api_client.get(reverse("news:news-related", args=[9999]))
+
+    assert response.status_code == 404
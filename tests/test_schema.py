@@ -0,0 +1,86 @@
+import gzip
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APIClient
+
+from apps.abstracts import schema
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def prebuilt(db):
+    call_command("build_schema")
+    return schema.code_version()
+
+
+@pytest.mark.django_db
+def test_schema_served_from_artifact(api_client, prebuilt, monkeypatch):
+    # GOOD: Схема отдаётся из собранного артефакта без генерации на запрос
+    monkeypatch.setattr(schema, "render_schema", lambda: pytest.fail("schema regenerated"))
+
+    response = api_client.get("/api/schema/?format=json")
+
+    assert response.status_code == 200
+    assert response["ETag"]
+    assert response.json()["openapi"].startswith("3.")
+    assert "/news/api/news/" in response.json()["paths"]
+
+
+@pytest.mark.django_db
+def test_schema_not_modified_and_gzip(api_client, prebuilt):
+    # GOOD: Повторный запрос с If-None-Match получает 304, gzip — сжатое тело
+    first = api_client.get("/api/schema/")
+    etag = first["ETag"]
+
+    response = api_client.get("/api/schema/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    response = api_client.get("/api/schema/", HTTP_ACCEPT_ENCODING="gzip, br")
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.content) == first.content
+    assert "Accept-Encoding" in response["Vary"]
+
+
+@pytest.mark.django_db
+def test_schema_built_on_first_request_when_missing(api_client, settings):
+    # GOOD: Если артефакта нет, он собирается один раз при первом запросе
+    response = api_client.get("/api/schema/")
+
+    assert response.status_code == 200
+    assert schema.artifact_path("yaml").exists()
+
+
+@pytest.mark.django_db
+def test_schema_unknown_format_bad(api_client, prebuilt):
+    # BAD: Неизвестный формат схемы
+    assert api_client.get("/api/schema/?format=xml").status_code == 404
+
+
+@pytest.mark.django_db
+def test_schema_check(prebuilt):
+    # GOOD/BAD: --check проходит для свежей схемы и падает для устаревшей
+    call_command("build_schema", "--check")
+
+    schema.artifact_path("json").write_bytes(b"{}")
+    with pytest.raises(CommandError):
+        call_command("build_schema", "--check")
+
+
+@pytest.mark.django_db
+def test_schema_new_version_prunes_old(prebuilt, monkeypatch):
+    # GOOD: Новая версия кода собирает новый артефакт и удаляет старые
+    monkeypatch.setenv("SCHEMA_VERSION", "next")
+    schema.reset()
+    call_command("build_schema")
+
+    names = sorted(path.name for path in schema.artifact_dir().iterdir())
+    assert names == [
+        "openapi-next.json", "openapi-next.json.gz",
+        "openapi-next.yaml", "openapi-next.yaml.gz",
+    ]
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.abstracts import startup
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     rest_framework.status
+import time:       300 |        420 |   rest_framework.views
+import time:        80 |        500 | rest_framework
+import time:       900 |        900 | django.db
+"""
+
+
+def test_parse_importtime():
+    # GOOD: Разбор вывода -X importtime и группировка по пакетам
+    timings = startup.parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [t.module for t in timings] == [
+        "rest_framework.status", "rest_framework.views", "rest_framework", "django.db",
+    ]
+    assert timings[0].depth == 2
+    assert timings[1].cumulative_us == 420
+    assert startup.by_package(timings) == [("django", 900), ("rest_framework", 500)]
+
+
+@pytest.mark.parametrize("module", [
+    "apps.accounts.management.commands.seed_users",
+    "apps.news.management.commands.seed_news",
+    "apps.comments.management.commands.seed_comments",
+])
+def test_seed_commands_import_faker_lazily(module):
+    # GOOD: Загрузка seed-команд не импортирует Faker
+    code = (
+        "import django, sys; django.setup(); "
+        f"import {module}; print('faker' in sys.modules)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=startup.PROJECT_ROOT,
+        env={"DJANGO_SETTINGS_MODULE": "settings.base", "PATH": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert proc.stdout.strip() == "False"
+
+
+def test_profile_startup_target_missed_bad(capsys):
+    # BAD: Медианное время старта выше цели — команда завершается ошибкой
+    with pytest.raises(CommandError, match="exceeds"):
+        call_command("profile_startup", "--runs", "1", "--target-ms", "1")
+
+    output = capsys.readouterr().out
+    assert "django" in output
+    assert "cold start median" in output
@@ -0,0 +1,128 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User, Author
+from apps.comments.models import Comment
+from apps.news.models import News, Category, DailyStat, DailyCommenter
+from apps.news import stats
+
+DAY = date(2026, 3, 1)
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def staff(db):
+    return User.objects.create_user(email="staff@test.com", password="password123", is_staff=True)
+
+
+@pytest.fixture
+def author(db):
+    user = User.objects.create_user(email="author@test.com", password="password123")
+    return Author.objects.create(user=user)
+
+
+@pytest.fixture
+def categories(db):
+    return Category.objects.create(name="Politics"), Category.objects.create(name="Sport")
+
+
+@pytest.fixture
+def activity(db, author, categories, staff):
+    politics, sport = categories
+    at = datetime(2026, 3, 1, 12, tzinfo=dt_timezone.utc)
+    news = [
+        News.objects.create(title="A", content="c", category=politics, author=author),
+        News.objects.create(title="B", content="c", category=politics, author=author),
+        News.objects.create(title="C", content="c", category=sport, author=author),
+        News.objects.create(title="D", content="c", category=sport, author=author, is_published=False),
+    ]
+    News.objects.update(published_at=at)
+    reader = User.objects.create_user(email="reader@test.com", password="password123")
+    for user, item in [(reader, news[0]), (reader, news[0]), (staff, news[0]), (reader, news[2])]:
+        Comment.objects.create(user=user, news=item, text="Hi")
+    Comment.objects.update(created_at=at)
+    return news
+
+
+def snapshot():
+    return (
+        sorted(DailyStat.objects.exclude(published=0, comments=0).values_list("day", "category_id", "author_id", "published", "comments")),
+        sorted(DailyCommenter.objects.values_list("day", "category_id", "user_id", "comments")),
+    )
+
+
+@pytest.mark.django_db
+def test_triggers_match_backfill(activity):
+    # GOOD: Инкрементальные роллапы совпадают с полным пересчётом
+    News.objects.filter(pk=activity[1].pk).update(is_published=False)
+    activity[3].is_published = True
+    activity[3].save()
+    Comment.objects.filter(news=activity[2]).update(deleted_at=datetime.now(dt_timezone.utc))
+
+    incremental = snapshot()
+    call_command("backfill_stats", "--chunk-size", "2")
+    assert snapshot() == incremental
+
+
+@pytest.mark.django_db
+def test_draft_counted_on_publish_day(activity, categories):
+    # GOOD: Черновик попадает в статистику дня публикации, а не создания
+    draft = News.objects.get(pk=activity[3].pk)
+    draft.is_published = True
+    draft.save(update_fields=["is_published"])
+
+    draft.refresh_from_db()
+    today = datetime.now(dt_timezone.utc).date()
+    assert draft.published_at.date() == today
+    assert stats.query(DAY, DAY, group_by=None)["totals"]["published"] == 3
+    assert stats.query(today, today, group_by=None, category_id=categories[1].id)["totals"] == {
+        "published": 1, "comments": 0, "commenters": 0,
+    }
+
+
+@pytest.mark.django_db
+def test_stats_query_groups_and_distinct_commenters(activity, categories):
+    # GOOD: Суммы по категориям и уникальные комментаторы за период
+    politics, sport = categories
+    result = stats.query(DAY, DAY, group_by="category")
+
+    assert result["totals"] == {"published": 3, "comments": 4, "commenters": 2}
+    assert result["results"] == [
+        {"category_id": politics.id, "published": 2, "comments": 3, "commenters": 2},
+        {"category_id": sport.id, "published": 1, "comments": 1, "commenters": 1},
+    ]
+
+
+@pytest.mark.django_db
+def test_stats_api_staff_only(api_client, activity, staff, author):
+    # GOOD/BAD: /news/api/stats/ доступен только персоналу
+    url = reverse("news:stats-list")
+    params = {"date_from": "2026-02-25", "date_to": "2026-03-05", "author_id": author.id}
+
+    api_client.force_authenticate(author.user)
+    assert api_client.get(url, params).status_code == 403
+
+    api_client.force_authenticate(staff)
+    response = api_client.get(url, params)
+    assert response.status_code == 200
+    assert response.data["results"] == [
+        {"day": DAY, "published": 3, "comments": 4, "commenters": 2},
+    ]
+
+
+@pytest.mark.django_db
+def test_stats_api_bad_range(api_client, staff):
+    # BAD: Слишком длинный или перевёрнутый период
+    api_client.force_authenticate(staff)
+    url = reverse("news:stats-list")
+
+    assert api_client.get(url, {"date_from": "2024-01-01", "date_to": "2026-01-01"}).status_code == 400
+    assert api_client.get(url, {"date_from": "2026-01-02", "date_to": "2026-01-01"}).status_code == 400
@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.abstracts.middleware import ConcurrencyLimitMiddleware
+from apps.abstracts.throttling import TokenBucketStore
+from apps.accounts.models import User, Author
+from apps.news.models import News, Category
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    user = User.objects.create_user(
+        email="user@test.com",
+        password="password123",
+    )
+    Author.objects.create(user=user)
+    return user
+
+
+@pytest.fixture
+def news(db, user):
+    return News.objects.create(
+        title="News",
+        content="Content",
+        category=Category.objects.create(name="General"),
+        author=user.author_profile,
+        is_published=True,
+    )
+
+
+@pytest.fixture
+def tight_buckets(settings):
+    settings.THROTTLING = {
+        **settings.THROTTLING,
+        "BUCKETS": {
+            "comment_write": {"rate": 0.001, "burst": 2},
+            "anon_news_list": {"rate": 0.001, "burst": 2},
+        },
+    }
+
+
+def test_token_bucket_refills_over_time(monkeypatch):
+    # GOOD: Токены восстанавливаются со скоростью rate, но не выше burst
+    clock = [100.0]
+    monkeypatch.setattr("apps.abstracts.throttling.time.monotonic", lambda: clock[0])
+    store = TokenBucketStore()
+
+    assert store.consume("k", rate=1.0, burst=2) == 0
+    assert store.consume("k", rate=1.0, burst=2) == 0
+    assert store.consume("k", rate=1.0, burst=2) == pytest.approx(1.0)
+
+    clock[0] += 10
+    assert store.consume("k", rate=1.0, burst=2) == 0
+    assert store.consume("k", rate=1.0, burst=2) == 0
+    assert store.consume("k", rate=1.0, burst=2) > 0
+
+
+def test_token_bucket_evicts_idle_keys(settings):
+    # GOOD: При переполнении сначала выбрасываются полные (простаивающие) корзины
+    settings.THROTTLING = {**settings.THROTTLING, "MAX_KEYS": 2}
+    store = TokenBucketStore()
+    store.consume("busy", rate=0.001, burst=1)
+    store.consume("idle-1", rate=0.001, burst=5, cost=0)
+    store.consume("idle-2", rate=0.001, burst=5, cost=0)
+
+    assert "busy" in store._buckets
+    assert len(store._buckets) <= 2
+
+
+@pytest.mark.django_db
+def test_comment_create_throttled_bad(api_client, user, news, tight_buckets):
+    # BAD: Превышение лимита на комментарии возвращает 429 с Retry-After
+    api_client.force_authenticate(user)
+    url = reverse("comments:comment-list")
+
+    for _ in range(2):
+        response = api_client.post(url, {"news": news.id, "text": "Hi"})
+        assert response.status_code == status.HTTP_201_CREATED
+
+    response = api_client.post(url, {"news": news.id, "text": "Hi"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response["Retry-After"]) > 0
+
+
+@pytest.mark.django_db
+def test_comment_buckets_are_per_user(api_client, user, news, tight_buckets):
+    # GOOD: Лимит одного пользователя не влияет на другого
+    other = User.objects.create_user(email="other@test.com", password="password123")
+    url = reverse("comments:comment-list")
+
+    api_client.force_authenticate(user)
+    for _ in range(3):
+        api_client.post(url, {"news": news.id, "text": "Hi"})
+
+    api_client.force_authenticate(other)
+    response = api_client.post(url, {"news": news.id, "text": "Hi"})
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_news_list_throttles_anonymous_only(api_client, user, news, tight_buckets):
+    # GOOD: Анонимный список новостей ограничен по IP, авторизованный — нет
+    url = reverse("news:news-list")
+
+    assert api_client.get(url).status_code == status.HTTP_200_OK
+    assert api_client.get(url).status_code == status.HTTP_200_OK
+    assert api_client.get(url).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    api_client.force_authenticate(user)
+    for _ in range(3):
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_forwarded_for_does_not_reset_anonymous_bucket_bad(api_client, news, tight_buckets):
+    # BAD: Подмена X-Forwarded-For не обходит анонимный лимит
+    url = reverse("news:news-list")
+
+    codes = [
+        api_client.get(url, HTTP_X_FORWARDED_FOR=f"10.0.0.{n}").status_code
+        for n in range(3)
+    ]
+
+    assert codes[-1] == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_concurrency_limit_sheds_load(settings):
+    # BAD: Сверх MAX_IN_FLIGHT одновременных запросов сервер отвечает 503
+    settings.THROTTLING = {**settings.THROTTLING, "MAX_IN_FLIGHT": 1, "RETRY_AFTER": 3}
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_view(request):
+        entered.set()
+        release.wait(5)
+        return "ok"
+
+    middleware = ConcurrencyLimitMiddleware(slow_view)
+    request = RequestFactory().get("/")
+    worker = threading.Thread(target=middleware, args=(request,))
+    worker.start()
+    entered.wait(5)
+
+    response = middleware(request)
+    assert response.status_code == 503
+    assert response["Retry-After"] == "3"
+
+    release.set()
+    worker.join()
+    assert middleware.in_flight == 0
+    assert middleware(request) == "ok"
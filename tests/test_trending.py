@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.comments.models import Comment
+from apps.news import trending
+from apps.news.models import News, TrendingScore, Category
+from apps.accounts.models import User, Author
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def user(db):
+    user = User.objects.create_user(
+        email="author@test.com",
+        password="password123",
+    )
+    Author.objects.create(user=user)
+    return user
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(name="Technology")
+
+def make_news(user, category, title):
+    return News.objects.create(
+        title=title,
+        content="Content",
+        category=category,
+        author=user.author_profile,
+    )
+
+
+@pytest.mark.django_db
+def test_trending_ranked_by_comments_good(api_client, user, category, django_capture_on_commit_callbacks):
+    # GOOD: Новость с большим числом комментариев выше в рейтинге
+    quiet = make_news(user, category, "Quiet")
+    hot = make_news(user, category, "Hot")
+    with django_capture_on_commit_callbacks(execute=True):
+        Comment.objects.create(user=user, news=quiet, text="one")
+        for _ in range(3):
+            Comment.objects.create(user=user, news=hot, text="more")
+
+    response = api_client.get(reverse("news:news-trending"), {"category_id": category.id})
+
+    assert [item["id"] for item in response.data] == [hot.id, quiet.id]
+    assert response.data[0]["trending_score"] == pytest.approx(9, rel=0.01)
+
+
+@pytest.mark.django_db
+def test_trending_decays_over_time_good(user, category):
+    # GOOD: Старая активность весит меньше свежей
+    old = make_news(user, category, "Old")
+    fresh = make_news(user, category, "Fresh")
+    trending.bump_many({old.id: 4.0}, at=timezone.now() - timedelta(hours=24))
+    trending.bump_many({fresh.id: 2.0})
+
+    assert [news_id for news_id, _ in trending.top(10)] == [fresh.id, old.id]
+    assert dict(trending.top(10))[old.id] == pytest.approx(1.0, rel=0.01)
+
+
+@pytest.mark.django_db
+def test_trending_bumps_add_up_in_sql_good(user, category):
+    # GOOD: Повторные прибавки складываются в самом UPDATE, без перезаписи
+    news = make_news(user, category, "Busy")
+    now = timezone.now()
+    trending.bump_many({news.id: 1.0}, at=now)
+    trending.bump_many({news.id: 2.0}, at=now)
+
+    assert dict(trending.top(10))[news.id] == pytest.approx(3.0, rel=0.01)
+
+
+@pytest.mark.django_db
+def test_trending_failure_does_not_fail_comment_bad(user, category, monkeypatch, django_capture_on_commit_callbacks):
+    # BAD: Сбой подсчёта рейтинга не мешает сохранить комментарий
+    news = make_news(user, category, "Broken")
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("trending unavailable")
+    monkeypatch.setattr(trending, "bump_many", broken)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        comment = Comment.objects.create(user=user, news=news, text="still saved")
+
+    assert Comment.objects.filter(pk=comment.pk).exists()
+
+
+@pytest.mark.django_db
+def test_trending_prune_good(user, category):
+    # GOOD: Проход затухания удаляет выдохшиеся оценки
+    news = make_news(user, category, "Stale")
+    trending.bump_many({news.id: 1.0}, at=timezone.now() - timedelta(days=30))
+
+    assert trending.prune() == 1
+    assert not TrendingScore.objects.exists()
+
+
+@pytest.mark.django_db
+def test_trending_bad_unpublished_hidden(api_client, user, category, django_capture_on_commit_callbacks):
+    # BAD: Снятая с публикации новость не попадает в рейтинг
+    news = make_news(user, category, "Hidden")
+    with django_capture_on_commit_callbacks(execute=True):
+        Comment.objects.create(user=user, news=news, text="one")
+    news.is_published = False
+    news.save()
+
+    response = api_client.get(reverse("news:news-trending"))
+
+    assert response.data == []